@@ -0,0 +1,116 @@
+import argparse
+import asyncio
+import os
+import secrets
+import signal
+import sys
+import time
+import aiohttp
+from utils.ipc import IPCServer
+
+def split_shards(shard_count, clusters):
+    """Split shard ids into contiguous (first, last) ranges, one per cluster"""
+    per, extra = divmod(shard_count, clusters)
+    ranges, start = [], 0
+    for i in range(clusters):
+        size = per + (1 if i < extra else 0)
+        ranges.append((start, start + size - 1))
+        start += size
+    return ranges
+
+async def recommended_shards(token):
+    headers = {'Authorization': f'Bot {token}'}
+    async with aiohttp.ClientSession() as session:
+        async with session.get('https://discord.com/api/v10/gateway/bot', headers=headers) as resp:
+            resp.raise_for_status()
+            return (await resp.json())['shards']
+
+class Cluster:
+    def __init__(self, cluster_id, shard_range):
+        self.id = cluster_id
+        self.shard_range = shard_range
+        self.process = None
+        self.restarts = 0
+
+class ClusterLauncher:
+    """Spawns one bot process per shard range and restarts the ones that crash"""
+    def __init__(self, clusters, shard_count, base_port=8080):
+        self.shard_count = shard_count
+        self.base_port = base_port
+        self.clusters = [Cluster(i, r) for i, r in enumerate(split_shards(shard_count, clusters)) if r[1] >= r[0]]
+        self.ipc = IPCServer(secrets.token_hex(16))
+        self.ipc.on_event = self.on_event
+        self.stopping = False
+
+    def env_for(self, cluster):
+        env = dict(os.environ)
+        env.update({
+            'SHARD_COUNT': str(self.shard_count),
+            'SHARD_IDS': f'{cluster.shard_range[0]}-{cluster.shard_range[1]}',
+            'CLUSTER_ID': str(cluster.id),
+            'CLUSTER_COUNT': str(len(self.clusters)),
+            'IPC_PORT': str(self.ipc.port),
+            'IPC_TOKEN': self.ipc.token,
+            'KEEP_ALIVE_PORT': str(self.base_port + cluster.id),
+        })
+        return env
+
+    def on_event(self, event, data):
+        if event == 'shutdown':
+            print("🛑 Shutdown broadcast received, workers will not be restarted")
+            self.stopping = True
+
+    def stop(self):
+        self.stopping = True
+        for cluster in self.clusters:
+            if cluster.process and cluster.process.returncode is None:
+                cluster.process.terminate()
+
+    async def supervise(self, cluster):
+        backoff = 1
+        while not self.stopping:
+            started = time.monotonic()
+            cluster.process = await asyncio.create_subprocess_exec(sys.executable, 'main.py', env=self.env_for(cluster))
+            print(f"🚀 Cluster {cluster.id} started (shards {cluster.shard_range[0]}-{cluster.shard_range[1]}, pid {cluster.process.pid})")
+            code = await cluster.process.wait()
+            await self.ipc.forget(cluster.id)
+            if self.stopping or code == 0:
+                print(f"👋 Cluster {cluster.id} exited")
+                break
+            # A worker that stayed up for a while gets a fresh backoff
+            if time.monotonic() - started > 300:
+                backoff = 1
+            cluster.restarts += 1
+            print(f"❌ Cluster {cluster.id} crashed (exit {code}), restarting in {backoff}s")
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 60)
+
+    async def run(self):
+        await self.ipc.start()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, self.stop)
+        print(f"🌐 IPC hub listening on 127.0.0.1:{self.ipc.port} | {len(self.clusters)} clusters, {self.shard_count} shards")
+        try:
+            await asyncio.gather(*(self.supervise(c) for c in self.clusters))
+        finally:
+            await self.ipc.close()
+
+async def main():
+    parser = argparse.ArgumentParser(description="Run the bot as several shard-owning processes")
+    parser.add_argument('--clusters', type=int, default=int(os.environ.get('CLUSTER_COUNT', 2)))
+    parser.add_argument('--shards', type=int, default=int(os.environ['SHARD_COUNT']) if os.environ.get('SHARD_COUNT') else None)
+    parser.add_argument('--base-port', type=int, default=8080, help="Keep-alive port of cluster 0; cluster N uses base + N")
+    args = parser.parse_args()
+
+    shard_count = args.shards
+    if shard_count is None:
+        token = os.environ.get('DISCORD_TOKEN')
+        if not token:
+            print("❌ DISCORD_TOKEN not found!")
+            return
+        shard_count = max(await recommended_shards(token), args.clusters)
+    await ClusterLauncher(args.clusters, shard_count, args.base_port).run()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -2,12 +2,28 @@ import discord
 from discord.ext import commands, tasks
 from discord import app_commands
 from datetime import datetime, timezone
-import json
-import os
+import time
 from config import Colors, Emojis
+from utils.storage import migrate
+from utils.presence import PresenceEngine
 
 DEVELOPER_ID = 1464984679982567454
 
+STATUS_TYPES = [
+    app_commands.Choice(name="👀 Watching", value="watching"),
+    app_commands.Choice(name="🎧 Listening", value="listening"),
+    app_commands.Choice(name="🎮 Playing", value="playing"),
+    app_commands.Choice(name="📺 Streaming", value="streaming"),
+]
+
+STATUS_VALUES = [
+    app_commands.Choice(name="👥 User Count", value="user-count"),
+    app_commands.Choice(name="🖥️ Server Count", value="server-count"),
+    app_commands.Choice(name="⚡ Commands Count", value="commands-count"),
+    app_commands.Choice(name="⏱️ Uptime", value="uptime"),
+    app_commands.Choice(name="✏️ Custom Message", value="custom"),
+]
+
 def is_developer():
     async def predicate(interaction: discord.Interaction):
         return interaction.user.id == DEVELOPER_ID
@@ -22,49 +38,69 @@ class DeveloperCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.data_file = 'data/status.json'
-        self.status_config = self.load_status()
+        self.status_config = bot.state.load(self.data_file, default=lambda: {"type": "watching", "value": "server-count", "custom": ""})
+        self.presence = PresenceEngine(bot, self.build_activity)
+        if bot.cluster:
+            bot.cluster.on('status', self.apply_status)
         self.update_status.start()
 
     def cog_unload(self):
         self.update_status.cancel()
+        self.presence.stop()
+        if self.bot.cluster:
+            self.bot.cluster.handlers.pop('status', None)
 
-    def load_status(self):
-        try:
-            with open(self.data_file, 'r') as f:
-                return json.load(f)
-        except FileNotFoundError:
-            return {"type": "watching", "value": "server-count", "custom": ""}
-
-    def save_status(self):
-        os.makedirs('data', exist_ok=True)
-        with open(self.data_file, 'w') as f:
-            json.dump(self.status_config, f, indent=4)
-
-    def get_status_text(self):
-        value = self.status_config.get("value", "server-count")
-        if value == "user-count": return f"{len(set(self.bot.get_all_members())):,} users"
-        elif value == "server-count": return f"{len(self.bot.guilds):,} servers"
+    async def save_status(self):
+        """Persist the status and, under the launcher, push it to every cluster's presence"""
+        self.bot.state.mark_dirty(self.data_file)
+        self.presence.request()
+        if self.bot.cluster:
+            await self.bot.cluster.broadcast("status", self.status_config)
+
+    async def apply_status(self, data):
+        # Updated in place: status_config is the StateStore's cached document
+        self.status_config.clear()
+        self.status_config.update(data)
+        self.presence.request()
+
+    def current_entry(self):
+        """Pick the active rotation template, or the single configured status"""
+        rotation = self.status_config.get("rotation")
+        if not rotation:
+            return self.status_config
+        interval = max(self.status_config.get("rotate_seconds", 60), 30)
+        return rotation[int(time.time() // interval) % len(rotation)]
+
+    def get_status_text(self, entry=None):
+        entry = entry or self.status_config
+        value = entry.get("value", "server-count")
+        if value == "user-count": return f"{self.bot.stats.totals()['users']:,} users"
+        elif value == "server-count": return f"{self.bot.stats.totals()['guilds']:,} servers"
         elif value == "commands-count": return f"{len(self.bot.commands)} commands"
         elif value == "uptime":
             delta = datetime.now(timezone.utc) - self.bot.start_time
             hours, rem = divmod(int(delta.total_seconds()), 3600)
             minutes, _ = divmod(rem, 60)
             return f"{hours}h {minutes}m uptime"
-        else: return self.status_config.get("custom", "Premium Bot")
+        else: return entry.get("custom", "Premium Bot")
 
-    def get_activity(self):
-        status_type = self.status_config.get("type", "watching")
-        text = self.get_status_text()
+    def get_activity(self, entry=None):
+        entry = entry or self.status_config
+        status_type = entry.get("type", "watching")
+        text = self.get_status_text(entry)
         if status_type == "watching": return discord.Activity(type=discord.ActivityType.watching, name=text)
         elif status_type == "listening": return discord.Activity(type=discord.ActivityType.listening, name=text)
         elif status_type == "playing": return discord.Game(name=text)
-        elif status_type == "streaming": return discord.Streaming(name=text, url=self.status_config.get("stream_url", "https://twitch.tv/discord"))
+        elif status_type == "streaming": return discord.Streaming(name=text, url=entry.get("stream_url", "https://twitch.tv/discord"))
         return discord.Activity(type=discord.ActivityType.watching, name=text)
 
+    def build_activity(self, shard_id):
+        return self.get_activity(self.current_entry())
+
     @tasks.loop(seconds=30)
     async def update_status(self):
         if self.bot.is_ready():
-            try: await self.bot.change_presence(activity=self.get_activity())
+            try: await self.presence.refresh()
             except: pass
 
     @update_status.before_loop
@@ -73,30 +109,42 @@ class DeveloperCog(commands.Cog):
 
     @app_commands.command(name="setup-status", description="🔒 Set bot status (Developer only)")
     @app_commands.describe(status_type="Status type", value="What to display", custom_text="Custom text", stream_url="Stream URL")
-    @app_commands.choices(status_type=[
-        app_commands.Choice(name="👀 Watching", value="watching"),
-        app_commands.Choice(name="🎧 Listening", value="listening"),
-        app_commands.Choice(name="🎮 Playing", value="playing"),
-        app_commands.Choice(name="📺 Streaming", value="streaming"),
-    ])
-    @app_commands.choices(value=[
-        app_commands.Choice(name="👥 User Count", value="user-count"),
-        app_commands.Choice(name="🖥️ Server Count", value="server-count"),
-        app_commands.Choice(name="⚡ Commands Count", value="commands-count"),
-        app_commands.Choice(name="⏱️ Uptime", value="uptime"),
-        app_commands.Choice(name="✏️ Custom Message", value="custom"),
-    ])
+    @app_commands.choices(status_type=STATUS_TYPES, value=STATUS_VALUES)
     @is_developer()
     async def setup_status_slash(self, interaction: discord.Interaction, status_type: str, value: str, custom_text: str = None, stream_url: str = None):
         self.status_config["type"] = status_type
         self.status_config["value"] = value
         if custom_text: self.status_config["custom"] = custom_text
         if stream_url: self.status_config["stream_url"] = stream_url
-        self.save_status()
-        await self.bot.change_presence(activity=self.get_activity())
+        self.status_config.pop("rotation", None)
+        await self.save_status()
         embed = discord.Embed(color=Colors.MAIN, description=f"{Emojis.CHECK} Status updated to: **{status_type.title()}** - {self.get_status_text()}")
         await interaction.response.send_message(embed=embed, ephemeral=True)
 
+    @app_commands.command(name="status-rotation", description="🔒 Rotate between several statuses (Developer only)")
+    @app_commands.describe(action="Add the given status or clear the rotation", status_type="Status type", value="What to display", custom_text="Custom text", interval="Seconds between rotations (min 30)")
+    @app_commands.choices(action=[
+        app_commands.Choice(name="➕ Add", value="add"),
+        app_commands.Choice(name="🗑️ Clear", value="clear"),
+    ], status_type=STATUS_TYPES, value=STATUS_VALUES)
+    @is_developer()
+    async def status_rotation_slash(self, interaction: discord.Interaction, action: str, status_type: str = "watching", value: str = "server-count", custom_text: str = None, interval: app_commands.Range[int, 30, 86400] = None):
+        rotation = self.status_config.setdefault("rotation", [])
+        if action == "clear":
+            rotation.clear()
+        else:
+            entry = {"type": status_type, "value": value}
+            if custom_text: entry["custom"] = custom_text
+            rotation.append(entry)
+        if interval: self.status_config["rotate_seconds"] = interval
+        await self.save_status()
+        if rotation:
+            lines = [f"`{i + 1}.` **{e['type'].title()}** - {self.get_status_text(e)}" for i, e in enumerate(rotation)]
+            description = f"{Emojis.CHECK} Rotating every **{max(self.status_config.get('rotate_seconds', 60), 30)}s**:\n" + "\n".join(lines)
+        else:
+            description = f"{Emojis.CHECK} Rotation cleared, using the single configured status."
+        await interaction.response.send_message(embed=discord.Embed(color=Colors.MAIN, description=description), ephemeral=True)
+
     @app_commands.command(name="change-profile", description="🔒 Change bot avatar (Developer only)")
     @app_commands.describe(image="New avatar image")
     @is_developer()
@@ -105,6 +153,7 @@ class DeveloperCog(commands.Cog):
         try:
             image_bytes = await image.read()
             await self.bot.user.edit(avatar=image_bytes)
+            self.bot.embeds.invalidate()
             embed = discord.Embed(color=Colors.MAIN, description=f"{Emojis.CHECK} Avatar updated!")
             embed.set_thumbnail(url=self.bot.user.display_avatar.url)
             await interaction.followup.send(embed=embed, ephemeral=True)
@@ -116,11 +165,106 @@ class DeveloperCog(commands.Cog):
     async def shutdown_slash(self, interaction: discord.Interaction):
         embed = discord.Embed(color=Colors.MAIN, description=f"{Emojis.CHECK} Shutting down... Goodbye! 👋")
         await interaction.response.send_message(embed=embed, ephemeral=True)
-        await self.bot.close()
+        # Under the cluster launcher every worker shuts down, this one included
+        if not (self.bot.cluster and await self.bot.cluster.broadcast("shutdown")):
+            await self.bot.close()
+
+    @app_commands.command(name="migrate-mod-data", description="🔒 Import JSON moderation data into SQLite (Developer only)")
+    @is_developer()
+    async def migrate_mod_data_slash(self, interaction: discord.Interaction):
+        await interaction.response.defer(ephemeral=True)
+        try:
+            # The JSON files can lag the StateStore by a flush interval
+            await self.bot.state.flush()
+            counts = await migrate()
+        except Exception as e:
+            return await interaction.followup.send(f"Failed: {e}", ephemeral=True)
+        embed = discord.Embed(color=Colors.MAIN, description=f"{Emojis.CHECK} Imported **{counts['warnings']}** warnings and **{counts['settings']}** settings from **{counts['guilds']}** servers.\nSet `MOD_STORAGE=sqlite` and restart to use the database.")
+        await interaction.followup.send(embed=embed, ephemeral=True)
+
+    @app_commands.command(name="reload-changelog", description="🔒 Reload the changelog from disk (Developer only)")
+    @is_developer()
+    async def reload_changelog_slash(self, interaction: discord.Interaction):
+        try:
+            count = await self.bot.changelog.reload()
+        except Exception as e:
+            return await interaction.response.send_message(f"Failed: {e}", ephemeral=True)
+        # Dropping the builders too, since release pages close over the old entries
+        self.bot.embeds.unregister('news:')
+        embed = discord.Embed(color=Colors.MAIN, description=f"{Emojis.CHECK} Loaded **{count}** changelog entries from `{self.bot.changelog.path}`.")
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+    @app_commands.command(name="sync-commands", description="🔒 Push slash commands to Discord (Developer only)")
+    @app_commands.describe(force="Sync even if nothing changed since the last sync")
+    @is_developer()
+    async def sync_commands_slash(self, interaction: discord.Interaction, force: bool = False):
+        await interaction.response.defer(ephemeral=True)
+        try:
+            result = await self.bot.command_sync.sync(force=force)
+        except Exception as e:
+            return await interaction.followup.send(f"Failed: {e}", ephemeral=True)
+        action = "Skipped, nothing changed" if result['skipped'] else f"Synced **{result['commands']}** commands"
+        embed = discord.Embed(color=Colors.MAIN, description=f"{Emojis.CHECK} {action} ({result['scope']}, {result['ms']}ms).")
+        embed.set_footer(text=f"Hash {result['hash']}")
+        await interaction.followup.send(embed=embed, ephemeral=True)
+
+    debug = app_commands.Group(name="debug", description="🔒 Runtime diagnostics (Developer only)")
+
+    def sparkline(self, values):
+        blocks = "▁▂▃▄▅▆▇█"
+        top = max(values) or 1
+        return "".join(blocks[min(int(v / top * (len(blocks) - 1)), len(blocks) - 1)] for v in values)
+
+    @debug.command(name="loop", description="🔒 Event-loop lag and recent stalls (Developer only)")
+    @is_developer()
+    async def debug_loop(self, interaction: discord.Interaction):
+        monitor = self.bot.loop_monitor
+        summary = monitor.summary()
+        embed = discord.Embed(color=Colors.MAIN)
+        embed.set_author(name="Event Loop", icon_url=self.bot.user.display_avatar.url)
+        embed.add_field(name="Current", value=f"```{summary['current_ms']}ms```", inline=True)
+        embed.add_field(name="Avg / P95", value=f"```{summary['avg_ms']} / {summary['p95_ms']}ms```", inline=True)
+        embed.add_field(name="Max", value=f"```{summary['max_ms']}ms```", inline=True)
+        recent = [lag for _, lag in list(monitor.readings)[-40:]]
+        if recent:
+            embed.add_field(name=f"Last {len(recent)} samples", value=f"`{self.sparkline(recent)}`", inline=False)
+        if monitor.stalls:
+            stall = monitor.stalls[-1]
+            stack = stall['stack'][-900:]
+            embed.add_field(name=f"Last stall: {stall['blocked_ms']}ms in {stall['task']} (<t:{int(stall['time'])}:R>)", value=f"```py\n{stack}```", inline=False)
+        embed.set_footer(text=f"{summary['samples']} samples • {summary['stalls']} stalls • threshold {int(monitor.threshold * 1000)}ms")
+        embed.timestamp = datetime.now(timezone.utc)
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+    @debug.command(name="startup", description="🔒 Startup timing breakdown (Developer only)")
+    @is_developer()
+    async def debug_startup(self, interaction: discord.Interaction):
+        summary = self.bot.startup.summary()
+        embed = discord.Embed(color=Colors.MAIN)
+        embed.set_author(name="Startup", icon_url=self.bot.user.display_avatar.url)
+        phases = "\n".join(f"{name:<14}{ms:>9.1f}ms" for name, ms in summary['phases'].items())
+        embed.add_field(name="Phases", value=f"```{phases}```", inline=False)
+        slowest = sorted(summary['extensions'].items(), key=lambda e: e[1], reverse=True)[:8]
+        if slowest:
+            lines = "\n".join(f"{name.removeprefix('cogs.'):<18}{ms:>8.1f}ms" for name, ms in slowest)
+            embed.add_field(name=f"Cogs ({len(summary['extensions'])} loaded concurrently)", value=f"```{lines}```", inline=False)
+        if summary['failed']:
+            embed.add_field(name="Failed", value="\n".join(f"`{name}`" for name in summary['failed']), inline=False)
+        ready = f"{summary['ready_ms'] / 1000:.2f}s" if summary['ready_ms'] is not None else "not ready yet"
+        memory = f" • {summary['memory_mb']} MB RSS" if summary['memory_mb'] is not None else ""
+        embed.set_footer(text=f"Process start to ready: {ready}{memory}")
+        embed.timestamp = datetime.now(timezone.utc)
+        await interaction.response.send_message(embed=embed, ephemeral=True)
 
     @setup_status_slash.error
+    @status_rotation_slash.error
+    @debug_loop.error
+    @debug_startup.error
     @change_profile_slash.error
     @shutdown_slash.error
+    @migrate_mod_data_slash.error
+    @reload_changelog_slash.error
+    @sync_commands_slash.error
     async def dev_error(self, interaction: discord.Interaction, error):
         if isinstance(error, app_commands.CheckFailure): return
         raise error
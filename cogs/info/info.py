@@ -3,34 +3,35 @@ from discord.ext import commands
 from discord import app_commands
 from datetime import datetime, timezone
 import platform
-from config import Colors, Emojis
+from config import Colors
+from utils.components import make_custom_id, select_menu
 
-class InfoSelect(discord.ui.Select):
-    def __init__(self, bot, user):
+INFO_PAGES = [("Overview", "🏠", "overview"), ("Stats", "📊", "stats"), ("System", "💻", "system"), ("Links", "🔗", "links")]
+
+class Info(commands.Cog):
+    def __init__(self, bot):
         self.bot = bot
-        self.original_user = user
-        options = [
-            discord.SelectOption(label="Overview", emoji="🏠", value="overview", default=True),
-            discord.SelectOption(label="Stats", emoji="📊", value="stats"),
-            discord.SelectOption(label="System", emoji="💻", value="system"),
-            discord.SelectOption(label="Links", emoji="🔗", value="links"),
-        ]
-        super().__init__(placeholder="Select a category", options=options)
-    
-    async def callback(self, interaction: discord.Interaction):
-        if interaction.user.id != self.original_user.id:
-            return await interaction.response.send_message("This isn't your menu.", ephemeral=True)
-        for opt in self.options:
-            opt.default = opt.value == self.values[0]
-        embed = self.make_embed(self.values[0])
-        await interaction.response.edit_message(embed=embed, view=self.view)
-    
+        bot.components.register('info', self.on_menu)
+        # Everything but the stats numbers is static, so those pages are built once and reused
+        for page, builder in (("overview", self.overview), ("stats", self.stats_template), ("system", self.system), ("links", self.links)):
+            bot.embeds.register(f"info:{page}", builder)
+
+    def cog_unload(self):
+        self.bot.components.unregister('info')
+        self.bot.embeds.unregister('info:')
+
+    def menu(self, owner_id, page="overview"):
+        options = [discord.SelectOption(label=label, emoji=emoji, value=value, default=value == page) for label, emoji, value in INFO_PAGES]
+        return select_menu(make_custom_id('info', owner_id), options)
+
+    async def on_menu(self, interaction, args, values):
+        page = values[0] if values else "overview"
+        await interaction.response.edit_message(embed=self.make_embed(page), view=self.menu(interaction.user.id, page))
+
     def make_embed(self, page):
-        if page == "overview": return self.overview()
-        elif page == "stats": return self.stats()
-        elif page == "system": return self.system()
-        elif page == "links": return self.links()
-        return self.overview()
+        if page == "stats": return self.stats()
+        if page not in ("overview", "system", "links"): page = "overview"
+        return self.bot.embeds.render(f"info:{page}")
     
     def overview(self):
         created_ts = int(self.bot.user.created_at.timestamp())
@@ -41,21 +42,30 @@ class InfoSelect(discord.ui.Select):
         embed.add_field(name="Library", value="discord.py", inline=True)
         embed.add_field(name="Created", value=f"<t:{created_ts}:R>", inline=True)
         embed.set_footer(text="Use the menu to explore more")
-        embed.timestamp = datetime.now(timezone.utc)
         return embed
     
-    def stats(self):
+    def stats_template(self):
         embed = discord.Embed(color=Colors.MAIN)
         embed.set_author(name="Statistics", icon_url=self.bot.user.display_avatar.url)
-        embed.add_field(name="Servers", value=f"```{len(self.bot.guilds)}```", inline=True)
-        embed.add_field(name="Users", value=f"```{len(set(self.bot.get_all_members()))}```", inline=True)
-        embed.add_field(name="Ping", value=f"```{round(self.bot.latency * 1000)}ms```", inline=True)
+        return embed
+    
+    def stats(self):
+        totals = self.bot.stats.totals()
         delta = datetime.now(timezone.utc) - self.bot.start_time
         hours, rem = divmod(int(delta.total_seconds()), 3600)
         minutes, seconds = divmod(rem, 60)
-        embed.add_field(name="Uptime", value=f"```{hours}h {minutes}m {seconds}s```", inline=False)
-        embed.timestamp = datetime.now(timezone.utc)
-        return embed
+        fields = [
+            ("Servers", f"```{totals['guilds']}```", True),
+            ("Users", f"```{totals['users']}```", True),
+            ("Ping", f"```{round(self.bot.latency * 1000)}ms```", True),
+            ("Uptime", f"```{hours}h {minutes}m {seconds}s```", False),
+        ]
+        if self.bot.shard_count and self.bot.shard_count > 1:
+            fields.append((f"Shards ({self.bot.shard_count})", self.bot.shard_monitor.format_lines(), False))
+        overrides = {}
+        if "clusters" in totals:
+            overrides['footer'] = {'text': f"Cluster {self.bot.cluster.cluster_id} of {totals['clusters']}"}
+        return self.bot.embeds.render("info:stats", fields, **overrides)
     
     def system(self):
         embed = discord.Embed(color=Colors.MAIN)
@@ -63,7 +73,6 @@ class InfoSelect(discord.ui.Select):
         embed.add_field(name="Python", value=f"```{platform.python_version()}```", inline=True)
         embed.add_field(name="discord.py", value=f"```{discord.__version__}```", inline=True)
         embed.add_field(name="Platform", value=f"```{platform.system()}```", inline=True)
-        embed.timestamp = datetime.now(timezone.utc)
         return embed
     
     def links(self):
@@ -72,39 +81,15 @@ class InfoSelect(discord.ui.Select):
         embed.set_author(name="Links", icon_url=self.bot.user.display_avatar.url)
         embed.add_field(name="Invite", value=f"[Add to server]({invite})", inline=True)
         embed.add_field(name="Support", value="[Join server](https://discord.gg/NJZvYZP4Cd)", inline=True)
-        embed.timestamp = datetime.now(timezone.utc)
         return embed
 
-class InfoView(discord.ui.View):
-    def __init__(self, bot, user):
-        super().__init__(timeout=60)
-        self.add_item(InfoSelect(bot, user))
-        self.message = None
-    
-    async def on_timeout(self):
-        for child in self.children:
-            child.disabled = True
-        if self.message:
-            try: await self.message.edit(view=self)
-            except: pass
-
-class Info(commands.Cog):
-    def __init__(self, bot):
-        self.bot = bot
-
     @app_commands.command(name="info", description="View bot information")
     async def info_slash(self, interaction: discord.Interaction):
-        view = InfoView(self.bot, interaction.user)
-        embed = view.children[0].overview()
-        await interaction.response.send_message(embed=embed, view=view)
-        view.message = await interaction.original_response()
+        await interaction.response.send_message(embed=self.make_embed("overview"), view=self.menu(interaction.user.id))
 
     @commands.command(name="info", aliases=["about"])
     async def info_prefix(self, ctx):
-        view = InfoView(self.bot, ctx.author)
-        embed = view.children[0].overview()
-        msg = await ctx.send(embed=embed, view=view)
-        view.message = msg
+        await ctx.send(embed=self.make_embed("overview"), view=self.menu(ctx.author.id))
 
 async def setup(bot):
     await bot.add_cog(Info(bot))
\ No newline at end of file
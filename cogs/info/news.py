@@ -1,84 +1,110 @@
 import discord
 from discord.ext import commands
 from discord import app_commands
-from datetime import datetime, timezone
-from config import Colors
+from config import Colors, Emojis
+from utils.components import make_custom_id, component_view
 
-NEWS_DATA = [
-    {"version": "1.0.0", "date": "2025-02-01", "title": "Bot Launch!", "highlights": ["Premium bot launched", "Added /ping, /uptime, /info", "Custom prefix per server"]}
-]
+NEWS_PAGES = [("Latest News", "📰", "latest"), ("All Updates", "📋", "all"), ("Coming Soon", "🔮", "upcoming")]
 
-UPCOMING = ["Moderation commands", "Music system", "Economy & leveling"]
-
-class NewsSelect(discord.ui.Select):
-    def __init__(self, bot, user):
+class News(commands.Cog):
+    def __init__(self, bot):
         self.bot = bot
-        self.original_user = user
-        options = [
-            discord.SelectOption(label="Latest News", emoji="📰", value="latest", default=True),
-            discord.SelectOption(label="All Updates", emoji="📋", value="all"),
-            discord.SelectOption(label="Coming Soon", emoji="🔮", value="upcoming"),
-        ]
-        super().__init__(placeholder="Select a category", options=options)
-    
-    async def callback(self, interaction: discord.Interaction):
-        if interaction.user.id != self.original_user.id:
-            return await interaction.response.send_message("This isn't your menu.", ephemeral=True)
-        for opt in self.options:
-            opt.default = opt.value == self.values[0]
-        embed = self.make_embed(self.values[0])
-        await interaction.response.edit_message(embed=embed, view=self.view)
-    
-    def make_embed(self, page):
+        self.changelog = bot.changelog
+        bot.components.register('news', self.on_menu)
+
+    def cog_unload(self):
+        self.bot.components.unregister('news')
+        self.bot.embeds.unregister('news:')
+
+    def menu(self, owner_id, page="latest", index=0):
+        options = [discord.SelectOption(label=label, emoji=emoji, value=value, default=value == page) for label, emoji, value in NEWS_PAGES]
+        items = [discord.ui.Select(custom_id=make_custom_id('news', owner_id), placeholder="Select a category", options=options, row=0)]
+        if page == "all" and self.changelog.page_count > 1:
+            items.append(discord.ui.Button(emoji="◀️", style=discord.ButtonStyle.secondary, row=1,
+                                           custom_id=make_custom_id('news', owner_id, 'all', index - 1), disabled=index == 0))
+            items.append(discord.ui.Button(label=f"{index + 1}/{self.changelog.page_count}", style=discord.ButtonStyle.secondary, row=1,
+                                           custom_id=make_custom_id('news', owner_id, 'page'), disabled=True))
+            items.append(discord.ui.Button(emoji="▶️", style=discord.ButtonStyle.secondary, row=1,
+                                           custom_id=make_custom_id('news', owner_id, 'all', index + 1), disabled=index >= self.changelog.page_count - 1))
+        return component_view(*items)
+
+    async def on_menu(self, interaction, args, values):
+        if values:
+            page, index = values[0], 0
+        elif len(args) == 2 and args[1].lstrip('-').isdigit():
+            page, index = args[0], int(args[1])
+        else:
+            return await interaction.response.defer()
+        embed = await self.make_embed(page, index)
+        index = min(max(index, 0), self.changelog.page_count - 1)
+        await interaction.response.edit_message(embed=embed, view=self.menu(interaction.user.id, page, index))
+
+    def template(self, name, builder):
+        """Render a cached page, registering its builder the first time it is asked for"""
+        if name not in self.bot.embeds.builders:
+            self.bot.embeds.register(name, builder)
+        return self.bot.embeds.render(name)
+
+    async def make_embed(self, page, index=0):
+        await self.changelog.ensure_loaded()
+        if page == "all":
+            index = min(max(index, 0), self.changelog.page_count - 1)
+            return self.template(f"news:all:{index}", lambda: self.build_all(index))
+        if page == "upcoming":
+            return self.template("news:upcoming", self.build_upcoming)
+        return self.template("news:latest", lambda: self.build_release(self.changelog.latest))
+
+    def base_embed(self, title="News"):
         embed = discord.Embed(color=Colors.MAIN)
-        embed.set_author(name="News" if page != "upcoming" else "Coming Soon", icon_url=self.bot.user.display_avatar.url)
-        
-        if page == "latest" and NEWS_DATA:
-            news = NEWS_DATA[0]
+        embed.set_author(name=title, icon_url=self.bot.user.display_avatar.url)
+        return embed
+
+    def build_release(self, news):
+        embed = self.base_embed()
+        if news:
             embed.title = f"📢 {news['title']}"
             embed.description = f"**Version:** `{news['version']}`\n**Date:** {news['date']}"
             highlights = "\n".join([f"> • {h}" for h in news["highlights"]])
-            embed.add_field(name="What's New", value=highlights, inline=False)
-        elif page == "all":
-            for news in NEWS_DATA[:5]:
-                embed.add_field(name=f"v{news['version']} - {news['title']}", value=f"> {news['date']}", inline=False)
-        elif page == "upcoming":
-            features = "\n".join([f"> 🔹 {f}" for f in UPCOMING])
-            embed.add_field(name="In Development", value=features, inline=False)
-        
-        embed.timestamp = datetime.now(timezone.utc)
+            embed.add_field(name="What's New", value=highlights[:1024], inline=False)
         return embed
 
-class NewsView(discord.ui.View):
-    def __init__(self, bot, user):
-        super().__init__(timeout=60)
-        self.add_item(NewsSelect(bot, user))
-        self.message = None
-    
-    async def on_timeout(self):
-        for child in self.children:
-            child.disabled = True
-        if self.message:
-            try: await self.message.edit(view=self)
-            except: pass
+    def build_all(self, index):
+        embed = self.base_embed()
+        for news in self.changelog.page(index):
+            embed.add_field(name=f"v{news['version']} - {news['title']}", value=f"> {news['date']}", inline=False)
+        embed.set_footer(text=f"Page {index + 1}/{self.changelog.page_count} • {len(self.changelog.releases)} updates")
+        return embed
 
-class News(commands.Cog):
-    def __init__(self, bot):
-        self.bot = bot
+    def build_upcoming(self):
+        embed = self.base_embed("Coming Soon")
+        features = "\n".join([f"> 🔹 {f}" for f in self.changelog.upcoming])
+        if features:
+            embed.add_field(name="In Development", value=features[:1024], inline=False)
+        return embed
+
+    async def find_release(self, query):
+        """Return (embed, error) for a version or date lookup"""
+        await self.changelog.ensure_loaded()
+        found = self.changelog.find(query)
+        if not found:
+            return None, discord.Embed(color=Colors.ERROR, description=f"{Emojis.CROSS} No update found for `{query[:50]}`.")
+        news = found[0]
+        return self.template(f"news:release:{news['version']}", lambda: self.build_release(news)), None
 
     @app_commands.command(name="news", description="View bot updates")
-    async def news_slash(self, interaction: discord.Interaction):
-        view = NewsView(self.bot, interaction.user)
-        embed = view.children[0].make_embed("latest")
-        await interaction.response.send_message(embed=embed, view=view)
-        view.message = await interaction.original_response()
+    @app_commands.describe(version="Show one update by version (e.g. 1.0.0) or date (YYYY-MM-DD)")
+    async def news_slash(self, interaction: discord.Interaction, version: str = None):
+        if version:
+            embed, error = await self.find_release(version)
+            return await interaction.response.send_message(embed=embed or error, ephemeral=error is not None)
+        await interaction.response.send_message(embed=await self.make_embed("latest"), view=self.menu(interaction.user.id))
 
     @commands.command(name="news", aliases=["updates"])
-    async def news_prefix(self, ctx):
-        view = NewsView(self.bot, ctx.author)
-        embed = view.children[0].make_embed("latest")
-        msg = await ctx.send(embed=embed, view=view)
-        view.message = msg
+    async def news_prefix(self, ctx, version: str = None):
+        if version:
+            embed, error = await self.find_release(version)
+            return await ctx.send(embed=embed or error)
+        await ctx.send(embed=await self.make_embed("latest"), view=self.menu(ctx.author.id))
 
 async def setup(bot):
-    await bot.add_cog(News(bot))
\ No newline at end of file
+    await bot.add_cog(News(bot))
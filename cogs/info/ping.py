@@ -3,7 +3,7 @@ from discord.ext import commands
 from discord import app_commands
 import time
 from datetime import datetime, timezone
-from config import Colors, Emojis
+from config import Colors
 
 class Ping(commands.Cog):
     def __init__(self, bot):
@@ -19,6 +19,11 @@ class Ping(commands.Cog):
         bars = min(int(ms / 30), 10)
         return "▰" * bars + "▱" * (10 - bars)
 
+    def add_shard_field(self, embed, guild):
+        if self.bot.shard_count and self.bot.shard_count > 1:
+            current = f" (this server: `#{guild.shard_id}`)" if guild else ""
+            embed.add_field(name=f"Shards{current}", value=self.bot.shard_monitor.format_lines(), inline=False)
+
     @app_commands.command(name="ping", description="Check the bot's latency")
     async def ping_slash(self, interaction: discord.Interaction):
         start = time.perf_counter()
@@ -32,6 +37,7 @@ class Ping(commands.Cog):
         embed.add_field(name="API", value=f"```{api}ms```", inline=True)
         embed.add_field(name="Status", value=f"```{self.get_status(ws)}```", inline=True)
         embed.add_field(name="Latency", value=f"`{self.make_bar(ws)}` {ws}ms", inline=False)
+        self.add_shard_field(embed, interaction.guild)
         embed.set_footer(text=f"Requested by {interaction.user.name}", icon_url=interaction.user.display_avatar.url)
         embed.timestamp = datetime.now(timezone.utc)
         
@@ -50,6 +56,7 @@ class Ping(commands.Cog):
         embed.add_field(name="API", value=f"```{api}ms```", inline=True)
         embed.add_field(name="Status", value=f"```{self.get_status(ws)}```", inline=True)
         embed.add_field(name="Latency", value=f"`{self.make_bar(ws)}` {ws}ms", inline=False)
+        self.add_shard_field(embed, ctx.guild)
         embed.set_footer(text=f"Requested by {ctx.author.name}", icon_url=ctx.author.display_avatar.url)
         embed.timestamp = datetime.now(timezone.utc)
         
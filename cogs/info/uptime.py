@@ -2,7 +2,7 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 from datetime import datetime, timezone
-from config import Colors, Emojis
+from config import Colors
 
 class Uptime(commands.Cog):
     def __init__(self, bot):
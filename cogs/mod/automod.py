@@ -0,0 +1,189 @@
+import discord
+from discord.ext import commands
+from discord import app_commands
+from datetime import datetime, timezone
+from config import Colors, Emojis
+from utils.automod import ACTIONS, MAX_WORDS
+from utils.raid import RESPONSES
+from utils.durations import parse_duration
+
+class AutomodCog(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+        self.engine = bot.automod
+        self.raid = bot.raid
+
+    def rules_embed(self, guild, rules):
+        embed = discord.Embed(color=Colors.MAIN)
+        embed.set_author(name=f"Automod • {guild.name}", icon_url=self.bot.user.display_avatar.url)
+        words = rules['words']
+        embed.add_field(name="Banned Words", value=f"```{len(words)} word(s)```", inline=True)
+        embed.add_field(name="Invite Links", value=f"```{'Blocked' if rules['invites'] else 'Allowed'}```", inline=True)
+        embed.add_field(name="Mention Limit", value=f"```{rules['max_mentions'] or 'Off'}```", inline=True)
+        embed.add_field(name="Caps Limit", value=f"```{str(rules['caps_ratio']) + '%' if rules['caps_ratio'] else 'Off'}```", inline=True)
+        action = rules['action'] + (f" ({rules['timeout']}s)" if rules['action'] == 'timeout' else "")
+        embed.add_field(name="Action", value=f"```{action}```", inline=True)
+        embed.add_field(name="Anti-Spam", value=f"```{'On' if rules['spam'] else 'Off'}```", inline=True)
+        hits = self.engine.hits + self.bot.spam.hits
+        if hits:
+            embed.set_footer(text=" • ".join(f"{rule}: {count}" for rule, count in hits.most_common()))
+        embed.timestamp = datetime.now(timezone.utc)
+        return embed
+
+    async def reply(self, interaction, message, error=False):
+        embed = discord.Embed(color=Colors.ERROR if error else Colors.MAIN, description=message)
+        await interaction.response.send_message(embed=embed, ephemeral=error)
+
+    automod = app_commands.Group(name="automod", description="Configure automatic moderation", guild_only=True,
+                                 default_permissions=discord.Permissions(manage_guild=True))
+
+    @automod.command(name="show", description="Show this server's automod rules")
+    async def show_slash(self, interaction: discord.Interaction):
+        rules = await self.engine.get_rules(interaction.guild.id)
+        await interaction.response.send_message(embed=self.rules_embed(interaction.guild, rules), ephemeral=True)
+
+    @automod.command(name="words", description="Add or remove banned words")
+    @app_commands.describe(action="What to do with the words", words="Words separated by commas")
+    @app_commands.choices(action=[app_commands.Choice(name="Add", value="add"), app_commands.Choice(name="Remove", value="remove"),
+                                  app_commands.Choice(name="Clear", value="clear")])
+    async def words_slash(self, interaction: discord.Interaction, action: str, words: str = ""):
+        given = {w.strip().lower() for w in words.split(',') if w.strip()}
+        if action != "clear" and not given:
+            return await self.reply(interaction, f"{Emojis.CROSS} Please provide at least one word.", error=True)
+        if any(len(w) > 50 for w in given):
+            return await self.reply(interaction, f"{Emojis.CROSS} Words must be 50 characters or less.", error=True)
+
+        current = set((await self.engine.get_rules(interaction.guild.id))['words'])
+        if action == "add":
+            current |= given
+        elif action == "remove":
+            current -= given
+        else:
+            current = set()
+        if len(current) > MAX_WORDS:
+            return await self.reply(interaction, f"{Emojis.CROSS} You can ban at most {MAX_WORDS} words.", error=True)
+
+        await self.engine.update_rules(interaction.guild.id, words=sorted(current))
+        await self.reply(interaction, f"{Emojis.CHECK} Banned word list updated. **{len(current)}** word(s) are now blocked.")
+
+    @automod.command(name="invites", description="Block or allow Discord invite links")
+    @app_commands.describe(enabled="Block invite links")
+    async def invites_slash(self, interaction: discord.Interaction, enabled: bool):
+        await self.engine.update_rules(interaction.guild.id, invites=enabled)
+        await self.reply(interaction, f"{Emojis.CHECK} Invite links are now **{'blocked' if enabled else 'allowed'}**.")
+
+    @automod.command(name="mentions", description="Limit mentions per message")
+    @app_commands.describe(limit="Most mentions allowed in one message (0 to disable)")
+    async def mentions_slash(self, interaction: discord.Interaction, limit: app_commands.Range[int, 0, 50]):
+        await self.engine.update_rules(interaction.guild.id, max_mentions=limit)
+        await self.reply(interaction, f"{Emojis.CHECK} Mention limit {'set to **' + str(limit) + '**' if limit else 'disabled'}.")
+
+    @automod.command(name="caps", description="Limit messages written in capitals")
+    @app_commands.describe(percent="Highest share of capital letters allowed (0 to disable)")
+    async def caps_slash(self, interaction: discord.Interaction, percent: app_commands.Range[int, 0, 100]):
+        await self.engine.update_rules(interaction.guild.id, caps_ratio=percent)
+        await self.reply(interaction, f"{Emojis.CHECK} Caps limit {'set to **' + str(percent) + '%**' if percent else 'disabled'}.")
+
+    @automod.command(name="spam", description="Time out members who flood, repeat or mass-mention")
+    @app_commands.describe(enabled="Enable anti-spam")
+    async def spam_slash(self, interaction: discord.Interaction, enabled: bool):
+        await self.engine.update_rules(interaction.guild.id, spam=enabled)
+        await self.reply(interaction, f"{Emojis.CHECK} Anti-spam is now **{'on' if enabled else 'off'}**.")
+
+    @automod.command(name="action", description="Choose what happens to rule breakers")
+    @app_commands.describe(action="Action after the message is deleted", duration="Timeout length (e.g. 10m, 1h)")
+    @app_commands.choices(action=[app_commands.Choice(name=a.title(), value=a) for a in ACTIONS])
+    async def action_slash(self, interaction: discord.Interaction, action: str, duration: str = "10m"):
+        changes = {'action': action}
+        if action == "timeout":
+            seconds = parse_duration(duration)
+            if not seconds or seconds > 2419200:
+                return await self.reply(interaction, f"{Emojis.CROSS} Invalid duration. Use e.g. `10m`, `1h` (max 28 days).", error=True)
+            changes['timeout'] = seconds
+        await self.engine.update_rules(interaction.guild.id, **changes)
+        await self.reply(interaction, f"{Emojis.CHECK} Automod action set to **{action}**.")
+
+    def raid_embed(self, guild, config):
+        embed = discord.Embed(color=Colors.MAIN)
+        embed.set_author(name=f"Anti-Raid • {guild.name}", icon_url=self.bot.user.display_avatar.url)
+        embed.add_field(name="Status", value=f"```{'Enabled' if config['enabled'] else 'Disabled'}```", inline=True)
+        embed.add_field(name="Trigger", value=f"```{config['joins']} joins / {config['seconds']}s```", inline=True)
+        embed.add_field(name="Young Accounts", value=f"```{config['young_joins']} under {config['young_days']}d```", inline=True)
+        embed.add_field(name="Response", value=f"```{config['response']}```", inline=True)
+        embed.add_field(name="Raid Mode", value=f"```{config['duration'] // 60}m```", inline=True)
+        channels = " ".join(f"<#{cid}>" for cid in config['channels']) or "All public text channels"
+        embed.add_field(name="Channels", value=channels[:1024], inline=False)
+        footer = [f"Raids detected since restart: {self.raid.raids[guild.id]}"]
+        if self.raid.is_active(guild.id):
+            footer.insert(0, "🚨 Raid mode is active")
+        embed.set_footer(text=" • ".join(footer))
+        embed.timestamp = datetime.now(timezone.utc)
+        return embed
+
+    antiraid = app_commands.Group(name="antiraid", description="Configure join-raid protection", guild_only=True,
+                                  default_permissions=discord.Permissions(manage_guild=True))
+
+    @antiraid.command(name="show", description="Show this server's anti-raid settings")
+    async def antiraid_show_slash(self, interaction: discord.Interaction):
+        config = await self.raid.get_config(interaction.guild.id)
+        await interaction.response.send_message(embed=self.raid_embed(interaction.guild, config), ephemeral=True)
+
+    @antiraid.command(name="config", description="Change anti-raid detection and response")
+    @app_commands.describe(enabled="Enable anti-raid", joins="Joins that count as a raid", seconds="Window for counting joins",
+                           young_days="Accounts younger than this many days are suspicious", young_joins="Young accounts that count as a raid",
+                           response="What to do when a raid is detected", slowmode="Slowmode seconds for the slowmode response",
+                           duration="How long raid mode lasts (e.g. 15m, 1h)", quarantine_role="Role given to joiners during a raid (default: timeout)")
+    @app_commands.choices(response=[app_commands.Choice(name=r.title(), value=r) for r in RESPONSES])
+    async def antiraid_config_slash(self, interaction: discord.Interaction, enabled: bool = None, joins: app_commands.Range[int, 2, 100] = None,
+                                    seconds: app_commands.Range[int, 1, 300] = None, young_days: app_commands.Range[int, 0, 365] = None,
+                                    young_joins: app_commands.Range[int, 1, 100] = None, response: str = None,
+                                    slowmode: app_commands.Range[int, 1, 21600] = None, duration: str = None, quarantine_role: discord.Role = None):
+        changes = {k: v for k, v in (('enabled', enabled), ('joins', joins), ('seconds', seconds), ('young_days', young_days),
+                                     ('young_joins', young_joins), ('response', response), ('slowmode', slowmode)) if v is not None}
+        if duration is not None:
+            seconds_total = parse_duration(duration)
+            if not seconds_total or seconds_total > 86400:
+                return await self.reply(interaction, f"{Emojis.CROSS} Invalid duration. Use e.g. `15m`, `1h` (max 1 day).", error=True)
+            changes['duration'] = seconds_total
+        if quarantine_role is not None:
+            changes['quarantine_role'] = quarantine_role.id
+        config = await self.raid.update_config(interaction.guild.id, **changes)
+        await interaction.response.send_message(embed=self.raid_embed(interaction.guild, config), ephemeral=True)
+
+    @antiraid.command(name="channels", description="Choose the channels the slowmode and lock responses touch")
+    @app_commands.describe(action="What to do with the channel", channel="Channel")
+    @app_commands.choices(action=[app_commands.Choice(name="Add", value="add"), app_commands.Choice(name="Remove", value="remove"),
+                                  app_commands.Choice(name="Clear (use all public channels)", value="clear")])
+    async def antiraid_channels_slash(self, interaction: discord.Interaction, action: str, channel: discord.TextChannel = None):
+        config = await self.raid.get_config(interaction.guild.id)
+        channels = list(config['channels'])
+        if action == "clear":
+            channels = []
+        elif channel is None:
+            return await self.reply(interaction, f"{Emojis.CROSS} Please pick a channel.", error=True)
+        elif action == "add" and channel.id not in channels:
+            channels.append(channel.id)
+        elif action == "remove" and channel.id in channels:
+            channels.remove(channel.id)
+        await self.raid.update_config(interaction.guild.id, channels=channels)
+        await self.reply(interaction, f"{Emojis.CHECK} Anti-raid will touch **{len(channels) or 'all public'}** channel(s).")
+
+    @antiraid.command(name="end", description="End raid mode and undo its slowmode, lock or quarantine now")
+    async def antiraid_end_slash(self, interaction: discord.Interaction):
+        # Raid jobs outlive a restart even though the active flag doesn't
+        if not self.raid.is_active(interaction.guild.id) and not self.raid.raid_jobs(interaction.guild.id):
+            return await self.reply(interaction, f"{Emojis.CROSS} Raid mode is not active.", error=True)
+        await interaction.response.defer()
+        released = await self.raid.end(interaction.guild)
+        embed = discord.Embed(color=Colors.MAIN, description=f"{Emojis.CHECK} Raid mode ended. Channels are being restored and **{released}** quarantined member(s) were released.")
+        await interaction.followup.send(embed=embed)
+
+    @commands.command(name="automod")
+    @commands.has_permissions(manage_guild=True)
+    @commands.guild_only()
+    async def automod_prefix(self, ctx):
+        rules = await self.engine.get_rules(ctx.guild.id)
+        await ctx.send(embed=self.rules_embed(ctx.guild, rules))
+
+async def setup(bot):
+    await bot.add_cog(AutomodCog(bot))
@@ -2,42 +2,109 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 from datetime import datetime, timezone, timedelta
-import json
-import os
 import re
+import time
 from config import Colors, Emojis
+from utils.purge import PurgeFilter, PurgeJob
+from utils.workers import BatchRunner
+from utils.durations import parse_duration
 
-class ModData:
-    def __init__(self):
-        self.data_folder = 'data/mod'
-        os.makedirs(self.data_folder, exist_ok=True)
-    
-    def _get_path(self, guild_id, file):
-        return f'{self.data_folder}/{guild_id}_{file}.json'
-    
-    def load(self, guild_id, file):
-        try:
-            with open(self._get_path(guild_id, file), 'r') as f:
-                return json.load(f)
-        except FileNotFoundError:
-            return {}
-    
-    def save(self, guild_id, file, data):
-        with open(self._get_path(guild_id, file), 'w') as f:
-            json.dump(data, f, indent=2)
+BLACKLIST_PAGE_SIZE = 15
+PURGE_MAX = 10000
+MASS_MAX = 1000
+MASS_CONCURRENCY = 4
+TEMPBAN_MAX = 31536000  # 365 days
+
+class BlacklistView(discord.ui.View):
+    def __init__(self, cog, user, warns):
+        super().__init__(timeout=120)
+        self.cog = cog
+        self.original_user = user
+        self.warns = warns
+        self.page = 0
+        self.pages = (len(warns) - 1) // BLACKLIST_PAGE_SIZE + 1
+        self.message = None
+        self.update_buttons()
+
+    def update_buttons(self):
+        self.previous.disabled = self.page == 0
+        self.next.disabled = self.page >= self.pages - 1
+
+    async def turn(self, interaction, delta):
+        if interaction.user.id != self.original_user.id:
+            return await interaction.response.send_message("This isn't your menu.", ephemeral=True)
+        await interaction.response.defer()
+        self.page = max(0, min(self.page + delta, self.pages - 1))
+        self.update_buttons()
+        embed = await self.cog.build_blacklist_embed(interaction.guild, self.warns, self.page)
+        await interaction.edit_original_response(embed=embed, view=self)
+
+    @discord.ui.button(emoji="◀️", style=discord.ButtonStyle.secondary)
+    async def previous(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self.turn(interaction, -1)
+
+    @discord.ui.button(emoji="▶️", style=discord.ButtonStyle.secondary)
+    async def next(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self.turn(interaction, 1)
+
+    async def on_timeout(self):
+        for child in self.children:
+            child.disabled = True
+        if self.message:
+            try: await self.message.edit(view=self)
+            except: pass
+
+class CancelView(discord.ui.View):
+    """Cancel button for a long-running job such as a purge or mass action"""
+    def __init__(self, job, user):
+        super().__init__(timeout=None)
+        self.job = job
+        self.original_user = user
+
+    @discord.ui.button(label="Cancel", emoji="🛑", style=discord.ButtonStyle.danger)
+    async def cancel(self, interaction: discord.Interaction, button: discord.ui.Button):
+        if interaction.user.id != self.original_user.id:
+            return await interaction.response.send_message("This isn't yours to cancel.", ephemeral=True)
+        self.job.cancel()
+        button.disabled = True
+        await interaction.response.edit_message(view=self)
+
+class ConfirmView(discord.ui.View):
+    def __init__(self, user):
+        super().__init__(timeout=60)
+        self.original_user = user
+        self.confirmed = False
+
+    async def interaction_check(self, interaction: discord.Interaction):
+        if interaction.user.id != self.original_user.id:
+            await interaction.response.send_message("This isn't your menu.", ephemeral=True)
+            return False
+        return True
+
+    @discord.ui.button(label="Confirm", style=discord.ButtonStyle.danger)
+    async def confirm(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.confirmed = True
+        await interaction.response.defer()
+        self.stop()
+
+    @discord.ui.button(label="Cancel", style=discord.ButtonStyle.secondary)
+    async def cancel(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await interaction.response.defer()
+        self.stop()
 
 class ModerationCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.data = ModData()
+        self.data = bot.mod_data
+        self.purges = {}
+        self.scheduler = bot.scheduler
+        self.scheduler.register('unban', self.expire_ban)
+        self.scheduler.register('unlock', self.expire_lock)
+        self.scheduler.register('slowmode', self.expire_slowmode)
+        self.scheduler.register('warn', self.expire_warn)
 
     def parse_duration(self, duration):
-        time_units = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
-        match = re.match(r'^(\d+)([smhd])$', duration.lower())
-        if not match:
-            return None
-        amount, unit = int(match.group(1)), match.group(2)
-        return amount * time_units[unit]
+        return parse_duration(duration)
 
     async def check_mod_action(self, ctx_or_interaction, member, action):
         """Check if mod action can be performed and return error message if not"""
@@ -97,6 +164,50 @@ class ModerationCog(commands.Cog):
         else:
             await ctx_or_interaction.send(embed=embed)
 
+    # ═══════════════════════════════════════════════════════════
+    # SCHEDULED ACTIONS
+    # ═══════════════════════════════════════════════════════════
+    async def expire_ban(self, guild, data):
+        try:
+            await guild.unban(discord.Object(id=data['user']), reason="Temporary ban expired")
+        except discord.NotFound:
+            return
+        self.bot.modlog.emit(guild, "unban", discord.Object(id=data['user']), guild.me, "Temporary ban expired")
+
+    async def expire_lock(self, guild, data):
+        channel = guild.get_channel(data['channel'])
+        if channel:
+            await channel.set_permissions(guild.default_role, send_messages=True)
+            self.bot.modlog.emit(guild, "unlock", None, guild.me, "Timed lock expired", channel=channel.mention)
+
+    async def expire_slowmode(self, guild, data):
+        channel = guild.get_channel(data['channel'])
+        if channel:
+            await channel.edit(slowmode_delay=data['previous'])
+            self.bot.modlog.emit(guild, "slowmode", None, guild.me, "Timed slowmode expired", channel=channel.mention,
+                                 delay=f"{data['previous']}s" if data['previous'] else "Off")
+
+    async def expire_warn(self, guild, data):
+        await self.data.remove_warn(guild.id, data['user'], data['warn'])
+
+    async def schedule_warn_expiry(self, guild_id, user_id, warns):
+        settings = await self.data.get_settings(guild_id)
+        if settings.get('warn_expiry'):
+            warn_id = warns[-1]['id']
+            self.scheduler.schedule(f"warn:{guild_id}:{user_id}:{warn_id}", 'warn', guild_id, settings['warn_expiry'], user=user_id, warn=warn_id)
+
+    async def issue_warn(self, guild, member, reason, moderator):
+        """Store a warning, schedule its expiry and DM the member; returns their warnings"""
+        user_warns = await self.data.add_warn(guild.id, member.id, reason, moderator.id)
+        await self.schedule_warn_expiry(guild.id, member.id, user_warns)
+        self.bot.notifier.enqueue(member, f"You have been warned in **{guild.name}**\n**Reason:** {reason}\n**Total Warnings:** {len(user_warns)}")
+        return user_warns
+
+    def log_action(self, ctx_or_interaction, action, target=None, reason=None, **details):
+        """Queue a moderation event for the guild's mod-log channel"""
+        user = ctx_or_interaction.user if isinstance(ctx_or_interaction, discord.Interaction) else ctx_or_interaction.author
+        self.bot.modlog.emit(ctx_or_interaction.guild, action, target, user, reason, **details)
+
     # ═══════════════════════════════════════════════════════════
     # KICK COMMAND
     # ═══════════════════════════════════════════════════════════
@@ -108,12 +219,10 @@ class ModerationCog(commands.Cog):
         if error:
             return await self.send_error(interaction, error)
         
-        try:
-            await member.send(f"You have been kicked from **{interaction.guild.name}**\n**Reason:** {reason}")
-        except:
-            pass
+        await self.bot.notifier.send_now(member, f"You have been kicked from **{interaction.guild.name}**\n**Reason:** {reason}")
         
         await member.kick(reason=f"{reason} | By: {interaction.user}")
+        self.log_action(interaction, "kick", member, reason)
         await self.send_success(interaction, f"{Emojis.CHECK} **{member}** has been kicked.\n**Reason:** {reason}")
 
     @commands.command(name="kick")
@@ -126,12 +235,10 @@ class ModerationCog(commands.Cog):
         if error:
             return await self.send_error(ctx, error)
         
-        try:
-            await member.send(f"You have been kicked from **{ctx.guild.name}**\n**Reason:** {reason}")
-        except:
-            pass
+        await self.bot.notifier.send_now(member, f"You have been kicked from **{ctx.guild.name}**\n**Reason:** {reason}")
         
         await member.kick(reason=f"{reason} | By: {ctx.author}")
+        self.log_action(ctx, "kick", member, reason)
         await self.send_success(ctx, f"{Emojis.CHECK} **{member}** has been kicked.\n**Reason:** {reason}")
 
 
@@ -147,12 +254,10 @@ class ModerationCog(commands.Cog):
         if error:
             return await self.send_error(interaction, error)
         
-        try:
-            await member.send(f"You have been banned from **{interaction.guild.name}**\n**Reason:** {reason}")
-        except:
-            pass
+        await self.bot.notifier.send_now(member, f"You have been banned from **{interaction.guild.name}**\n**Reason:** {reason}")
         
         await member.ban(reason=f"{reason} | By: {interaction.user}")
+        self.log_action(interaction, "ban", member, reason)
         await self.send_success(interaction, f"{Emojis.CHECK} **{member}** has been banned.\n**Reason:** {reason}")
 
     @commands.command(name="ban")
@@ -165,14 +270,50 @@ class ModerationCog(commands.Cog):
         if error:
             return await self.send_error(ctx, error)
         
-        try:
-            await member.send(f"You have been banned from **{ctx.guild.name}**\n**Reason:** {reason}")
-        except:
-            pass
+        await self.bot.notifier.send_now(member, f"You have been banned from **{ctx.guild.name}**\n**Reason:** {reason}")
         
         await member.ban(reason=f"{reason} | By: {ctx.author}")
+        self.log_action(ctx, "ban", member, reason)
         await self.send_success(ctx, f"{Emojis.CHECK} **{member}** has been banned.\n**Reason:** {reason}")
 
+    # ═══════════════════════════════════════════════════════════
+    # TEMPBAN COMMAND
+    # ═══════════════════════════════════════════════════════════
+    async def tempban(self, ctx_or_interaction, member, duration, reason):
+        user = ctx_or_interaction.user if isinstance(ctx_or_interaction, discord.Interaction) else ctx_or_interaction.author
+        guild = ctx_or_interaction.guild
+        error = await self.check_mod_action(ctx_or_interaction, member, "ban")
+        if error:
+            return await self.send_error(ctx_or_interaction, error)
+        
+        seconds = self.parse_duration(duration)
+        if not seconds:
+            return await self.send_error(ctx_or_interaction, f"{Emojis.CROSS} Invalid duration format.\n**Examples:** `30m`, `12h`, `7d`")
+        
+        if seconds > TEMPBAN_MAX:
+            return await self.send_error(ctx_or_interaction, f"{Emojis.CROSS} Temporary bans cannot exceed 365 days.")
+        
+        await self.bot.notifier.send_now(member, f"You have been banned from **{guild.name}** for **{duration}**\n**Reason:** {reason}")
+        
+        await member.ban(reason=f"{reason} | By: {user} ({duration})")
+        self.scheduler.schedule(f"unban:{guild.id}:{member.id}", 'unban', guild.id, seconds, user=member.id)
+        self.log_action(ctx_or_interaction, "ban", member, reason, duration=duration)
+        await self.send_success(ctx_or_interaction, f"{Emojis.CHECK} **{member}** has been banned for **{duration}**.\n**Reason:** {reason}")
+
+    @app_commands.command(name="tempban", description="Ban a member for a limited time")
+    @app_commands.describe(member="Member to ban", duration="Duration (e.g., 30m, 12h, 7d)", reason="Reason for ban")
+    @app_commands.default_permissions(ban_members=True)
+    async def tempban_slash(self, interaction: discord.Interaction, member: discord.Member, duration: str, reason: str = "No reason provided"):
+        await self.tempban(interaction, member, duration, reason)
+
+    @commands.command(name="tempban")
+    @commands.has_permissions(ban_members=True)
+    async def tempban_prefix(self, ctx, member: discord.Member = None, duration: str = None, *, reason: str = "No reason provided"):
+        if member is None or duration is None:
+            return await self.send_error(ctx, f"{Emojis.CROSS} Please mention a member and a duration.\n**Usage:** `!tempban @member <duration> [reason]`")
+        
+        await self.tempban(ctx, member, duration, reason)
+
 
 
     # ═══════════════════════════════════════════════════════════
@@ -190,6 +331,8 @@ class ModerationCog(commands.Cog):
         try:
             user = await self.bot.fetch_user(user_id_int)
             await interaction.guild.unban(user)
+            self.scheduler.cancel(f"unban:{interaction.guild.id}:{user.id}")
+            self.log_action(interaction, "unban", user)
             await self.send_success(interaction, f"{Emojis.CHECK} **{user}** has been unbanned.")
         except discord.NotFound:
             await self.send_error(interaction, f"{Emojis.CROSS} User not found or not banned.")
@@ -210,6 +353,8 @@ class ModerationCog(commands.Cog):
         try:
             user = await self.bot.fetch_user(user_id_int)
             await ctx.guild.unban(user)
+            self.scheduler.cancel(f"unban:{ctx.guild.id}:{user.id}")
+            self.log_action(ctx, "unban", user)
             await self.send_success(ctx, f"{Emojis.CHECK} **{user}** has been unbanned.")
         except discord.NotFound:
             await self.send_error(ctx, f"{Emojis.CROSS} User not found or not banned.")
@@ -234,12 +379,10 @@ class ModerationCog(commands.Cog):
         if seconds > 2419200:  # 28 days max
             return await self.send_error(interaction, f"{Emojis.CROSS} Timeout cannot exceed 28 days.")
         
-        try:
-            await member.send(f"You have been timed out in **{interaction.guild.name}** for **{duration}**\n**Reason:** {reason}")
-        except:
-            pass
+        self.bot.notifier.enqueue(member, f"You have been timed out in **{interaction.guild.name}** for **{duration}**\n**Reason:** {reason}")
         
         await member.timeout(timedelta(seconds=seconds), reason=f"{reason} | By: {interaction.user}")
+        self.log_action(interaction, "timeout", member, reason, duration=duration)
         await self.send_success(interaction, f"{Emojis.CHECK} **{member}** has been timed out for **{duration}**.\n**Reason:** {reason}")
 
     @commands.command(name="timeout", aliases=["mute", "to"])
@@ -262,12 +405,10 @@ class ModerationCog(commands.Cog):
         if seconds > 2419200:
             return await self.send_error(ctx, f"{Emojis.CROSS} Timeout cannot exceed 28 days.")
         
-        try:
-            await member.send(f"You have been timed out in **{ctx.guild.name}** for **{duration}**\n**Reason:** {reason}")
-        except:
-            pass
+        self.bot.notifier.enqueue(member, f"You have been timed out in **{ctx.guild.name}** for **{duration}**\n**Reason:** {reason}")
         
         await member.timeout(timedelta(seconds=seconds), reason=f"{reason} | By: {ctx.author}")
+        self.log_action(ctx, "timeout", member, reason, duration=duration)
         await self.send_success(ctx, f"{Emojis.CHECK} **{member}** has been timed out for **{duration}**.\n**Reason:** {reason}")
 
 
@@ -283,6 +424,7 @@ class ModerationCog(commands.Cog):
             return await self.send_error(interaction, f"{Emojis.CROSS} **{member}** is not currently timed out.")
         
         await member.timeout(None)
+        self.log_action(interaction, "untimeout", member)
         await self.send_success(interaction, f"{Emojis.CHECK} Timeout removed from **{member}**.")
 
     @commands.command(name="untimeout", aliases=["unmute", "removetimeout"])
@@ -295,6 +437,7 @@ class ModerationCog(commands.Cog):
             return await self.send_error(ctx, f"{Emojis.CROSS} **{member}** is not currently timed out.")
         
         await member.timeout(None)
+        self.log_action(ctx, "untimeout", member)
         await self.send_success(ctx, f"{Emojis.CHECK} Timeout removed from **{member}**.")
 
     # ═══════════════════════════════════════════════════════════
@@ -308,23 +451,9 @@ class ModerationCog(commands.Cog):
         if error:
             return await self.send_error(interaction, error)
         
-        warns = self.data.load(interaction.guild.id, 'warns')
-        user_warns = warns.get(str(member.id), [])
-        warn_id = len(user_warns) + 1
-        user_warns.append({
-            'id': warn_id,
-            'reason': reason,
-            'mod': interaction.user.id,
-            'time': datetime.now(timezone.utc).isoformat()
-        })
-        warns[str(member.id)] = user_warns
-        self.data.save(interaction.guild.id, 'warns', warns)
-        
-        try:
-            await member.send(f"You have been warned in **{interaction.guild.name}**\n**Reason:** {reason}\n**Total Warnings:** {len(user_warns)}")
-        except:
-            pass
+        user_warns = await self.issue_warn(interaction.guild, member, reason, interaction.user)
         
+        self.log_action(interaction, "warn", member, reason, total_warnings=len(user_warns))
         await self.send_success(interaction, f"{Emojis.CHECK} **{member}** has been warned.\n**Reason:** {reason}\n**Total Warnings:** {len(user_warns)}")
 
     @commands.command(name="warn")
@@ -337,23 +466,9 @@ class ModerationCog(commands.Cog):
         if error:
             return await self.send_error(ctx, error)
         
-        warns = self.data.load(ctx.guild.id, 'warns')
-        user_warns = warns.get(str(member.id), [])
-        warn_id = len(user_warns) + 1
-        user_warns.append({
-            'id': warn_id,
-            'reason': reason,
-            'mod': ctx.author.id,
-            'time': datetime.now(timezone.utc).isoformat()
-        })
-        warns[str(member.id)] = user_warns
-        self.data.save(ctx.guild.id, 'warns', warns)
-        
-        try:
-            await member.send(f"You have been warned in **{ctx.guild.name}**\n**Reason:** {reason}\n**Total Warnings:** {len(user_warns)}")
-        except:
-            pass
+        user_warns = await self.issue_warn(ctx.guild, member, reason, ctx.author)
         
+        self.log_action(ctx, "warn", member, reason, total_warnings=len(user_warns))
         await self.send_success(ctx, f"{Emojis.CHECK} **{member}** has been warned.\n**Reason:** {reason}\n**Total Warnings:** {len(user_warns)}")
 
     # ═══════════════════════════════════════════════════════════
@@ -363,18 +478,17 @@ class ModerationCog(commands.Cog):
     @app_commands.describe(member="Member", warn_id="Warning ID to remove")
     @app_commands.default_permissions(moderate_members=True)
     async def removewarn_slash(self, interaction: discord.Interaction, member: discord.Member, warn_id: int):
-        warns = self.data.load(interaction.guild.id, 'warns')
-        user_warns = warns.get(str(member.id), [])
+        user_warns = await self.data.get_warns(interaction.guild.id, member.id)
         
         if not user_warns:
             return await self.send_error(interaction, f"{Emojis.CROSS} **{member}** has no warnings.")
         
-        new_warns = [w for w in user_warns if w['id'] != warn_id]
-        if len(new_warns) == len(user_warns):
+        new_warns = await self.data.remove_warn(interaction.guild.id, member.id, warn_id)
+        if new_warns is None:
             return await self.send_error(interaction, f"{Emojis.CROSS} Warning **#{warn_id}** not found for **{member}**.")
         
-        warns[str(member.id)] = new_warns
-        self.data.save(interaction.guild.id, 'warns', warns)
+        self.scheduler.cancel(f"warn:{interaction.guild.id}:{member.id}:{warn_id}")
+        self.log_action(interaction, "unwarn", member, warning=f"#{warn_id}", remaining_warnings=len(new_warns))
         await self.send_success(interaction, f"{Emojis.CHECK} Warning **#{warn_id}** removed from **{member}**.\n**Remaining Warnings:** {len(new_warns)}")
 
     @commands.command(name="removewarn", aliases=["delwarn", "unwarn"])
@@ -386,18 +500,17 @@ class ModerationCog(commands.Cog):
         if warn_id is None:
             return await self.send_error(ctx, f"{Emojis.CROSS} Please provide a warning ID.\n**Usage:** `!removewarn @member <warn_id>`\nUse `!warnings @member` to see warning IDs.")
         
-        warns = self.data.load(ctx.guild.id, 'warns')
-        user_warns = warns.get(str(member.id), [])
+        user_warns = await self.data.get_warns(ctx.guild.id, member.id)
         
         if not user_warns:
             return await self.send_error(ctx, f"{Emojis.CROSS} **{member}** has no warnings.")
         
-        new_warns = [w for w in user_warns if w['id'] != warn_id]
-        if len(new_warns) == len(user_warns):
+        new_warns = await self.data.remove_warn(ctx.guild.id, member.id, warn_id)
+        if new_warns is None:
             return await self.send_error(ctx, f"{Emojis.CROSS} Warning **#{warn_id}** not found for **{member}**.")
         
-        warns[str(member.id)] = new_warns
-        self.data.save(ctx.guild.id, 'warns', warns)
+        self.scheduler.cancel(f"warn:{ctx.guild.id}:{member.id}:{warn_id}")
+        self.log_action(ctx, "unwarn", member, warning=f"#{warn_id}", remaining_warnings=len(new_warns))
         await self.send_success(ctx, f"{Emojis.CHECK} Warning **#{warn_id}** removed from **{member}**.\n**Remaining Warnings:** {len(new_warns)}")
 
     # ═══════════════════════════════════════════════════════════
@@ -407,8 +520,7 @@ class ModerationCog(commands.Cog):
     @app_commands.describe(member="Member to check")
     @app_commands.default_permissions(moderate_members=True)
     async def warnings_slash(self, interaction: discord.Interaction, member: discord.Member):
-        warns = self.data.load(interaction.guild.id, 'warns')
-        user_warns = warns.get(str(member.id), [])
+        user_warns = await self.data.get_warns(interaction.guild.id, member.id)
         
         embed = discord.Embed(color=Colors.MAIN)
         embed.set_author(name=f"Warnings for {member}", icon_url=member.display_avatar.url)
@@ -432,8 +544,7 @@ class ModerationCog(commands.Cog):
         if member is None:
             return await self.send_error(ctx, f"{Emojis.CROSS} Please mention a member.\n**Usage:** `!warnings @member`")
         
-        warns = self.data.load(ctx.guild.id, 'warns')
-        user_warns = warns.get(str(member.id), [])
+        user_warns = await self.data.get_warns(ctx.guild.id, member.id)
         
         embed = discord.Embed(color=Colors.MAIN)
         embed.set_author(name=f"Warnings for {member}", icon_url=member.display_avatar.url)
@@ -454,49 +565,267 @@ class ModerationCog(commands.Cog):
     # ═══════════════════════════════════════════════════════════
     # BLACKLIST COMMAND
     # ═══════════════════════════════════════════════════════════
-    @app_commands.command(name="blacklist", description="View all users with warnings")
-    @app_commands.default_permissions(moderate_members=True)
-    async def blacklist_slash(self, interaction: discord.Interaction):
-        warns = self.data.load(interaction.guild.id, 'warns')
-        
+    async def build_blacklist_embed(self, guild, warns, page):
+        """Render one page of the blacklist; users already resolved are served from cache"""
         embed = discord.Embed(color=Colors.MAIN, title=f"{Emojis.CROSS} Server Blacklist")
-        
         if not warns:
             embed.description = "No users with warnings."
+            return embed
+        pages = (len(warns) - 1) // BLACKLIST_PAGE_SIZE + 1
+        chunk = warns[page * BLACKLIST_PAGE_SIZE:(page + 1) * BLACKLIST_PAGE_SIZE]
+        users = await self.bot.user_resolver.resolve_many([user_id for user_id, _ in chunk], guild)
+        lines = []
+        for user_id, count in chunk:
+            user = users.get(user_id)
+            if user:
+                lines.append(f"**{user}** - {count} warning(s)")
+            else:
+                lines.append(f"Unknown User ({user_id}) - {count} warning(s)")
+        embed.description = "\n".join(lines)
+        embed.set_footer(text=f"Total: {len(warns)} user(s) with warnings • Page {page + 1}/{pages}")
+        return embed
+
+    @app_commands.command(name="blacklist", description="View all users with warnings")
+    @app_commands.default_permissions(moderate_members=True)
+    async def blacklist_slash(self, interaction: discord.Interaction):
+        await interaction.response.defer()
+        warns = await self.data.get_warn_counts(interaction.guild.id)
+        embed = await self.build_blacklist_embed(interaction.guild, warns, 0)
+        if len(warns) > BLACKLIST_PAGE_SIZE:
+            view = BlacklistView(self, interaction.user, warns)
+            view.message = await interaction.followup.send(embed=embed, view=view, wait=True)
         else:
-            lines = []
-            for user_id, user_warns in list(warns.items())[:15]:
-                try:
-                    user = await self.bot.fetch_user(int(user_id))
-                    lines.append(f"**{user}** - {len(user_warns)} warning(s)")
-                except:
-                    lines.append(f"Unknown User ({user_id}) - {len(user_warns)} warning(s)")
-            embed.description = "\n".join(lines)
-            embed.set_footer(text=f"Total: {len(warns)} user(s) with warnings")
-        
-        await interaction.response.send_message(embed=embed)
+            await interaction.followup.send(embed=embed)
 
     @commands.command(name="blacklist", aliases=["bl"])
     @commands.has_permissions(moderate_members=True)
     async def blacklist_prefix(self, ctx):
-        warns = self.data.load(ctx.guild.id, 'warns')
-        
-        embed = discord.Embed(color=Colors.MAIN, title=f"{Emojis.CROSS} Server Blacklist")
-        
-        if not warns:
-            embed.description = "No users with warnings."
+        async with ctx.typing():
+            warns = await self.data.get_warn_counts(ctx.guild.id)
+            embed = await self.build_blacklist_embed(ctx.guild, warns, 0)
+        if len(warns) > BLACKLIST_PAGE_SIZE:
+            view = BlacklistView(self, ctx.author, warns)
+            view.message = await ctx.send(embed=embed, view=view)
         else:
-            lines = []
-            for user_id, user_warns in list(warns.items())[:15]:
+            await ctx.send(embed=embed)
+
+    # ═══════════════════════════════════════════════════════════
+    # MASS ACTIONS
+    # ═══════════════════════════════════════════════════════════
+    def collect_mass_targets(self, guild, ids, joined_within=None, account_age=None, name_pattern=None, members_only=True):
+        """Return (targets, error); explicit ids are combined with members matching every given filter"""
+        targets = {}
+        for raw in re.findall(r'\d{15,20}', ids or ''):
+            user_id = int(raw)
+            member = guild.get_member(user_id)
+            if member:
+                targets[user_id] = member
+            elif not members_only:
+                targets[user_id] = discord.Object(id=user_id)
+        
+        if joined_within or account_age or name_pattern:
+            now = discord.utils.utcnow()
+            joined_cutoff = account_cutoff = pattern = None
+            if joined_within:
+                seconds = self.parse_duration(joined_within)
+                if not seconds:
+                    return None, f"{Emojis.CROSS} Invalid join window.\n**Examples:** `10m`, `1h`, `1d`"
+                joined_cutoff = now - timedelta(seconds=seconds)
+            if account_age:
+                seconds = self.parse_duration(account_age)
+                if not seconds:
+                    return None, f"{Emojis.CROSS} Invalid account age.\n**Examples:** `1h`, `1d`, `7d`"
+                account_cutoff = now - timedelta(seconds=seconds)
+            if name_pattern:
                 try:
-                    user = await self.bot.fetch_user(int(user_id))
-                    lines.append(f"**{user}** - {len(user_warns)} warning(s)")
-                except:
-                    lines.append(f"Unknown User ({user_id}) - {len(user_warns)} warning(s)")
-            embed.description = "\n".join(lines)
-            embed.set_footer(text=f"Total: {len(warns)} user(s) with warnings")
+                    pattern = re.compile(name_pattern, re.IGNORECASE)
+                except re.error as e:
+                    return None, f"{Emojis.CROSS} Invalid name pattern: {e}"
+            for member in guild.members:
+                if member.bot:
+                    continue
+                if joined_cutoff and (member.joined_at is None or member.joined_at < joined_cutoff):
+                    continue
+                if account_cutoff and member.created_at < account_cutoff:
+                    continue
+                if pattern and not (pattern.search(member.name) or pattern.search(member.display_name)):
+                    continue
+                targets[member.id] = member
+        
+        if not targets:
+            return None, f"{Emojis.CROSS} No matching users found."
+        if len(targets) > MASS_MAX:
+            return None, f"{Emojis.CROSS} That matches **{len(targets)}** users; the limit is {MASS_MAX} per command."
+        return list(targets.values()), None
+
+    async def validate_mass_targets(self, ctx_or_interaction, targets, action):
+        """Run the single-target checks over every target; returns (valid, [(target, reason)])"""
+        user = ctx_or_interaction.user if isinstance(ctx_or_interaction, discord.Interaction) else ctx_or_interaction.author
+        guild = ctx_or_interaction.guild
+        valid, rejected = [], []
+        for target in targets:
+            if isinstance(target, discord.Member):
+                error = await self.check_mod_action(ctx_or_interaction, target, action)
+            elif target.id in (user.id, self.bot.user.id, guild.owner_id):
+                error = f"{Emojis.CROSS} You cannot {action} that user."
+            else:
+                error = None
+            if error:
+                rejected.append((target, error.replace(f"{Emojis.CROSS} ", "")))
+            else:
+                valid.append(target)
+        return valid, rejected
+
+    def format_target(self, target):
+        return f"**{target}**" if isinstance(target, (discord.Member, discord.User)) else f"`{target.id}`"
+
+    def mass_progress_embed(self, runner, action):
+        bars = int(runner.done / runner.total * 10) if runner.total else 10
+        embed = discord.Embed(color=Colors.WARNING, description=f"⏳ Running mass **{action}**...\n`{'▰' * bars}{'▱' * (10 - bars)}` {runner.done}/{runner.total}")
+        embed.add_field(name="Succeeded", value=f"```{len(runner.succeeded)}```", inline=True)
+        embed.add_field(name="Failed", value=f"```{len(runner.failed)}```", inline=True)
+        return embed
+
+    def mass_report_embed(self, runner, action, rejected):
+        color = Colors.MAIN if not runner.failed else Colors.WARNING
+        status = "cancelled" if runner.cancelled else "complete"
+        embed = discord.Embed(color=color, description=f"{Emojis.CHECK} Mass **{action}** {status}: **{len(runner.succeeded)}**/{runner.total} succeeded.")
+        if runner.failed:
+            lines = [f"{self.format_target(t)} - {reason}" for t, reason in runner.failed[:10]]
+            if len(runner.failed) > 10: lines.append(f"... and {len(runner.failed) - 10} more")
+            embed.add_field(name=f"Failed ({len(runner.failed)})", value="\n".join(lines)[:1024], inline=False)
+        if rejected:
+            lines = [f"{self.format_target(t)} - {reason}" for t, reason in rejected[:10]]
+            if len(rejected) > 10: lines.append(f"... and {len(rejected) - 10} more")
+            embed.add_field(name=f"Skipped ({len(rejected)})", value="\n".join(lines)[:1024], inline=False)
+        embed.timestamp = datetime.now(timezone.utc)
+        return embed
+
+    async def run_mass_action(self, ctx_or_interaction, action, targets, reason, seconds=None, duration=None):
+        is_interaction = isinstance(ctx_or_interaction, discord.Interaction)
+        user = ctx_or_interaction.user if is_interaction else ctx_or_interaction.author
+        guild = ctx_or_interaction.guild
         
-        await ctx.send(embed=embed)
+        valid, rejected = await self.validate_mass_targets(ctx_or_interaction, targets, action)
+        if not valid:
+            return await self.send_error(ctx_or_interaction, f"{Emojis.CROSS} None of the **{len(targets)}** matched users can be actioned.")
+        
+        confirm = ConfirmView(user)
+        for_duration = f" for **{duration}**" if duration else ""
+        embed = discord.Embed(color=Colors.WARNING, description=f"⚠️ About to **{action}** **{len(valid)}** user(s){for_duration}.\n**Reason:** {reason}")
+        if rejected:
+            embed.set_footer(text=f"{len(rejected)} user(s) will be skipped")
+        if is_interaction:
+            msg = await ctx_or_interaction.followup.send(embed=embed, view=confirm, wait=True)
+        else:
+            msg = await ctx_or_interaction.send(embed=embed, view=confirm)
+        
+        if await confirm.wait() or not confirm.confirmed:
+            return await msg.edit(embed=discord.Embed(color=Colors.ERROR, description=f"{Emojis.CROSS} Mass {action} cancelled."), view=None)
+        
+        audit_reason = f"{reason} | By: {user} (mass {action})"
+        notifier = self.bot.notifier
+        dedupe_key = f"mass-{action}:{guild.id}"
+        if action == "ban":
+            notice = f"You have been banned from **{guild.name}**\n**Reason:** {reason}"
+            async def execute(target):
+                if isinstance(target, discord.Member):
+                    await notifier.send_now(target, notice, dedupe_key=dedupe_key)
+                await guild.ban(target, reason=audit_reason)
+                self.log_action(ctx_or_interaction, action, target, reason)
+        elif action == "kick":
+            notice = f"You have been kicked from **{guild.name}**\n**Reason:** {reason}"
+            async def execute(target):
+                await notifier.send_now(target, notice, dedupe_key=dedupe_key)
+                await target.kick(reason=audit_reason)
+                self.log_action(ctx_or_interaction, action, target, reason)
+        else:
+            notice = f"You have been timed out in **{guild.name}** for **{duration}**\n**Reason:** {reason}"
+            async def execute(target):
+                await target.timeout(timedelta(seconds=seconds), reason=audit_reason)
+                self.log_action(ctx_or_interaction, action, target, reason, duration=duration)
+                notifier.enqueue(target, notice, dedupe_key=dedupe_key)
+        
+        runner = BatchRunner(execute, concurrency=MASS_CONCURRENCY)
+        view = CancelView(runner, user)
+        runner.progress = lambda r: msg.edit(embed=self.mass_progress_embed(r, action), view=view)
+        await msg.edit(embed=self.mass_progress_embed(runner, action), view=view)
+        await runner.run(valid)
+        view.stop()
+        await msg.edit(embed=self.mass_report_embed(runner, action, rejected), view=None)
+
+    @app_commands.command(name="massban", description="Ban many users at once")
+    @app_commands.describe(users="User IDs or mentions separated by spaces", reason="Reason for the bans",
+                           joined_within="Members who joined within... (e.g. 10m)", account_age="Members whose account is younger than... (e.g. 1d)",
+                           name_pattern="Members whose name matches this pattern (regex)")
+    @app_commands.default_permissions(ban_members=True)
+    async def massban_slash(self, interaction: discord.Interaction, users: str = None, reason: str = "No reason provided",
+                            joined_within: str = None, account_age: str = None, name_pattern: str = None):
+        await interaction.response.defer()
+        targets, error = self.collect_mass_targets(interaction.guild, users, joined_within, account_age, name_pattern, members_only=False)
+        if error:
+            return await self.send_error(interaction, error)
+        await self.run_mass_action(interaction, "ban", targets, reason)
+
+    @commands.command(name="massban")
+    @commands.has_permissions(ban_members=True)
+    async def massban_prefix(self, ctx, users: commands.Greedy[discord.Object] = None, *, reason: str = "No reason provided"):
+        if not users:
+            return await self.send_error(ctx, f"{Emojis.CROSS} Please provide users to ban.\n**Usage:** `!massban <ids...> [reason]`")
+        targets, error = self.collect_mass_targets(ctx.guild, " ".join(str(u.id) for u in users), members_only=False)
+        if error:
+            return await self.send_error(ctx, error)
+        await self.run_mass_action(ctx, "ban", targets, reason)
+
+    @app_commands.command(name="masskick", description="Kick many members at once")
+    @app_commands.describe(users="User IDs or mentions separated by spaces", reason="Reason for the kicks",
+                           joined_within="Members who joined within... (e.g. 10m)", account_age="Members whose account is younger than... (e.g. 1d)",
+                           name_pattern="Members whose name matches this pattern (regex)")
+    @app_commands.default_permissions(kick_members=True)
+    async def masskick_slash(self, interaction: discord.Interaction, users: str = None, reason: str = "No reason provided",
+                             joined_within: str = None, account_age: str = None, name_pattern: str = None):
+        await interaction.response.defer()
+        targets, error = self.collect_mass_targets(interaction.guild, users, joined_within, account_age, name_pattern)
+        if error:
+            return await self.send_error(interaction, error)
+        await self.run_mass_action(interaction, "kick", targets, reason)
+
+    @commands.command(name="masskick")
+    @commands.has_permissions(kick_members=True)
+    async def masskick_prefix(self, ctx, users: commands.Greedy[discord.Member] = None, *, reason: str = "No reason provided"):
+        if not users:
+            return await self.send_error(ctx, f"{Emojis.CROSS} Please provide members to kick.\n**Usage:** `!masskick <members...> [reason]`")
+        await self.run_mass_action(ctx, "kick", list({m.id: m for m in users}.values()), reason)
+
+    @app_commands.command(name="masstimeout", description="Timeout many members at once")
+    @app_commands.describe(duration="Duration (e.g., 30s, 5m, 1h, 1d)", users="User IDs or mentions separated by spaces", reason="Reason",
+                           joined_within="Members who joined within... (e.g. 10m)", account_age="Members whose account is younger than... (e.g. 1d)",
+                           name_pattern="Members whose name matches this pattern (regex)")
+    @app_commands.default_permissions(moderate_members=True)
+    async def masstimeout_slash(self, interaction: discord.Interaction, duration: str, users: str = None, reason: str = "No reason provided",
+                                joined_within: str = None, account_age: str = None, name_pattern: str = None):
+        seconds = self.parse_duration(duration)
+        if not seconds:
+            return await self.send_error(interaction, f"{Emojis.CROSS} Invalid duration format.\n**Examples:** `30s`, `5m`, `1h`, `1d`")
+        if seconds > 2419200:
+            return await self.send_error(interaction, f"{Emojis.CROSS} Timeout cannot exceed 28 days.")
+        await interaction.response.defer()
+        targets, error = self.collect_mass_targets(interaction.guild, users, joined_within, account_age, name_pattern)
+        if error:
+            return await self.send_error(interaction, error)
+        await self.run_mass_action(interaction, "timeout", targets, reason, seconds=seconds, duration=duration)
+
+    @commands.command(name="masstimeout", aliases=["massmute"])
+    @commands.has_permissions(moderate_members=True)
+    async def masstimeout_prefix(self, ctx, duration: str = None, users: commands.Greedy[discord.Member] = None, *, reason: str = "No reason provided"):
+        if duration is None or not users:
+            return await self.send_error(ctx, f"{Emojis.CROSS} Please provide a duration and members.\n**Usage:** `!masstimeout <duration> <members...> [reason]`")
+        seconds = self.parse_duration(duration)
+        if not seconds:
+            return await self.send_error(ctx, f"{Emojis.CROSS} Invalid duration format.\n**Examples:** `30s`, `5m`, `1h`, `1d`")
+        if seconds > 2419200:
+            return await self.send_error(ctx, f"{Emojis.CROSS} Timeout cannot exceed 28 days.")
+        await self.run_mass_action(ctx, "timeout", list({m.id: m for m in users}.values()), reason, seconds=seconds, duration=duration)
 
     # ═══════════════════════════════════════════════════════════
     # MOD LOGS COMMAND
@@ -505,9 +834,8 @@ class ModerationCog(commands.Cog):
     @app_commands.describe(channel="Channel for mod logs")
     @app_commands.default_permissions(administrator=True)
     async def modlogs_slash(self, interaction: discord.Interaction, channel: discord.TextChannel):
-        settings = self.data.load(interaction.guild.id, 'settings')
-        settings['log_channel'] = channel.id
-        self.data.save(interaction.guild.id, 'settings', settings)
+        await self.data.set_setting(interaction.guild.id, 'log_channel', channel.id)
+        self.bot.modlog.set_channel(interaction.guild.id, channel.id)
         await self.send_success(interaction, f"{Emojis.CHECK} Mod logs channel set to {channel.mention}")
 
     @commands.command(name="modlogs", aliases=["setlogs"])
@@ -516,95 +844,367 @@ class ModerationCog(commands.Cog):
         if channel is None:
             return await self.send_error(ctx, f"{Emojis.CROSS} Please mention a channel.\n**Usage:** `!modlogs #channel`")
         
-        settings = self.data.load(ctx.guild.id, 'settings')
-        settings['log_channel'] = channel.id
-        self.data.save(ctx.guild.id, 'settings', settings)
+        await self.data.set_setting(ctx.guild.id, 'log_channel', channel.id)
+        self.bot.modlog.set_channel(ctx.guild.id, channel.id)
         await self.send_success(ctx, f"{Emojis.CHECK} Mod logs channel set to {channel.mention}")
 
+    # ═══════════════════════════════════════════════════════════
+    # WARN EXPIRY COMMAND
+    # ═══════════════════════════════════════════════════════════
+    async def set_warn_expiry(self, ctx_or_interaction, duration):
+        guild = ctx_or_interaction.guild
+        if duration.lower() in ('off', '0', 'never'):
+            await self.data.set_setting(guild.id, 'warn_expiry', None)
+            return await self.send_success(ctx_or_interaction, f"{Emojis.CHECK} Warnings no longer expire.")
+        
+        seconds = self.parse_duration(duration)
+        if not seconds:
+            return await self.send_error(ctx_or_interaction, f"{Emojis.CROSS} Invalid duration format.\n**Examples:** `12h`, `30d`, or `off`")
+        
+        await self.data.set_setting(guild.id, 'warn_expiry', seconds)
+        await self.send_success(ctx_or_interaction, f"{Emojis.CHECK} New warnings will expire after **{duration}**.")
+
+    @app_commands.command(name="warn-expiry", description="Make new warnings expire automatically")
+    @app_commands.describe(duration="Expire warnings after... (e.g. 30d), or off")
+    @app_commands.default_permissions(administrator=True)
+    async def warnexpiry_slash(self, interaction: discord.Interaction, duration: str):
+        await self.set_warn_expiry(interaction, duration)
+
+    @commands.command(name="warnexpiry")
+    @commands.has_permissions(administrator=True)
+    async def warnexpiry_prefix(self, ctx, duration: str = None):
+        if duration is None:
+            return await self.send_error(ctx, f"{Emojis.CROSS} Please provide a duration.\n**Usage:** `!warnexpiry <duration|off>`")
+        
+        await self.set_warn_expiry(ctx, duration)
+
     # ═══════════════════════════════════════════════════════════
     # CLEAR COMMAND
     # ═══════════════════════════════════════════════════════════
+    def build_purge_filter(self, user, bots, contains, attachments, within, skip_ids=()):
+        """Return (filter, after, error) from the clear command's options"""
+        pattern = None
+        if contains:
+            if len(contains) > 200:
+                return None, None, f"{Emojis.CROSS} Pattern must be 200 characters or less."
+            try:
+                pattern = re.compile(contains, re.IGNORECASE)
+            except re.error as e:
+                return None, None, f"{Emojis.CROSS} Invalid pattern: {e}"
+        after = None
+        if within:
+            seconds = self.parse_duration(within)
+            if not seconds:
+                return None, None, f"{Emojis.CROSS} Invalid duration format.\n**Examples:** `30s`, `5m`, `1h`, `1d`"
+            after = discord.utils.utcnow() - timedelta(seconds=seconds)
+        check = PurgeFilter(author_id=user.id if user else None, bots_only=bots, pattern=pattern, attachments_only=attachments, skip_ids=skip_ids)
+        return check, after, None
+
+    def purge_embed(self, job, done=False):
+        summary = job.summary()
+        if not done:
+            embed = discord.Embed(color=Colors.WARNING, description=f"🧹 Purging... **{summary['deleted']}**/{job.limit} deleted")
+        elif summary['cancelled']:
+            embed = discord.Embed(color=Colors.WARNING, description=f"{Emojis.CROSS} Purge cancelled after deleting **{summary['deleted']}** messages.")
+        else:
+            embed = discord.Embed(color=Colors.MAIN, description=f"{Emojis.CHECK} Successfully deleted **{summary['deleted']}** messages.")
+        embed.add_field(name="Scanned", value=f"```{summary['scanned']}```", inline=True)
+        embed.add_field(name="Bulk / Single", value=f"```{summary['bulk_deleted']} / {summary['single_deleted']}```", inline=True)
+        embed.add_field(name="Failed", value=f"```{summary['failed']}```", inline=True)
+        embed.set_footer(text=f"{summary['seconds']}s")
+        return embed
+
+    async def run_purge(self, channel, job, view):
+        self.purges[channel.id] = job
+        try:
+            return await job.run()
+        finally:
+            del self.purges[channel.id]
+            view.stop()
+
     @app_commands.command(name="clear", description="Clear messages")
-    @app_commands.describe(amount="Number of messages to delete (1-100)")
+    @app_commands.describe(amount=f"Number of messages to delete (1-{PURGE_MAX})", user="Only messages from this user", bots="Only messages from bots",
+                           contains="Only messages matching this pattern (regex)", attachments="Only messages with attachments",
+                           within="Only messages from the last... (e.g. 30m, 2h, 7d)")
     @app_commands.default_permissions(manage_messages=True)
-    async def clear_slash(self, interaction: discord.Interaction, amount: int):
-        if amount < 1 or amount > 100:
-            return await self.send_error(interaction, f"{Emojis.CROSS} Amount must be between 1 and 100.")
+    async def clear_slash(self, interaction: discord.Interaction, amount: int, user: discord.User = None, bots: bool = False,
+                          contains: str = None, attachments: bool = False, within: str = None):
+        if amount < 1 or amount > PURGE_MAX:
+            return await self.send_error(interaction, f"{Emojis.CROSS} Amount must be between 1 and {PURGE_MAX}.")
+        
+        if interaction.channel.id in self.purges:
+            return await self.send_error(interaction, f"{Emojis.CROSS} A purge is already running in this channel.")
+        
+        check, after, error = self.build_purge_filter(user, bots, contains, attachments, within)
+        if error:
+            return await self.send_error(interaction, error)
         
         await interaction.response.defer(ephemeral=True)
-        deleted = await interaction.channel.purge(limit=amount)
-        await interaction.followup.send(f"{Emojis.CHECK} Successfully deleted **{len(deleted)}** messages.", ephemeral=True)
+        job = PurgeJob(interaction.channel, amount, check, after=after, reason=f"Purge | By: {interaction.user}")
+        view = CancelView(job, interaction.user)
+        job.progress = lambda j: interaction.edit_original_response(embed=self.purge_embed(j), view=view)
+        await interaction.followup.send(embed=self.purge_embed(job), view=view, ephemeral=True)
+        await self.run_purge(interaction.channel, job, view)
+        self.log_action(interaction, "purge", channel=interaction.channel.mention, deleted=job.summary()['deleted'])
+        try: await interaction.edit_original_response(embed=self.purge_embed(job, done=True), view=None)
+        except discord.HTTPException: pass
 
     @commands.command(name="clear", aliases=["purge"])
     @commands.has_permissions(manage_messages=True)
-    async def clear_prefix(self, ctx, amount: int = None):
+    async def clear_prefix(self, ctx, amount: int = None, member: discord.Member = None):
         if amount is None:
-            return await self.send_error(ctx, f"{Emojis.CROSS} Please provide an amount.\n**Usage:** `!clear <1-100>`")
-        
-        if amount < 1 or amount > 100:
-            return await self.send_error(ctx, f"{Emojis.CROSS} Amount must be between 1 and 100.")
-        
-        deleted = await ctx.channel.purge(limit=amount + 1)
-        msg = await ctx.send(f"{Emojis.CHECK} Successfully deleted **{len(deleted) - 1}** messages.")
-        await msg.delete(delay=3)
+            return await self.send_error(ctx, f"{Emojis.CROSS} Please provide an amount.\n**Usage:** `!clear <1-{PURGE_MAX}> [@member]`")
+        
+        if amount < 1 or amount > PURGE_MAX:
+            return await self.send_error(ctx, f"{Emojis.CROSS} Amount must be between 1 and {PURGE_MAX}.")
+        
+        if ctx.channel.id in self.purges:
+            return await self.send_error(ctx, f"{Emojis.CROSS} A purge is already running in this channel.")
+        
+        try: await ctx.message.delete()
+        except discord.HTTPException: pass
+        
+        check, _, _ = self.build_purge_filter(member, False, None, False, None, skip_ids=[ctx.message.id])
+        job = PurgeJob(ctx.channel, amount, check, reason=f"Purge | By: {ctx.author}")
+        view = CancelView(job, ctx.author)
+        msg = await ctx.send(embed=self.purge_embed(job), view=view)
+        check.skip_ids.add(msg.id)
+        job.progress = lambda j: msg.edit(embed=self.purge_embed(j), view=view)
+        await self.run_purge(ctx.channel, job, view)
+        self.log_action(ctx, "purge", channel=ctx.channel.mention, deleted=job.summary()['deleted'])
+        try: await msg.edit(embed=self.purge_embed(job, done=True), view=None)
+        except discord.HTTPException: pass
+        await msg.delete(delay=5)
 
     # ═══════════════════════════════════════════════════════════
     # SLOWMODE COMMAND
     # ═══════════════════════════════════════════════════════════
-    @app_commands.command(name="slowmode", description="Set channel slowmode")
-    @app_commands.describe(seconds="Slowmode in seconds (0 to disable)")
-    @app_commands.default_permissions(manage_channels=True)
-    async def slowmode_slash(self, interaction: discord.Interaction, seconds: int):
+    async def parse_timer(self, ctx_or_interaction, duration):
+        """Return the timer length in seconds, 0 for no timer, or None after reporting an error"""
+        if duration is None:
+            return 0
+        seconds = self.parse_duration(duration)
+        if not seconds:
+            await self.send_error(ctx_or_interaction, f"{Emojis.CROSS} Invalid duration format.\n**Examples:** `30s`, `5m`, `1h`, `1d`")
+            return None
+        return seconds
+
+    async def set_slowmode(self, ctx_or_interaction, seconds, duration):
         if seconds < 0 or seconds > 21600:
-            return await self.send_error(interaction, f"{Emojis.CROSS} Slowmode must be between 0 and 21600 seconds (6 hours).")
+            return await self.send_error(ctx_or_interaction, f"{Emojis.CROSS} Slowmode must be between 0 and 21600 seconds (6 hours).")
+        
+        timer = await self.parse_timer(ctx_or_interaction, duration)
+        if timer is None:
+            return
+        
+        channel = ctx_or_interaction.channel
+        key = f"slowmode:{channel.id}"
+        # Stacked timers keep restoring the delay from before the first one
+        pending = self.scheduler.get(key)
+        previous = pending['data']['previous'] if pending else channel.slowmode_delay
+        await channel.edit(slowmode_delay=seconds)
+        if timer:
+            self.scheduler.schedule(key, 'slowmode', channel.guild.id, timer, channel=channel.id, previous=previous)
+        else:
+            self.scheduler.cancel(key)
         
-        await interaction.channel.edit(slowmode_delay=seconds)
+        self.log_action(ctx_or_interaction, "slowmode", channel=channel.mention, delay=f"{seconds}s" if seconds else "Off", **({'duration': duration} if timer else {}))
+        for_duration = f" for **{duration}**" if timer else ""
         if seconds == 0:
-            await self.send_success(interaction, f"{Emojis.CHECK} Slowmode has been disabled.")
+            await self.send_success(ctx_or_interaction, f"{Emojis.CHECK} Slowmode has been disabled{for_duration}.")
         else:
-            await self.send_success(interaction, f"{Emojis.CHECK} Slowmode set to **{seconds}** seconds.")
+            await self.send_success(ctx_or_interaction, f"{Emojis.CHECK} Slowmode set to **{seconds}** seconds{for_duration}.")
+
+    @app_commands.command(name="slowmode", description="Set channel slowmode")
+    @app_commands.describe(seconds="Slowmode in seconds (0 to disable)", duration="Reset after... (e.g. 10m, 1h)")
+    @app_commands.default_permissions(manage_channels=True)
+    async def slowmode_slash(self, interaction: discord.Interaction, seconds: int, duration: str = None):
+        await self.set_slowmode(interaction, seconds, duration)
 
     @commands.command(name="slowmode", aliases=["sm"])
     @commands.has_permissions(manage_channels=True)
-    async def slowmode_prefix(self, ctx, seconds: int = None):
+    async def slowmode_prefix(self, ctx, seconds: int = None, duration: str = None):
         if seconds is None:
-            return await self.send_error(ctx, f"{Emojis.CROSS} Please provide seconds.\n**Usage:** `!slowmode <0-21600>`\nUse 0 to disable.")
-        
-        if seconds < 0 or seconds > 21600:
-            return await self.send_error(ctx, f"{Emojis.CROSS} Slowmode must be between 0 and 21600 seconds (6 hours).")
+            return await self.send_error(ctx, f"{Emojis.CROSS} Please provide seconds.\n**Usage:** `!slowmode <0-21600> [duration]`\nUse 0 to disable.")
         
-        await ctx.channel.edit(slowmode_delay=seconds)
-        if seconds == 0:
-            await self.send_success(ctx, f"{Emojis.CHECK} Slowmode has been disabled.")
-        else:
-            await self.send_success(ctx, f"{Emojis.CHECK} Slowmode set to **{seconds}** seconds.")
+        await self.set_slowmode(ctx, seconds, duration)
 
     # ═══════════════════════════════════════════════════════════
     # LOCK / UNLOCK CHANNEL
     # ═══════════════════════════════════════════════════════════
+    async def lock_channel(self, ctx_or_interaction, duration):
+        timer = await self.parse_timer(ctx_or_interaction, duration)
+        if timer is None:
+            return
+        
+        channel = ctx_or_interaction.channel
+        await channel.set_permissions(ctx_or_interaction.guild.default_role, send_messages=False)
+        if timer:
+            self.scheduler.schedule(f"unlock:{channel.id}", 'unlock', channel.guild.id, timer, channel=channel.id)
+            self.log_action(ctx_or_interaction, "lock", channel=channel.mention, duration=duration)
+            await self.send_success(ctx_or_interaction, f"{Emojis.CHECK} This channel has been locked for **{duration}**. Only staff can send messages.")
+        else:
+            self.scheduler.cancel(f"unlock:{channel.id}")
+            self.log_action(ctx_or_interaction, "lock", channel=channel.mention)
+            await self.send_success(ctx_or_interaction, f"{Emojis.CHECK} This channel has been locked. Only staff can send messages.")
+
+    async def unlock_channel(self, ctx_or_interaction):
+        channel = ctx_or_interaction.channel
+        await channel.set_permissions(ctx_or_interaction.guild.default_role, send_messages=True)
+        self.scheduler.cancel(f"unlock:{channel.id}")
+        self.log_action(ctx_or_interaction, "unlock", channel=channel.mention)
+        await self.send_success(ctx_or_interaction, f"{Emojis.CHECK} This channel has been unlocked. Everyone can send messages.")
+
     @app_commands.command(name="lock", description="Lock a channel")
+    @app_commands.describe(duration="Unlock automatically after... (e.g. 10m, 1h)")
     @app_commands.default_permissions(manage_channels=True)
-    async def lock_slash(self, interaction: discord.Interaction):
-        await interaction.channel.set_permissions(interaction.guild.default_role, send_messages=False)
-        await self.send_success(interaction, f"{Emojis.CHECK} This channel has been locked. Only staff can send messages.")
+    async def lock_slash(self, interaction: discord.Interaction, duration: str = None):
+        await self.lock_channel(interaction, duration)
 
     @commands.command(name="lock")
     @commands.has_permissions(manage_channels=True)
-    async def lock_prefix(self, ctx):
-        await ctx.channel.set_permissions(ctx.guild.default_role, send_messages=False)
-        await self.send_success(ctx, f"{Emojis.CHECK} This channel has been locked. Only staff can send messages.")
+    async def lock_prefix(self, ctx, duration: str = None):
+        await self.lock_channel(ctx, duration)
 
     @app_commands.command(name="unlock", description="Unlock a channel")
     @app_commands.default_permissions(manage_channels=True)
     async def unlock_slash(self, interaction: discord.Interaction):
-        await interaction.channel.set_permissions(interaction.guild.default_role, send_messages=True)
-        await self.send_success(interaction, f"{Emojis.CHECK} This channel has been unlocked. Everyone can send messages.")
+        await self.unlock_channel(interaction)
 
     @commands.command(name="unlock")
     @commands.has_permissions(manage_channels=True)
     async def unlock_prefix(self, ctx):
-        await ctx.channel.set_permissions(ctx.guild.default_role, send_messages=True)
-        await self.send_success(ctx, f"{Emojis.CHECK} This channel has been unlocked. Everyone can send messages.")
+        await self.unlock_channel(ctx)
+
+    # ═══════════════════════════════════════════════════════════
+    # LOCKDOWN / UNLOCKDOWN
+    # ═══════════════════════════════════════════════════════════
+    async def lockdown_targets(self, guild, scope, category):
+        """Return (channels, error) for the lockdown scope"""
+        if scope == "category":
+            if category is None:
+                return None, f"{Emojis.CROSS} Please pick a category."
+            return [c for c in category.channels if isinstance(c, discord.TextChannel)], None
+        if scope == "saved":
+            saved = (await self.data.get_settings(guild.id)).get('lockdown_channels', [])
+            if not saved:
+                return None, f"{Emojis.CROSS} No saved lockdown channels. Add some with `/lockdown-set`."
+            return [c for c in map(guild.get_channel, saved) if isinstance(c, discord.TextChannel)], None
+        return list(guild.text_channels), None
+
+    def lockdown_progress_embed(self, runner, action):
+        bars = int(runner.done / runner.total * 10) if runner.total else 10
+        embed = discord.Embed(color=Colors.WARNING, description=f"⏳ Running **{action}**...\n`{'▰' * bars}{'▱' * (10 - bars)}` {runner.done}/{runner.total} channels")
+        embed.add_field(name="Succeeded", value=f"```{len(runner.succeeded)}```", inline=True)
+        embed.add_field(name="Failed", value=f"```{len(runner.failed)}```", inline=True)
+        return embed
+
+    def lockdown_report_embed(self, runner, action, seconds):
+        color = Colors.MAIN if not runner.failed else Colors.WARNING
+        embed = discord.Embed(color=color, description=f"{Emojis.CHECK} **{action.title()}** complete: **{len(runner.succeeded)}**/{runner.total} channels in {seconds:.1f}s.")
+        if runner.failed:
+            # Unlock items are (channel_id, snapshot) pairs, lock items are channels
+            lines = [f"<#{item[0] if isinstance(item, tuple) else item.id}> - {reason}" for item, reason in runner.failed[:10]]
+            if len(runner.failed) > 10: lines.append(f"... and {len(runner.failed) - 10} more")
+            embed.add_field(name=f"Failed ({len(runner.failed)})", value="\n".join(lines)[:1024], inline=False)
+        embed.timestamp = datetime.now(timezone.utc)
+        return embed
+
+    async def send_progress(self, ctx_or_interaction, embed):
+        if isinstance(ctx_or_interaction, discord.Interaction):
+            return await ctx_or_interaction.followup.send(embed=embed, wait=True)
+        return await ctx_or_interaction.send(embed=embed)
+
+    async def run_lockdown(self, ctx_or_interaction, scope, category, duration, reason):
+        user = ctx_or_interaction.user if isinstance(ctx_or_interaction, discord.Interaction) else ctx_or_interaction.author
+        guild = ctx_or_interaction.guild
+        channels, error = await self.lockdown_targets(guild, scope, category)
+        if error:
+            return await self.send_error(ctx_or_interaction, error)
+        if not channels:
+            return await self.send_error(ctx_or_interaction, f"{Emojis.CROSS} There are no text channels to lock.")
+        timer = await self.parse_timer(ctx_or_interaction, duration)
+        if timer is None:
+            return
+        
+        started = time.perf_counter()
+        async def progress(runner):
+            await msg.edit(embed=self.lockdown_progress_embed(runner, "lockdown"))
+        msg = await self.send_progress(ctx_or_interaction, discord.Embed(color=Colors.WARNING, description=f"⏳ Locking **{len(channels)}** channels..."))
+        runner = await self.bot.lockdown.lock(guild, channels, f"Lockdown: {reason} | By: {user}", progress=progress)
+        key = f"unlockdown:{guild.id}"
+        if timer:
+            self.scheduler.schedule(key, 'unlockdown', guild.id, timer)
+        else:
+            self.scheduler.cancel(key)
+        
+        details = {'channels': f"{len(runner.succeeded)}/{runner.total}"}
+        if timer:
+            details['duration'] = duration
+        self.log_action(ctx_or_interaction, "lockdown", None, reason, **details)
+        await msg.edit(embed=self.lockdown_report_embed(runner, "lockdown", time.perf_counter() - started))
+
+    async def run_unlockdown(self, ctx_or_interaction):
+        user = ctx_or_interaction.user if isinstance(ctx_or_interaction, discord.Interaction) else ctx_or_interaction.author
+        guild = ctx_or_interaction.guild
+        locked = self.bot.lockdown.locked(guild.id)
+        if not locked:
+            return await self.send_error(ctx_or_interaction, f"{Emojis.CROSS} This server is not in lockdown.")
+        
+        started = time.perf_counter()
+        async def progress(runner):
+            await msg.edit(embed=self.lockdown_progress_embed(runner, "unlockdown"))
+        msg = await self.send_progress(ctx_or_interaction, discord.Embed(color=Colors.WARNING, description=f"⏳ Restoring **{len(locked)}** channels..."))
+        self.scheduler.cancel(f"unlockdown:{guild.id}")
+        runner = await self.bot.lockdown.unlock(guild, f"Lockdown lifted | By: {user}", progress=progress)
+        self.log_action(ctx_or_interaction, "unlockdown", restored=f"{len(runner.succeeded)}/{runner.total}")
+        await msg.edit(embed=self.lockdown_report_embed(runner, "unlockdown", time.perf_counter() - started))
+
+    @app_commands.command(name="lockdown", description="Lock many channels at once")
+    @app_commands.describe(scope="Which channels to lock", category="Category to lock (for the category scope)",
+                           duration="Lift automatically after... (e.g. 30m, 2h)", reason="Reason for the lockdown")
+    @app_commands.choices(scope=[app_commands.Choice(name="All text channels", value="all"), app_commands.Choice(name="One category", value="category"),
+                                 app_commands.Choice(name="Saved channel set", value="saved")])
+    @app_commands.default_permissions(manage_channels=True)
+    async def lockdown_slash(self, interaction: discord.Interaction, scope: str = "all", category: discord.CategoryChannel = None,
+                             duration: str = None, reason: str = "No reason provided"):
+        await interaction.response.defer()
+        await self.run_lockdown(interaction, scope, category, duration, reason)
+
+    @commands.command(name="lockdown")
+    @commands.has_permissions(manage_channels=True)
+    async def lockdown_prefix(self, ctx, category: discord.CategoryChannel = None, *, reason: str = "No reason provided"):
+        await self.run_lockdown(ctx, "category" if category else "all", category, None, reason)
+
+    @app_commands.command(name="unlockdown", description="Lift a lockdown and restore every channel's permissions")
+    @app_commands.default_permissions(manage_channels=True)
+    async def unlockdown_slash(self, interaction: discord.Interaction):
+        await interaction.response.defer()
+        await self.run_unlockdown(interaction)
+
+    @commands.command(name="unlockdown")
+    @commands.has_permissions(manage_channels=True)
+    async def unlockdown_prefix(self, ctx):
+        await self.run_unlockdown(ctx)
+
+    @app_commands.command(name="lockdown-set", description="Edit the saved channel set used by /lockdown")
+    @app_commands.describe(action="What to do with the channel", channel="Channel")
+    @app_commands.choices(action=[app_commands.Choice(name="Add", value="add"), app_commands.Choice(name="Remove", value="remove"),
+                                  app_commands.Choice(name="Clear", value="clear")])
+    @app_commands.default_permissions(manage_channels=True)
+    async def lockdownset_slash(self, interaction: discord.Interaction, action: str, channel: discord.TextChannel = None):
+        saved = list((await self.data.get_settings(interaction.guild.id)).get('lockdown_channels', []))
+        if action == "clear":
+            saved = []
+        elif channel is None:
+            return await self.send_error(interaction, f"{Emojis.CROSS} Please pick a channel.")
+        elif action == "add" and channel.id not in saved:
+            saved.append(channel.id)
+        elif action == "remove" and channel.id in saved:
+            saved.remove(channel.id)
+        await self.data.set_setting(interaction.guild.id, 'lockdown_channels', saved)
+        channels = " ".join(f"<#{cid}>" for cid in saved) or "empty"
+        await self.send_success(interaction, f"{Emojis.CHECK} Saved lockdown set ({len(saved)}): {channels}"[:4000])
 
 async def setup(bot):
     await bot.add_cog(ModerationCog(bot))
\ No newline at end of file
@@ -2,46 +2,45 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 from datetime import datetime, timezone
-import json
-import os
 from config import Colors, Emojis
 
 class PrefixCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.data_file = 'data/prefixes.json'
-        self.prefixes = self.load_prefixes()
+        self.registry = bot.prefixes
 
-    def load_prefixes(self):
-        try:
-            with open(self.data_file, 'r') as f:
-                return json.load(f)
-        except FileNotFoundError:
-            return {}
+    def validate(self, prefixes):
+        """Return an error message if the prefixes can't be used"""
+        if not prefixes:
+            return f"{Emojis.CROSS} Please provide at least one prefix."
+        if len(prefixes) > self.registry.MAX_PREFIXES:
+            return f"{Emojis.CROSS} You can set at most {self.registry.MAX_PREFIXES} prefixes."
+        if any(len(p) > 5 for p in prefixes):
+            return f"{Emojis.CROSS} Prefix must be 1-5 characters."
+        return None
 
-    def save_prefixes(self):
-        os.makedirs('data', exist_ok=True)
-        with open(self.data_file, 'w') as f:
-            json.dump(self.prefixes, f, indent=4)
+    def format_prefixes(self, prefixes):
+        return " ".join(f"`{p}`" for p in prefixes)
 
     @app_commands.command(name="setup-prefix", description="Set a custom prefix for this server")
-    @app_commands.describe(prefix="The new prefix (1-5 characters)")
+    @app_commands.describe(prefix="The new prefix (1-5 characters, separate several with spaces)")
     @app_commands.guild_only()
     async def setup_prefix_slash(self, interaction: discord.Interaction, prefix: str):
         if interaction.user.id != interaction.guild.owner_id:
             embed = discord.Embed(color=Colors.ERROR, description=f"{Emojis.CROSS} Only the server owner can change the prefix.")
             return await interaction.response.send_message(embed=embed, ephemeral=True)
         
-        if len(prefix) > 5 or len(prefix) < 1:
-            embed = discord.Embed(color=Colors.ERROR, description=f"{Emojis.CROSS} Prefix must be 1-5 characters.")
+        prefixes = list(dict.fromkeys(prefix.split()))
+        error = self.validate(prefixes)
+        if error:
+            embed = discord.Embed(color=Colors.ERROR, description=error)
             return await interaction.response.send_message(embed=embed, ephemeral=True)
         
-        self.prefixes[str(interaction.guild.id)] = prefix
-        self.save_prefixes()
+        self.registry.set(interaction.guild.id, prefixes)
         
         embed = discord.Embed(color=Colors.MAIN)
         embed.set_author(name="Prefix Updated", icon_url=self.bot.user.display_avatar.url)
-        embed.description = f"{Emojis.CHECK} Server prefix has been changed to `{prefix}`"
+        embed.description = f"{Emojis.CHECK} Server prefix has been changed to {self.format_prefixes(prefixes)}"
         embed.set_footer(text=f"Changed by {interaction.user.name}", icon_url=interaction.user.display_avatar.url)
         embed.timestamp = datetime.now(timezone.utc)
         
@@ -54,9 +53,7 @@ class PrefixCog(commands.Cog):
             embed = discord.Embed(color=Colors.ERROR, description=f"{Emojis.CROSS} Only the server owner can reset the prefix.")
             return await interaction.response.send_message(embed=embed, ephemeral=True)
         
-        if str(interaction.guild.id) in self.prefixes:
-            del self.prefixes[str(interaction.guild.id)]
-            self.save_prefixes()
+        self.registry.reset(interaction.guild.id)
         
         embed = discord.Embed(color=Colors.MAIN)
         embed.set_author(name="Prefix Reset", icon_url=self.bot.user.display_avatar.url)
@@ -68,24 +65,25 @@ class PrefixCog(commands.Cog):
 
     @commands.command(name="setup-prefix", aliases=["setprefix"])
     @commands.guild_only()
-    async def setup_prefix_cmd(self, ctx, prefix: str = None):
+    async def setup_prefix_cmd(self, ctx, *prefixes: str):
         if ctx.author.id != ctx.guild.owner_id:
             embed = discord.Embed(color=Colors.ERROR, description=f"{Emojis.CROSS} Only the server owner can change the prefix.")
             return await ctx.send(embed=embed)
         
-        if prefix is None:
-            current = self.prefixes.get(str(ctx.guild.id), self.bot.default_prefix)
-            embed = discord.Embed(color=Colors.MAIN, description=f"Current prefix is `{current}`")
+        if not prefixes:
+            current = self.registry.get(ctx.guild.id)
+            embed = discord.Embed(color=Colors.MAIN, description=f"Current prefix is {self.format_prefixes(current)}")
             return await ctx.send(embed=embed)
         
-        if len(prefix) > 5:
-            embed = discord.Embed(color=Colors.ERROR, description=f"{Emojis.CROSS} Prefix must be 5 characters or less.")
+        prefixes = list(dict.fromkeys(prefixes))
+        error = self.validate(prefixes)
+        if error:
+            embed = discord.Embed(color=Colors.ERROR, description=error)
             return await ctx.send(embed=embed)
         
-        self.prefixes[str(ctx.guild.id)] = prefix
-        self.save_prefixes()
+        self.registry.set(ctx.guild.id, prefixes)
         
-        embed = discord.Embed(color=Colors.MAIN, description=f"{Emojis.CHECK} Prefix changed to `{prefix}`")
+        embed = discord.Embed(color=Colors.MAIN, description=f"{Emojis.CHECK} Prefix changed to {self.format_prefixes(prefixes)}")
         await ctx.send(embed=embed)
 
     @commands.command(name="reset-prefix")
@@ -95,12 +93,10 @@ class PrefixCog(commands.Cog):
             embed = discord.Embed(color=Colors.ERROR, description=f"{Emojis.CROSS} Only the server owner can reset the prefix.")
             return await ctx.send(embed=embed)
         
-        if str(ctx.guild.id) in self.prefixes:
-            del self.prefixes[str(ctx.guild.id)]
-            self.save_prefixes()
+        self.registry.reset(ctx.guild.id)
         
         embed = discord.Embed(color=Colors.MAIN, description=f"{Emojis.CHECK} Prefix reset to `{self.bot.default_prefix}`")
         await ctx.send(embed=embed)
 
 async def setup(bot):
-    await bot.add_cog(PrefixCog(bot))
\ No newline at end of file
+    await bot.add_cog(PrefixCog(bot))
@@ -1,26 +1,98 @@
-from flask import Flask
-from threading import Thread
+import math
+import os
 from datetime import datetime, timezone
+from aiohttp import web
 
-app = Flask('')
-start_time = datetime.now(timezone.utc)
+port = int(os.environ.get('KEEP_ALIVE_PORT', 8080))
 
-@app.route('/')
-def home():
-    uptime = datetime.now(timezone.utc) - start_time
-    hours, remainder = divmod(int(uptime.total_seconds()), 3600)
-    minutes, seconds = divmod(remainder, 60)
-    return f'<h1>Bot is Running</h1><p>Uptime: {hours}h {minutes}m {seconds}s</p>'
+class KeepAliveServer:
+    """Status, health and readiness endpoints served from the bot's own event loop"""
+    MAX_READY_LAG = 0.5
 
-@app.route('/health')
-def health():
-    return {'status': 'ok'}
+    def __init__(self, bot, host='0.0.0.0', port=port):
+        self.bot = bot
+        self.host = host
+        self.port = port
+        self.runner = None
+        self.app = web.Application()
+        self.app.add_routes([
+            web.get('/', self.home),
+            web.get('/health', self.health),
+            web.get('/ready', self.ready),
+            web.get('/stats', self.stats),
+            web.get('/shards', self.shards),
+            web.get('/metrics', self.metrics),
+        ])
 
-def run():
-    app.run(host='0.0.0.0', port=8080)
+    async def start(self):
+        self.runner = web.AppRunner(self.app, access_log=None)
+        await self.runner.setup()
+        try:
+            await web.TCPSite(self.runner, self.host, self.port).start()
+        except OSError as e:
+            # Keep-alive is optional; a taken port must never stop the bot from connecting
+            print(f"❌ Web server could not bind port {self.port}: {e}")
+            await self.close()
+            return False
+        print(f"🌐 Web server started on port {self.port}")
+        return True
 
-def keep_alive():
-    t = Thread(target=run)
-    t.daemon = True
-    t.start()
-    print("🌐 Web server started on port 8080")
\ No newline at end of file
+    async def close(self):
+        if self.runner:
+            await self.runner.cleanup()
+            self.runner = None
+
+    def uptime_seconds(self):
+        return int((datetime.now(timezone.utc) - self.bot.start_time).total_seconds())
+
+    def latency_ms(self):
+        latency = self.bot.latency
+        return round(latency * 1000) if math.isfinite(latency) else None
+
+    async def home(self, request):
+        hours, remainder = divmod(self.uptime_seconds(), 3600)
+        minutes, seconds = divmod(remainder, 60)
+        return web.Response(text=f'<h1>Bot is Running</h1><p>Uptime: {hours}h {minutes}m {seconds}s</p>', content_type='text/html')
+
+    async def health(self, request):
+        return web.json_response({'status': 'ok'})
+
+    async def ready(self, request):
+        lag = self.bot.loop_monitor.current
+        shards = self.bot.shards.values()
+        connected = self.bot.is_ready() and not self.bot.is_closed() and all(not s.is_closed() for s in shards)
+        latency = self.latency_ms()
+        is_ready = connected and latency is not None and lag < self.MAX_READY_LAG
+        body = {
+            'status': 'ready' if is_ready else 'unavailable',
+            'gateway_connected': connected,
+            'shards_connected': sum(1 for s in shards if not s.is_closed()),
+            'shard_count': self.bot.shard_count,
+            'latency_ms': latency,
+            'loop_lag_ms': round(lag * 1000, 2),
+        }
+        return web.json_response(body, status=200 if is_ready else 503)
+
+    async def stats(self, request):
+        body = {
+            'ready': self.bot.is_ready(),
+            'uptime_seconds': self.uptime_seconds(),
+            'latency_ms': self.latency_ms(),
+            'shard_count': self.bot.shard_count,
+            'local': {'guilds': self.bot.stats.guilds, 'users': self.bot.stats.users, 'members': self.bot.stats.members},
+            'totals': self.bot.stats.totals(),
+            'state': self.bot.state.stats(),
+            'loop': self.bot.loop_monitor.summary(),
+        }
+        dev = self.bot.get_cog('DeveloperCog')
+        if dev:
+            body['presence'] = {'sent': dev.presence.sent, 'skipped': dev.presence.skipped}
+        return web.json_response(body)
+
+    async def shards(self, request):
+        if not self.bot.is_ready():
+            return web.json_response({'shard_count': None, 'shards': []})
+        return web.json_response({'shard_count': self.bot.shard_count, 'shards': self.bot.shard_monitor.snapshot()})
+
+    async def metrics(self, request):
+        return web.Response(text=self.bot.metrics.render(), headers={'Content-Type': 'text/plain; version=0.0.4; charset=utf-8'})
@@ -1,11 +1,35 @@
+import time
+STARTED = time.perf_counter()
+import asyncio
 import discord
 from discord.ext import commands
 import os
-import json
 from datetime import datetime, timezone
 import traceback
 import logging
-from keep_alive import keep_alive
+from keep_alive import KeepAliveServer
+from utils.prefixes import PrefixRegistry
+from utils.storage import create_mod_storage
+from utils.state import StateStore
+from utils.stats import StatsIndex
+from utils.shards import ShardMonitor, parse_shard_ids
+from utils.ipc import IPCClient
+from utils.metrics import Metrics, MetricsCommandTree
+from utils.loopmon import LagMonitor
+from utils.users import UserResolver
+from utils.notify import NotificationDispatcher
+from utils.modlog import ModLog
+from utils.scheduler import Scheduler
+from utils.automod import AutomodEngine
+from utils.spam import SpamDetector
+from utils.raid import RaidDetector
+from utils.lockdown import LockdownManager
+from utils.components import ComponentRouter
+from utils.embeds import EmbedTemplates
+from utils.changelog import Changelog
+from utils.sync import CommandSync
+from utils.startup import StartupTimer, discover_extensions
+IMPORTED = time.perf_counter()
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s │ %(levelname)-8s │ %(message)s', datefmt='%Y-%m-%d %H:%M:%S')
 
@@ -15,7 +39,14 @@ BOT_CONFIG = {
     'version': '1.0.0',
     'color': 0x5865F2,
     'support_server': 'https://discord.gg/NJZvYZP4Cd',
-    'github': None
+    'github': None,
+    'mod_storage': os.environ.get('MOD_STORAGE', 'json'),
+    'shard_count': int(os.environ['SHARD_COUNT']) if os.environ.get('SHARD_COUNT') else None,
+    'shard_ids': parse_shard_ids(os.environ.get('SHARD_IDS')),
+    'cluster_id': int(os.environ.get('CLUSTER_ID', 0)),
+    'ipc_port': int(os.environ['IPC_PORT']) if os.environ.get('IPC_PORT') else None,
+    'ipc_token': os.environ.get('IPC_TOKEN'),
+    'dev_guild_id': int(os.environ['DEV_GUILD_ID']) if os.environ.get('DEV_GUILD_ID') else None
 }
 
 intents = discord.Intents.default()
@@ -23,23 +54,18 @@ intents.message_content = True
 intents.members = True
 intents.presences = True
 
-def load_prefixes():
-    try:
-        with open('data/prefixes.json', 'r') as f:
-            return json.load(f)
-    except FileNotFoundError:
-        return {}
+def owns_guild(guild_id):
+    """Whether one of this worker's shards serves the guild"""
+    return (guild_id >> 22) % BOT_CONFIG['shard_count'] in BOT_CONFIG['shard_ids']
 
 def get_prefix(bot, message):
-    if not message.guild:
-        return commands.when_mentioned_or(BOT_CONFIG['default_prefix'])(bot, message)
-    prefixes = load_prefixes()
-    prefix = prefixes.get(str(message.guild.id), BOT_CONFIG['default_prefix'])
-    return commands.when_mentioned_or(prefix)(bot, message)
+    return bot.prefixes.resolve(bot, message)
 
-class PremiumBot(commands.Bot):
+class PremiumBot(commands.AutoShardedBot):
     def __init__(self):
-        super().__init__(command_prefix=get_prefix, intents=intents, help_command=None, case_insensitive=True)
+        init_started = time.perf_counter()
+        super().__init__(command_prefix=get_prefix, intents=intents, help_command=None, case_insensitive=True,
+                         shard_count=BOT_CONFIG['shard_count'], shard_ids=BOT_CONFIG['shard_ids'], tree_cls=MetricsCommandTree)
         self.start_time = datetime.now(timezone.utc)
         self.default_prefix = BOT_CONFIG['default_prefix']
         self.developer = BOT_CONFIG['developer']
@@ -47,54 +73,138 @@ class PremiumBot(commands.Bot):
         self.default_color = BOT_CONFIG['color']
         self.support_server = BOT_CONFIG['support_server']
         self.github = BOT_CONFIG['github']
+        # Clustered workers share one set of files and each rewrites only its own guilds' entries
+        clustered = BOT_CONFIG['ipc_port'] and BOT_CONFIG['shard_count'] and BOT_CONFIG['shard_ids']
+        self.state = StateStore(owns=owns_guild if clustered else None)
+        self.prefixes = PrefixRegistry(self.state, 'data/prefixes.json', self.default_prefix)
+        self.mod_data = create_mod_storage(BOT_CONFIG['mod_storage'], self.state)
+        self.stats = StatsIndex(self)
+        self.shard_monitor = ShardMonitor(self)
+        self.metrics = Metrics(self)
+        self.metrics.attach()
+        self.loop_monitor = LagMonitor()
+        self.user_resolver = UserResolver(self)
+        self.notifier = NotificationDispatcher()
+        self.modlog = ModLog(self)
+        self.scheduler = Scheduler(self, self.state, 'data/schedule.json')
+        self.automod = AutomodEngine(self)
+        self.spam = SpamDetector(self)
+        self.raid = RaidDetector(self)
+        self.lockdown = LockdownManager(self, self.state)
+        self.components = ComponentRouter(self)
+        self.embeds = EmbedTemplates(self)
+        self.changelog = Changelog('data/changelog.json')
+        self.command_sync = CommandSync(self, self.state, dev_guild_id=BOT_CONFIG['dev_guild_id'])
+        self.web = KeepAliveServer(self)
+        self.cluster = None
+        if BOT_CONFIG['ipc_port']:
+            self.cluster = IPCClient(self, BOT_CONFIG['cluster_id'], BOT_CONFIG['ipc_port'], BOT_CONFIG['ipc_token'])
+            self.cluster.on('shutdown', self.handle_cluster_shutdown)
+        self.startup = StartupTimer(STARTED, IMPORTED)
+        self.startup.record('init', init_started)
 
     async def setup_hook(self):
-        os.makedirs('data', exist_ok=True)
+        with self.startup.phase('services'):
+            os.makedirs('data', exist_ok=True)
+            self.loop_monitor.start()
+            self.state.start()
+            self.notifier.start()
+            self.modlog.start()
+            self.scheduler.start()
+            await self.mod_data.open()
+            if self.cluster:
+                self.cluster.start()
         print("\n╔════════════════════════════════════════════════════════════╗")
         print("║              🚀 PREMIUM BOT - LOADING                      ║")
         print("╠════════════════════════════════════════════════════════════╣")
         
-        cogs = ['cogs.info.ping', 'cogs.info.uptime', 'cogs.info.info', 'cogs.info.news', 'cogs.setup.prefix', 'cogs.mod.mod', 'cogs.developer.dev']
+        # Cogs only share state through the bot, so they can all load at once
+        cogs = discover_extensions('cogs')
+        await self.startup.load_extensions(self, cogs)
         
         for cog in cogs:
-            try:
-                await self.load_extension(cog)
-                print(f"║  ✅ Loaded: {cog:<46} ║")
-            except Exception as e:
+            if cog in self.startup.extensions:
+                print(f"║  ✅ Loaded: {cog:<34} {self.startup.extensions[cog]:>7.1f}ms ║")
+            elif cog in self.startup.failed:
                 print(f"║  ❌ Failed: {cog:<46} ║")
-                traceback.print_exc()
+                traceback.print_exception(self.startup.failed[cog])
         
         print("╚════════════════════════════════════════════════════════════╝")
         
+        # The command tree is bot-wide, so under the launcher only cluster 0 pushes it
+        if self.cluster is None or self.cluster.cluster_id == '0':
+            try:
+                with self.startup.phase('sync'):
+                    result = await self.command_sync.sync()
+                if result['skipped']:
+                    print(f"\n⏭️  Slash commands unchanged ({result['commands']}, {result['scope']}), sync skipped in {result['ms']}ms")
+                else:
+                    print(f"\n🔄 Synced {result['commands']} slash commands ({result['scope']}) in {result['ms']}ms")
+            except Exception as e:
+                print(f"\n❌ Sync failed: {e}")
+        self.startup.setup_done()
+
+    async def on_command_error(self, context, exception):
+        if context.command:
+            self.metrics.command_error('prefix', context.command.qualified_name, exception)
+        await super().on_command_error(context, exception)
+
+    async def handle_cluster_shutdown(self, data):
+        await self.close()
+
+    async def close(self):
+        self.stats.stop()
+        self.loop_monitor.stop()
+        self.notifier.stop()
+        self.scheduler.stop()
+        if self.cluster:
+            await self.cluster.close()
+        # Post whatever is still buffered while the connection is up
+        await self.modlog.stop()
         try:
-            synced = await self.tree.sync()
-            print(f"\n🔄 Synced {len(synced)} slash commands")
-        except Exception as e:
-            print(f"\n❌ Sync failed: {e}")
+            await super().close()
+        finally:
+            # Runs for /shutdown too, so nothing marked dirty is lost on the way out
+            await self.web.close()
+            await self.state.close()
+            await self.mod_data.close()
 
 bot = PremiumBot()
 
 @bot.event
 async def on_ready():
-    print(f"\n🌟 {bot.user.name} is online! | {len(bot.guilds)} servers")
-    await bot.change_presence(activity=discord.Activity(type=discord.ActivityType.watching, name=f"/help | {len(bot.guilds)} servers"))
+    print(f"\n🌟 {bot.user.name} is online! | {len(bot.guilds)} servers | {bot.shard_count} shard(s)")
+    if bot.startup.mark_ready():
+        phases = " • ".join(f"{name} {ms:.0f}ms" for name, ms in bot.startup.phases.items())
+        print(f"⏱️  Ready in {bot.startup.ready_ms / 1000:.2f}s ({phases})")
 
 @bot.event
 async def on_message(message):
     if message.author.bot:
         return
+    if message.guild and (await bot.automod.check(message) or await bot.spam.check(message)):
+        return
     if bot.user in message.mentions and len(message.content.strip()) < 30:
-        embed = discord.Embed(color=0x5DBB63, description=f"Hey {message.author.mention}! 👋\n\nMy prefix is `!` or use `/` for slash commands.")
+        prefixes = bot.prefixes.get(message.guild.id) if message.guild else [bot.default_prefix]
+        shown = " ".join(f"`{p}`" for p in prefixes)
+        embed = discord.Embed(color=0x5DBB63, description=f"Hey {message.author.mention}! 👋\n\nMy prefix is {shown} or use `/` for slash commands.")
         await message.channel.send(embed=embed)
         return
     await bot.process_commands(message)
 
-keep_alive()
+async def run_bot(token):
+    # Serving before login, so /health answers while the gateway is still connecting
+    await bot.web.start()
+    async with bot:
+        await bot.start(token)
 
 if __name__ == "__main__":
     token = os.environ.get('DISCORD_TOKEN')
     if token:
         print("\n🔑 Starting bot...")
-        bot.run(token, log_handler=None)
+        try:
+            asyncio.run(run_bot(token))
+        except KeyboardInterrupt:
+            pass
     else:
         print("\n❌ DISCORD_TOKEN not found!")
\ No newline at end of file
@@ -0,0 +1 @@
+# Leave this file empty
\ No newline at end of file
@@ -0,0 +1,131 @@
+import logging
+import re
+from collections import Counter
+from datetime import timedelta
+import discord
+
+log = logging.getLogger(__name__)
+
+INVITE_PATTERN = r'(?:discord(?:app)?\.com/invite|discord\.gg)/[\w-]+'
+CAPS_MIN_LENGTH = 10
+MAX_WORDS = 500
+ACTIONS = ('delete', 'warn', 'timeout')
+DEFAULT_RULES = {'words': [], 'invites': False, 'max_mentions': 0, 'caps_ratio': 0, 'action': 'delete', 'timeout': 600, 'spam': False}
+
+def build_trie_pattern(words):
+    """Fold words into a trie-shaped regex so shared prefixes are only tried once"""
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[''] = {}
+
+    def walk(node):
+        branches = [re.escape(ch) + walk(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ''
+        ends_here = '' in node
+        if len(branches) == 1 and not ends_here:
+            return branches[0]
+        group = '(?:' + '|'.join(branches) + ')'
+        return group + '?' if ends_here else group
+
+    return walk(trie)
+
+class CompiledRules:
+    """A guild's rules with every text rule folded into one regex"""
+    __slots__ = ('rules', 'pattern')
+
+    def __init__(self, rules):
+        self.rules = rules
+        parts = []
+        if rules['invites']:
+            parts.append(f'(?P<invite>{INVITE_PATTERN})')
+        if rules['words']:
+            parts.append(rf'(?P<word>(?<!\w){build_trie_pattern(rules["words"])}(?!\w))')
+        self.pattern = re.compile('|'.join(parts), re.IGNORECASE) if parts else None
+
+    @property
+    def active(self):
+        return bool(self.pattern or self.rules['max_mentions'] or self.rules['caps_ratio'])
+
+    def match(self, message):
+        """Return a reason string for the first rule the message breaks, or None"""
+        content = message.content
+        if self.pattern and content:
+            found = self.pattern.search(content)
+            if found:
+                return "Invite link" if found.lastgroup == 'invite' else "Banned word"
+        limit = self.rules['max_mentions']
+        if limit:
+            mentions = len(message.raw_mentions) + len(message.raw_role_mentions) + (1 if message.mention_everyone else 0)
+            if mentions > limit:
+                return f"Mass mention ({mentions})"
+        ratio = self.rules['caps_ratio']
+        if ratio and len(content) >= CAPS_MIN_LENGTH:
+            letters = sum(1 for ch in content if ch.isalpha())
+            if letters >= CAPS_MIN_LENGTH:
+                caps = sum(1 for ch in content if ch.isupper()) * 100 // letters
+                if caps >= ratio:
+                    return f"Excessive caps ({caps}%)"
+        return None
+
+class AutomodEngine:
+    """Checks guild messages against cached per-guild rules and enforces the configured action"""
+    def __init__(self, bot):
+        self.bot = bot
+        self.compiled = {}
+        self.hits = Counter()
+
+    async def get_rules(self, guild_id):
+        settings = await self.bot.mod_data.get_settings(guild_id)
+        return {**DEFAULT_RULES, **settings.get('automod', {})}
+
+    async def update_rules(self, guild_id, **changes):
+        rules = await self.get_rules(guild_id)
+        rules.update(changes)
+        await self.bot.mod_data.set_setting(guild_id, 'automod', rules)
+        self.compiled.pop(guild_id, None)
+        return rules
+
+    async def get_compiled(self, guild_id):
+        compiled = self.compiled.get(guild_id)
+        if compiled is None:
+            compiled = self.compiled[guild_id] = CompiledRules(await self.get_rules(guild_id))
+        return compiled
+
+    async def check(self, message):
+        """Return True if the message broke a rule and was removed"""
+        author = message.author
+        if not isinstance(author, discord.Member) or author.guild_permissions.manage_messages:
+            return False
+        compiled = await self.get_compiled(message.guild.id)
+        if not compiled.active:
+            return False
+        reason = compiled.match(message)
+        if reason is None:
+            return False
+        self.hits[reason.split(' (')[0]] += 1
+        await self.enforce(message, compiled.rules, reason)
+        return True
+
+    async def enforce(self, message, rules, reason):
+        guild, author = message.guild, message.author
+        try:
+            await message.delete()
+        except discord.HTTPException:
+            pass
+        action = rules['action']
+        details = {'channel': message.channel.mention, 'action': action}
+        moderation = self.bot.get_cog('ModerationCog')
+        try:
+            if action == 'warn' and moderation:
+                warns = await moderation.issue_warn(guild, author, f"Automod: {reason}", guild.me)
+                details['total_warnings'] = len(warns)
+            elif action == 'timeout':
+                await author.timeout(timedelta(seconds=rules['timeout']), reason=f"Automod: {reason}")
+                self.bot.notifier.enqueue(author, f"You have been timed out in **{guild.name}**\n**Reason:** Automod: {reason}", dedupe_key=f"automod:{guild.id}")
+        except discord.HTTPException as e:
+            log.warning("Automod %s failed in guild %s: %s", action, guild.id, e)
+        self.bot.modlog.emit(guild, "automod", author, guild.me, reason, **details)
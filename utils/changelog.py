@@ -0,0 +1,61 @@
+import asyncio
+import json
+import logging
+
+log = logging.getLogger(__name__)
+
+class Changelog:
+    """Release notes read lazily from disk and indexed by version and date; reload() swaps them in place"""
+    PAGE_SIZE = 5
+
+    def __init__(self, path='data/changelog.json'):
+        self.path = path
+        self.releases = None
+        self.upcoming = []
+        self.by_version = {}
+        self.by_date = {}
+        self.reloads = 0
+
+    def _read(self):
+        try:
+            with open(self.path, 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    async def reload(self):
+        data = await asyncio.to_thread(self._read)
+        # Newest first; ISO dates sort correctly as strings
+        releases = sorted(data.get('releases', []), key=lambda r: r['date'], reverse=True)
+        by_date = {}
+        for release in releases:
+            by_date.setdefault(release['date'], []).append(release)
+        by_version = {r['version']: r for r in releases}
+        # Swapped together only once everything is built, so a bad entry leaves the old changelog intact
+        self.releases, self.upcoming, self.by_version, self.by_date = releases, data.get('upcoming', []), by_version, by_date
+        self.reloads += 1
+        log.info("Loaded %d changelog entries from %s", len(releases), self.path)
+        return len(releases)
+
+    async def ensure_loaded(self):
+        if self.releases is None:
+            await self.reload()
+
+    @property
+    def latest(self):
+        return self.releases[0] if self.releases else None
+
+    @property
+    def page_count(self):
+        return max(1, -(-len(self.releases) // self.PAGE_SIZE))
+
+    def page(self, index):
+        return self.releases[index * self.PAGE_SIZE:(index + 1) * self.PAGE_SIZE]
+
+    def find(self, query):
+        """Look a release up by version (with or without a leading v) or by YYYY-MM-DD date"""
+        query = query.strip()
+        release = self.by_version.get(query.lstrip('vV'))
+        if release:
+            return [release]
+        return self.by_date.get(query, [])
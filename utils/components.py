@@ -0,0 +1,52 @@
+import logging
+from collections import Counter
+import discord
+
+log = logging.getLogger(__name__)
+
+def make_custom_id(namespace, owner_id, *args):
+    """Encode everything a handler needs into the component itself, e.g. "info:1234:stats" """
+    return ":".join(str(part) for part in (namespace, owner_id, *args))
+
+def component_view(*items):
+    """A view that is only serialised; clicks on its items are handled by the ComponentRouter"""
+    view = discord.ui.View(timeout=None)
+    for item in items:
+        view.add_item(item)
+    # A finished view is never stored by discord.py, so sending it keeps no per-message state
+    view.stop()
+    return view
+
+def select_menu(custom_id, options, placeholder="Select a category"):
+    return component_view(discord.ui.Select(custom_id=custom_id, placeholder=placeholder, options=options))
+
+class ComponentRouter:
+    """Dispatches component interactions by custom_id namespace, so menus survive restarts without live views"""
+    def __init__(self, bot):
+        self.bot = bot
+        self.handlers = {}
+        self.routed = Counter()
+        bot.add_listener(self.on_interaction, 'on_interaction')
+
+    def register(self, namespace, handler):
+        """handler(interaction, args, values) is awaited for components whose custom_id starts with namespace"""
+        self.handlers[namespace] = handler
+
+    def unregister(self, namespace):
+        self.handlers.pop(namespace, None)
+
+    async def on_interaction(self, interaction):
+        if interaction.type is not discord.InteractionType.component:
+            return
+        namespace, *parts = interaction.data.get('custom_id', '').split(':')
+        handler = self.handlers.get(namespace)
+        if handler is None or not parts or not parts[0].isdigit():
+            return
+        owner_id = int(parts[0])
+        if owner_id and interaction.user.id != owner_id:
+            return await interaction.response.send_message("This isn't your menu.", ephemeral=True)
+        self.routed[namespace] += 1
+        try:
+            await handler(interaction, parts[1:], interaction.data.get('values', []))
+        except Exception:
+            log.exception("Component handler for %s failed", namespace)
@@ -0,0 +1,11 @@
+import re
+
+TIME_UNITS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+def parse_duration(duration):
+    """Turn strings like 30s, 5m, 1h or 7d into seconds, or None if malformed"""
+    match = re.match(r'^(\d+)([smhd])$', duration.lower())
+    if not match:
+        return None
+    amount, unit = int(match.group(1)), match.group(2)
+    return amount * TIME_UNITS[unit]
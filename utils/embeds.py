@@ -0,0 +1,50 @@
+from datetime import datetime, timezone
+import discord
+
+class EmbedTemplates:
+    """Static embed payloads built once and rendered with only the per-request fields filled in"""
+    def __init__(self, bot):
+        self.bot = bot
+        self.builders = {}
+        self.cache = {}
+        self.builds = 0
+        self.renders = 0
+        bot.add_listener(self.on_user_update, 'on_user_update')
+
+    def register(self, name, builder):
+        """builder() returns the static part of the embed; it runs again only after invalidate()"""
+        self.builders[name] = builder
+        self.cache.pop(name, None)
+
+    def unregister(self, prefix):
+        for name in [n for n in self.builders if n.startswith(prefix)]:
+            del self.builders[name]
+            self.cache.pop(name, None)
+
+    def invalidate(self, prefix=""):
+        for name in [n for n in self.cache if n.startswith(prefix)]:
+            del self.cache[name]
+
+    async def on_user_update(self, before, after):
+        # Templates embed the bot's name and avatar
+        if self.bot.user and after.id == self.bot.user.id:
+            self.invalidate()
+
+    def payload(self, name):
+        payload = self.cache.get(name)
+        if payload is None:
+            built = self.builders[name]()
+            payload = self.cache[name] = built.to_dict() if isinstance(built, discord.Embed) else built
+            self.builds += 1
+        return payload
+
+    def render(self, name, fields=(), timestamp=True, **overrides):
+        """Build a sendable embed from the cached payload plus dynamic (name, value, inline) fields"""
+        base = self.payload(name)
+        # Fresh top-level dict and field list, so nothing done to the embed can leak into the cache
+        data = {**base, **overrides, 'fields': [*base.get('fields', ()), *({'name': n, 'value': v, 'inline': i} for n, v, i in fields)]}
+        embed = discord.Embed.from_dict(data)
+        if timestamp:
+            embed.timestamp = datetime.now(timezone.utc)
+        self.renders += 1
+        return embed
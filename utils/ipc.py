@@ -0,0 +1,166 @@
+import asyncio
+import json
+import logging
+
+log = logging.getLogger(__name__)
+
+async def send_message(writer, payload):
+    writer.write(json.dumps(payload).encode() + b'\n')
+    await writer.drain()
+
+class IPCServer:
+    """Hub run by the cluster launcher; relays stats and broadcasts between workers"""
+    def __init__(self, token, host='127.0.0.1', port=0):
+        self.token = token
+        self.host = host
+        self.port = port
+        self.writers = {}
+        self.stats = {}
+        self.on_event = None
+        self._server = None
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+        for writer in list(self.writers.values()):
+            writer.close()
+
+    async def _handle(self, reader, writer):
+        cluster_id = None
+        try:
+            hello = json.loads(await reader.readline() or b'{}')
+            if hello.get('op') != 'hello' or hello.get('token') != self.token:
+                return
+            cluster_id = str(hello['cluster'])
+            self.writers[cluster_id] = writer
+            await send_message(writer, {'op': 'cluster_stats', 'data': self.stats})
+            while line := await reader.readline():
+                await self._dispatch(cluster_id, json.loads(line))
+        except (ConnectionError, json.JSONDecodeError, KeyError) as e:
+            log.warning("IPC connection from cluster %s dropped: %s", cluster_id, e)
+        finally:
+            if cluster_id is not None and self.writers.get(cluster_id) is writer:
+                del self.writers[cluster_id]
+            writer.close()
+
+    async def _dispatch(self, cluster_id, message):
+        op = message.get('op')
+        if op == 'stats':
+            self.stats[cluster_id] = message['data']
+            await self.broadcast({'op': 'cluster_stats', 'data': self.stats})
+        elif op == 'broadcast':
+            if self.on_event:
+                self.on_event(message['event'], message.get('data'))
+            await self.broadcast({'op': 'event', 'event': message['event'], 'data': message.get('data')})
+
+    async def broadcast(self, payload):
+        for writer in list(self.writers.values()):
+            try:
+                await send_message(writer, payload)
+            except ConnectionError:
+                pass
+
+    async def forget(self, cluster_id):
+        """Drop a dead worker's stats so totals don't count it twice after a restart"""
+        if self.stats.pop(str(cluster_id), None) is not None:
+            await self.broadcast({'op': 'cluster_stats', 'data': self.stats})
+
+class IPCClient:
+    """Worker side of the cluster IPC channel"""
+    def __init__(self, bot, cluster_id, port, token, host='127.0.0.1', interval=15):
+        self.bot = bot
+        self.cluster_id = str(cluster_id)
+        self.host = host
+        self.port = port
+        self.token = token
+        self.interval = interval
+        self.cluster_stats = {}
+        self.handlers = {}
+        self.running = set()
+        self._writer = None
+        self._task = None
+
+    def on(self, event, handler):
+        self.handlers[event] = handler
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def close(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        if self._writer:
+            self._writer.close()
+            self._writer = None
+
+    async def _run(self):
+        backoff = 1
+        while True:
+            try:
+                reader, writer = await asyncio.open_connection(self.host, self.port)
+                await send_message(writer, {'op': 'hello', 'cluster': self.cluster_id, 'token': self.token})
+                self._writer = writer
+                backoff = 1
+                pusher = asyncio.create_task(self._push_stats())
+                try:
+                    while line := await reader.readline():
+                        self._dispatch(json.loads(line))
+                finally:
+                    pusher.cancel()
+                    self._writer = None
+            except (OSError, json.JSONDecodeError) as e:
+                log.warning("IPC connection to launcher failed: %s", e)
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 30)
+
+    async def _push_stats(self):
+        while True:
+            if self.bot.is_ready():
+                await self.send({'op': 'stats', 'data': self.local_stats()})
+            await asyncio.sleep(self.interval)
+
+    def local_stats(self):
+        stats = self.bot.stats
+        return {'guilds': stats.guilds, 'users': stats.users, 'members': stats.members, 'shards': sorted(self.bot.shards)}
+
+    def _dispatch(self, message):
+        op = message.get('op')
+        if op == 'cluster_stats':
+            self.cluster_stats = message['data']
+        elif op == 'event':
+            handler = self.handlers.get(message['event'])
+            if handler:
+                # Keep a reference so the handler task isn't garbage collected mid-run
+                task = asyncio.create_task(handler(message.get('data')))
+                self.running.add(task)
+                task.add_done_callback(self.running.discard)
+
+    async def send(self, payload):
+        if self._writer is None:
+            return False
+        try:
+            await send_message(self._writer, payload)
+            return True
+        except ConnectionError:
+            return False
+
+    async def broadcast(self, event, data=None):
+        """Send an event to every cluster, this one included; False if the launcher is unreachable"""
+        return await self.send({'op': 'broadcast', 'event': event, 'data': data})
+
+    def totals(self, local):
+        # Users are summed per cluster, so someone sharing servers on two clusters counts twice
+        totals = dict(local)
+        for cluster_id, stats in self.cluster_stats.items():
+            if cluster_id == self.cluster_id:
+                continue
+            for key in local:
+                totals[key] += stats.get(key, 0)
+        totals['clusters'] = len(set(self.cluster_stats) | {self.cluster_id})
+        return totals
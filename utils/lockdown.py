@@ -0,0 +1,72 @@
+import logging
+import discord
+from utils.workers import BatchRunner
+
+log = logging.getLogger(__name__)
+
+class LockdownManager:
+    """Locks many channels at once and later restores each channel's @everyone overwrite exactly"""
+    def __init__(self, bot, state, data_file='data/lockdowns.json', concurrency=4):
+        self.bot = bot
+        self.state = state
+        self.data_file = data_file
+        self.concurrency = concurrency
+        # {guild_id: {channel_id: [allow, deny] or None}}, persisted so a restart can still undo a lockdown
+        self.snapshots = state.load(data_file, guild_of=lambda gid, _: int(gid))
+        bot.scheduler.register('unlockdown', self.expire)
+
+    def locked(self, guild_id):
+        return [int(cid) for cid in self.snapshots.get(str(guild_id), {})]
+
+    def _save(self):
+        self.state.mark_dirty(self.data_file)
+
+    async def lock(self, guild, channels, reason, progress=None):
+        saved = self.snapshots.setdefault(str(guild.id), {})
+        everyone = guild.default_role
+
+        async def apply(channel):
+            key = str(channel.id)
+            fresh = key not in saved
+            overwrite = channel.overwrites_for(everyone)
+            # A channel locked twice keeps the snapshot from before the first lock
+            if fresh:
+                saved[key] = None if overwrite.is_empty() else [p.value for p in overwrite.pair()]
+                self._save()
+            overwrite.send_messages = False
+            try:
+                await channel.set_permissions(everyone, overwrite=overwrite, reason=reason)
+            except discord.HTTPException:
+                if fresh:
+                    saved.pop(key, None)
+                raise
+
+        runner = BatchRunner(apply, concurrency=self.concurrency, progress=progress)
+        return await runner.run(channels)
+
+    async def unlock(self, guild, reason, progress=None):
+        saved = self.snapshots.get(str(guild.id), {})
+        everyone = guild.default_role
+
+        for key in [key for key in saved if guild.get_channel(int(key)) is None]:
+            # Deleted channels have nothing left to restore
+            del saved[key]
+
+        async def apply(item):
+            key, pair = item
+            channel = guild.get_channel(int(key))
+            overwrite = None if pair is None else discord.PermissionOverwrite.from_pair(discord.Permissions(pair[0]), discord.Permissions(pair[1]))
+            await channel.set_permissions(everyone, overwrite=overwrite, reason=reason)
+            saved.pop(key, None)
+            self._save()
+
+        runner = BatchRunner(apply, concurrency=self.concurrency, progress=progress)
+        await runner.run(list(saved.items()))
+        if not saved:
+            self.snapshots.pop(str(guild.id), None)
+            self._save()
+        return runner
+
+    async def expire(self, guild, data):
+        runner = await self.unlock(guild, "Timed lockdown expired")
+        self.bot.modlog.emit(guild, "unlockdown", None, guild.me, "Timed lockdown expired", restored=f"{len(runner.succeeded)}/{runner.total}")
@@ -0,0 +1,83 @@
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+
+log = logging.getLogger(__name__)
+
+class LagMonitor:
+    """Measures event-loop scheduling delay and captures the stack of whatever blocked it"""
+    def __init__(self, interval=0.25, threshold=0.2, history=240):
+        self.interval = interval
+        self.threshold = threshold
+        self.readings = deque(maxlen=history)
+        self.stalls = deque(maxlen=20)
+        self._heartbeat = time.monotonic()
+        self._loop = None
+        self._loop_thread = None
+        self._task = None
+        self._stop = threading.Event()
+        self._captured = False
+
+    @property
+    def current(self):
+        return self.readings[-1][1] if self.readings else 0.0
+
+    def start(self):
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._task = asyncio.create_task(self._tick())
+        threading.Thread(target=self._watch, name='loop-watchdog', daemon=True).start()
+
+    def stop(self):
+        self._stop.set()
+        if self._task:
+            self._task.cancel()
+
+    async def _tick(self):
+        while True:
+            expected = self._loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(self._loop.time() - expected, 0.0)
+            self.readings.append((time.time(), lag))
+            self._heartbeat = time.monotonic()
+            if lag >= self.threshold:
+                log.warning("Event loop lag %.0fms (threshold %.0fms)", lag * 1000, self.threshold * 1000)
+
+    def _watch(self):
+        # Runs in its own thread: while the loop is stuck it can still see the loop thread's frames
+        while not self._stop.wait(self.interval / 2):
+            stalled = time.monotonic() - self._heartbeat - self.interval
+            if stalled < self.threshold:
+                self._captured = False
+                continue
+            if self._captured:
+                continue
+            self._captured = True
+            frame = sys._current_frames().get(self._loop_thread)
+            task = asyncio.current_task(self._loop)
+            stall = {
+                'time': time.time(),
+                'blocked_ms': round(stalled * 1000),
+                'task': task.get_name() if task else None,
+                'stack': ''.join(traceback.format_stack(frame)) if frame else '',
+            }
+            self.stalls.append(stall)
+            log.warning("Event loop blocked for %dms in task %s:\n%s", stall['blocked_ms'], stall['task'], stall['stack'])
+
+    def summary(self):
+        lags = sorted(lag for _, lag in self.readings)
+        if not lags:
+            return {'current_ms': 0.0, 'avg_ms': 0.0, 'p95_ms': 0.0, 'max_ms': 0.0, 'samples': 0, 'stalls': len(self.stalls)}
+        return {
+            'current_ms': round(self.current * 1000, 2),
+            'avg_ms': round(sum(lags) / len(lags) * 1000, 2),
+            'p95_ms': round(lags[min(int(len(lags) * 0.95), len(lags) - 1)] * 1000, 2),
+            'max_ms': round(lags[-1] * 1000, 2),
+            'samples': len(lags),
+            'stalls': len(self.stalls),
+        }
@@ -0,0 +1,160 @@
+import bisect
+import math
+import time
+from collections import Counter
+import discord
+from discord import app_commands
+
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+class Histogram:
+    """Fixed-bucket histogram; observe() is a bisect over a constant-size tuple"""
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+def escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def format_labels(names, values, extra=''):
+    parts = [f'{n}="{escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return '{' + ','.join(parts) + '}' if parts else ''
+
+class Metrics:
+    """Command, REST and gateway metrics rendered in Prometheus text format"""
+    def __init__(self, bot):
+        self.bot = bot
+        self.command_latency = {}
+        self.command_errors = Counter()
+        self.rest_latency = {}
+        self.rest_requests = Counter()
+        self.gateway_events = Counter()
+
+    def attach(self):
+        bot = self.bot
+        bot.before_invoke(self.before_prefix_command)
+        bot.after_invoke(self.after_prefix_command)
+        bot.add_listener(self.on_app_command_completion, 'on_app_command_completion')
+        bot.add_listener(self.on_socket_event_type, 'on_socket_event_type')
+        original = bot.http.request
+
+        async def timed_request(route, **kwargs):
+            start = time.perf_counter()
+            status = 'ok'
+            try:
+                return await original(route, **kwargs)
+            except discord.HTTPException as e:
+                status = str(e.status)
+                raise
+            except Exception:
+                status = 'error'
+                raise
+            finally:
+                self.observe_rest(route.method, route.path, status, time.perf_counter() - start)
+
+        bot.http.request = timed_request
+
+    def _histogram(self, table, key):
+        histogram = table.get(key)
+        if histogram is None:
+            histogram = table[key] = Histogram()
+        return histogram
+
+    def observe_command(self, kind, name, seconds):
+        self._histogram(self.command_latency, (kind, name)).observe(seconds)
+
+    def command_error(self, kind, name, error):
+        self.command_errors[(kind, name, type(error).__name__)] += 1
+
+    def observe_rest(self, method, route, status, seconds):
+        self._histogram(self.rest_latency, (method, route)).observe(seconds)
+        self.rest_requests[(method, route, status)] += 1
+
+    async def before_prefix_command(self, ctx):
+        ctx.metrics_start = time.perf_counter()
+
+    async def after_prefix_command(self, ctx):
+        start = getattr(ctx, 'metrics_start', None)
+        if start is not None:
+            self.observe_command('prefix', ctx.command.qualified_name, time.perf_counter() - start)
+
+    def finish_app_command(self, interaction, error=None):
+        name = interaction.command.qualified_name if interaction.command else 'unknown'
+        start = interaction.extras.get('metrics_start')
+        if start is not None:
+            self.observe_command('slash', name, time.perf_counter() - start)
+        if error is not None:
+            self.command_error('slash', name, error)
+
+    async def on_app_command_completion(self, interaction, command):
+        self.finish_app_command(interaction)
+
+    async def on_socket_event_type(self, event_type):
+        self.gateway_events[(event_type,)] += 1
+
+    def _render_histograms(self, lines, name, help_text, labels, table):
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} histogram')
+        for key, h in table.items():
+            cumulative = 0
+            for bound, count in zip(h.buckets, h.counts):
+                cumulative += count
+                bucket_labels = format_labels(labels, key, f'le="{bound}"')
+                lines.append(f'{name}_bucket{bucket_labels} {cumulative}')
+            bucket_labels = format_labels(labels, key, 'le="+Inf"')
+            lines.append(f'{name}_bucket{bucket_labels} {h.count}')
+            lines.append(f'{name}_sum{format_labels(labels, key)} {h.sum}')
+            lines.append(f'{name}_count{format_labels(labels, key)} {h.count}')
+
+    def _render_counter(self, lines, name, help_text, labels, counter):
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} counter')
+        for key, value in counter.items():
+            lines.append(f'{name}{format_labels(labels, key)} {value}')
+
+    def _render_gauge(self, lines, name, help_text, samples):
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} gauge')
+        for labels, value in samples:
+            lines.append(f'{name}{labels} {value}')
+
+    def render(self):
+        lines = []
+        self._render_histograms(lines, 'bot_command_duration_seconds', 'Command latency from invocation to completion', ('kind', 'command'), self.command_latency)
+        self._render_counter(lines, 'bot_command_errors_total', 'Commands that raised, by error type', ('kind', 'command', 'error'), self.command_errors)
+        self._render_histograms(lines, 'bot_rest_request_duration_seconds', 'Discord REST call duration including rate-limit waits', ('method', 'route'), self.rest_latency)
+        self._render_counter(lines, 'bot_rest_requests_total', 'Discord REST calls by outcome', ('method', 'route', 'status'), self.rest_requests)
+        self._render_counter(lines, 'bot_gateway_events_total', 'Gateway dispatch events received', ('event',), self.gateway_events)
+        outcomes = {(outcome,): count for outcome, count in self.bot.notifier.outcomes.items()}
+        self._render_counter(lines, 'bot_dm_notifications_total', 'Moderation DM notices by delivery outcome', ('outcome',), outcomes)
+        stats = self.bot.stats
+        self._render_gauge(lines, 'bot_guilds', 'Guilds in this process', [('', stats.guilds)])
+        self._render_gauge(lines, 'bot_users', 'Unique cached users in this process', [('', stats.users)])
+        self._render_gauge(lines, 'bot_members', 'Cached members in this process', [('', stats.members)])
+        shards = [(f'{{shard="{sid}"}}', shard.latency) for sid, shard in sorted(self.bot.shards.items()) if math.isfinite(shard.latency)]
+        self._render_gauge(lines, 'bot_shard_latency_seconds', 'Gateway heartbeat latency per shard', shards)
+        self._render_gauge(lines, 'bot_dm_queue_depth', 'DM notices waiting to be sent', [('', self.bot.notifier.queue.qsize())])
+        self._render_gauge(lines, 'bot_event_loop_lag_seconds', 'Most recent event-loop scheduling delay', [('', self.bot.loop_monitor.current)])
+        state = self.bot.state.stats()
+        self._render_gauge(lines, 'bot_state_pending_writes', 'State documents waiting to be flushed', [('', state['pending_writes'])])
+        self._render_gauge(lines, 'bot_state_last_flush_seconds', 'Duration of the last state flush', [('', state['last_flush_ms'] / 1000)])
+        return '\n'.join(lines) + '\n'
+
+class MetricsCommandTree(app_commands.CommandTree):
+    """Command tree that timestamps slash commands and counts their errors"""
+    async def interaction_check(self, interaction):
+        interaction.extras['metrics_start'] = time.perf_counter()
+        return True
+
+    async def on_error(self, interaction, error):
+        self.client.metrics.finish_app_command(interaction, error)
+        await super().on_error(interaction, error)
@@ -0,0 +1,151 @@
+import asyncio
+import logging
+from datetime import datetime, timezone
+import discord
+from config import Colors
+
+log = logging.getLogger(__name__)
+
+ACTION_STYLES = {
+    'ban': ("🔨", Colors.ERROR),
+    'unban': ("🔓", Colors.MAIN),
+    'kick': ("👢", Colors.WARNING),
+    'timeout': ("🔇", Colors.WARNING),
+    'untimeout': ("🔊", Colors.MAIN),
+    'warn': ("⚠️", Colors.WARNING),
+    'unwarn': ("🧽", Colors.MAIN),
+    'purge': ("🧹", Colors.WARNING),
+    'slowmode': ("🐢", Colors.MAIN),
+    'lock': ("🔒", Colors.WARNING),
+    'unlock': ("🔓", Colors.MAIN),
+    'automod': ("🛡️", Colors.WARNING),
+    'raid': ("🚨", Colors.ERROR),
+    'lockdown': ("🔒", Colors.ERROR),
+    'unlockdown': ("🔓", Colors.MAIN),
+}
+
+class ModLog:
+    """Buffers moderation events per guild and posts them to the mod-log channel in batches"""
+    MAX_EMBEDS = 10
+    MAX_CHARS = 6000
+    MAX_LINES = 25
+
+    def __init__(self, bot, flush_interval=3.0):
+        self.bot = bot
+        self.flush_interval = flush_interval
+        self.buffers = {}
+        self.channels = {}
+        self.posted = 0
+        self.dropped = 0
+        self._wake = None
+        self._task = None
+
+    def start(self):
+        self._wake = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        await self.flush()
+
+    def emit(self, guild, action, target=None, moderator=None, reason=None, **details):
+        event = {
+            'action': action,
+            'target': (target.id, str(target) if isinstance(target, discord.abc.User) else str(target.id)) if target is not None else None,
+            'moderator': (moderator.id, str(moderator)) if moderator is not None else None,
+            'reason': reason,
+            'details': details,
+            'time': datetime.now(timezone.utc),
+        }
+        self.buffers.setdefault(guild.id, []).append(event)
+        if self._wake:
+            self._wake.set()
+
+    def set_channel(self, guild_id, channel_id):
+        """Called when the log_channel setting changes so the cache never goes stale"""
+        self.channels[guild_id] = channel_id
+
+    async def channel_for(self, guild):
+        if guild.id not in self.channels:
+            settings = await self.bot.mod_data.get_settings(guild.id)
+            self.channels[guild.id] = settings.get('log_channel')
+        channel_id = self.channels[guild.id]
+        return guild.get_channel(channel_id) if channel_id else None
+
+    async def _run(self):
+        while True:
+            await self._wake.wait()
+            # Let the burst build up so one message carries as many events as possible
+            await asyncio.sleep(self.flush_interval)
+            self._wake.clear()
+            try:
+                await self.flush()
+            except Exception:
+                log.exception("Mod log flush failed")
+
+    @staticmethod
+    def group_key(event):
+        return event['action'], event['moderator'], event['reason'], event['details']
+
+    def group(self, events):
+        """Merge consecutive events that only differ by target into one embed"""
+        groups = []
+        for event in events:
+            last = groups[-1] if groups else None
+            if last and len(last) < self.MAX_LINES and event['target'] and last[0]['target'] and self.group_key(last[0]) == self.group_key(event):
+                last.append(event)
+            else:
+                groups.append([event])
+        return groups
+
+    def render(self, events):
+        first = events[0]
+        emoji, color = ACTION_STYLES.get(first['action'], ("📋", Colors.MAIN))
+        embed = discord.Embed(color=color, title=f"{emoji} {first['action'].title()}")
+        if len(events) == 1:
+            if first['target']:
+                embed.add_field(name="Target", value=f"<@{first['target'][0]}> ({first['target'][1]})", inline=True)
+        else:
+            embed.title += f" ×{len(events)}"
+            embed.description = "\n".join(f"<@{e['target'][0]}> ({e['target'][1]})" for e in events)[:4096]
+        for name, value in first['details'].items():
+            embed.add_field(name=name.replace('_', ' ').title(), value=str(value)[:1024], inline=True)
+        if first['moderator']:
+            embed.add_field(name="Moderator", value=f"<@{first['moderator'][0]}>", inline=True)
+        if first['reason']:
+            embed.add_field(name="Reason", value=first['reason'][:1024], inline=False)
+        embed.timestamp = events[-1]['time']
+        return embed
+
+    def chunks(self, groups):
+        """Pack rendered groups into messages within both the embed count and total character limits"""
+        chunk, size = [], 0
+        for group in groups:
+            embed = self.render(group)
+            length = len(embed)
+            if chunk and (len(chunk) == self.MAX_EMBEDS or size + length > self.MAX_CHARS):
+                yield chunk
+                chunk, size = [], 0
+            chunk.append((embed, len(group)))
+            size += length
+        if chunk:
+            yield chunk
+
+    async def flush(self):
+        buffers, self.buffers = self.buffers, {}
+        for guild_id, events in buffers.items():
+            guild = self.bot.get_guild(guild_id)
+            channel = await self.channel_for(guild) if guild else None
+            if channel is None:
+                self.dropped += len(events)
+                continue
+            for chunk in self.chunks(self.group(events)):
+                try:
+                    await channel.send(embeds=[embed for embed, _ in chunk])
+                    self.posted += len(chunk)
+                except discord.HTTPException as e:
+                    # Only this message is lost; the rest of the burst still gets posted
+                    log.warning("Could not post mod log in guild %s: %s", guild_id, e)
+                    self.dropped += sum(count for _, count in chunk)
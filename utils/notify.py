@@ -0,0 +1,110 @@
+import asyncio
+import logging
+import time
+from collections import Counter, deque
+import discord
+
+log = logging.getLogger(__name__)
+
+class NotificationDispatcher:
+    """Background DM queue with retry, backoff and per-user dedupe"""
+    def __init__(self, workers=2, retries=3, dedupe_window=300, history=200):
+        self.worker_count = workers
+        self.retries = retries
+        self.dedupe_window = dedupe_window
+        self.queue = asyncio.Queue(maxsize=5000)
+        self.recent = {}
+        self.outcomes = Counter()
+        self.history = deque(maxlen=history)
+        self._workers = []
+
+    def start(self):
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.worker_count)]
+
+    def stop(self):
+        for worker in self._workers:
+            worker.cancel()
+        self._workers = []
+
+    def _record(self, user_id, outcome):
+        self.outcomes[outcome] += 1
+        self.history.append((time.time(), user_id, outcome))
+        return outcome
+
+    def _is_duplicate(self, user_id, key):
+        now = time.monotonic()
+        if len(self.recent) > 10000:
+            self.recent = {k: exp for k, exp in self.recent.items() if exp > now}
+        expiry = self.recent.get((user_id, key))
+        if expiry and expiry > now:
+            return True
+        self.recent[(user_id, key)] = now + self.dedupe_window
+        return False
+
+    @staticmethod
+    def retry_after(error):
+        """Seconds Discord asked us to wait, if the rate-limit response said so"""
+        if isinstance(error, discord.RateLimited):
+            return error.retry_after
+        response = getattr(error, 'response', None)
+        value = response.headers.get('Retry-After') if response is not None else None
+        try:
+            return float(value) if value else None
+        except ValueError:
+            return None
+
+    async def _deliver(self, user, content):
+        delay = 1
+        for attempt in range(self.retries + 1):
+            wait = None
+            try:
+                await user.send(content)
+                return self._record(user.id, 'delivered')
+            except discord.Forbidden:
+                # DMs closed or no shared server; retrying will not help
+                return self._record(user.id, 'closed')
+            except discord.RateLimited as e:
+                wait = self.retry_after(e)
+            except discord.HTTPException as e:
+                if e.status == 429:
+                    wait = self.retry_after(e)
+                elif e.status < 500:
+                    log.info("DM to %s rejected: %s", user.id, e)
+                    return self._record(user.id, 'failed')
+            except OSError:
+                pass
+            if attempt < self.retries:
+                await asyncio.sleep(wait if wait is not None else delay)
+                delay *= 2
+        return self._record(user.id, 'failed')
+
+    async def _worker(self):
+        while True:
+            user, content = await self.queue.get()
+            try:
+                await self._deliver(user, content)
+            except Exception:
+                log.exception("Notification worker error")
+            finally:
+                self.queue.task_done()
+
+    def enqueue(self, user, content, dedupe_key=None):
+        """Queue a DM without waiting; returns False if it was a duplicate or the queue is full"""
+        if self._is_duplicate(user.id, dedupe_key or content):
+            self._record(user.id, 'deduped')
+            return False
+        try:
+            self.queue.put_nowait((user, content))
+            return True
+        except asyncio.QueueFull:
+            self._record(user.id, 'dropped')
+            return False
+
+    async def send_now(self, user, content, dedupe_key=None, timeout=5.0):
+        """Deliver before returning, for notices that must land before the member leaves the server"""
+        if self._is_duplicate(user.id, dedupe_key or content):
+            return self._record(user.id, 'deduped')
+        try:
+            return await asyncio.wait_for(self._deliver(user, content), timeout)
+        except asyncio.TimeoutError:
+            return self._record(user.id, 'timeout')
@@ -0,0 +1,49 @@
+import re
+from discord.ext import commands
+
+class PrefixRegistry:
+    """In-memory guild prefix table shared by get_prefix and PrefixCog"""
+    MAX_PREFIXES = 5
+
+    def __init__(self, state, data_file, default):
+        self.state = state
+        self.data_file = data_file
+        self.default = default
+        self.data = state.load(data_file, guild_of=lambda gid, _: int(gid))
+        self.prefixes = {int(gid): [p] if isinstance(p, str) else list(p) for gid, p in self.data.items()}
+        self._matchers = {gid: self._compile(p) for gid, p in self.prefixes.items()}
+
+    def _compile(self, prefixes):
+        # Longest first so "!!" wins over "!" when both are configured
+        ordered = sorted(prefixes, key=len, reverse=True)
+        return re.compile('|'.join(re.escape(p) for p in ordered))
+
+    def get(self, guild_id):
+        return self.prefixes.get(guild_id, [self.default])
+
+    def set(self, guild_id, prefixes):
+        self.prefixes[guild_id] = list(prefixes)
+        self._matchers[guild_id] = self._compile(prefixes)
+        # Single prefixes stay plain strings so the file format is unchanged for existing guilds
+        self.data[str(guild_id)] = prefixes[0] if len(prefixes) == 1 else list(prefixes)
+        self.state.mark_dirty(self.data_file)
+
+    def reset(self, guild_id):
+        if guild_id not in self.prefixes:
+            return False
+        del self.prefixes[guild_id]
+        del self._matchers[guild_id]
+        self.data.pop(str(guild_id), None)
+        self.state.mark_dirty(self.data_file)
+        return True
+
+    def resolve(self, bot, message):
+        if not message.guild:
+            return commands.when_mentioned_or(self.default)(bot, message)
+        matcher = self._matchers.get(message.guild.id)
+        if matcher is None:
+            return commands.when_mentioned_or(self.default)(bot, message)
+        # Hand discord.py only the prefix that actually matched, so it never scans the full list
+        match = matcher.match(message.content)
+        prefix = match.group(0) if match else self.prefixes[message.guild.id][0]
+        return commands.when_mentioned_or(prefix)(bot, message)
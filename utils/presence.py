@@ -0,0 +1,63 @@
+import asyncio
+import logging
+
+log = logging.getLogger(__name__)
+
+class PresenceEngine:
+    """Sends presence updates only when the rendered activity actually changes"""
+    def __init__(self, bot, build_activity, batch_delay=3.0):
+        self.bot = bot
+        self.build_activity = build_activity
+        self.batch_delay = batch_delay
+        self.last_sent = {}
+        self.sent = 0
+        self.skipped = 0
+        self._pending = None
+        # A fresh IDENTIFY drops the presence we set, so forget what that connection had
+        bot.add_listener(self.on_connect, 'on_connect')
+        bot.add_listener(self.on_shard_connect, 'on_shard_connect')
+
+    async def on_connect(self):
+        self.last_sent.pop(None, None)
+
+    async def on_shard_connect(self, shard_id):
+        self.last_sent.pop(shard_id, None)
+
+    def _key(self, activity):
+        return (type(activity).__name__, getattr(activity, 'type', None), activity.name, getattr(activity, 'url', None))
+
+    def _shard_ids(self):
+        shards = getattr(self.bot, 'shards', None)
+        return list(shards) if shards else [None]
+
+    async def refresh(self, force=False):
+        for shard_id in self._shard_ids():
+            activity = self.build_activity(shard_id)
+            key = self._key(activity)
+            if not force and self.last_sent.get(shard_id) == key:
+                self.skipped += 1
+                continue
+            if shard_id is None:
+                await self.bot.change_presence(activity=activity)
+            else:
+                await self.bot.change_presence(activity=activity, shard_id=shard_id)
+            self.last_sent[shard_id] = key
+            self.sent += 1
+
+    def request(self):
+        """Coalesce rapid config changes into a single refresh after batch_delay"""
+        if self._pending is None or self._pending.done():
+            self._pending = asyncio.create_task(self._delayed_refresh())
+
+    async def _delayed_refresh(self):
+        await asyncio.sleep(self.batch_delay)
+        try:
+            await self.refresh()
+        except Exception:
+            log.exception("Presence update failed")
+
+    def stop(self):
+        self.bot.remove_listener(self.on_connect, 'on_connect')
+        self.bot.remove_listener(self.on_shard_connect, 'on_shard_connect')
+        if self._pending is not None:
+            self._pending.cancel()
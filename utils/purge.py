@@ -0,0 +1,144 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone, timedelta
+import discord
+from utils.workers import ProgressReporter
+
+log = logging.getLogger(__name__)
+
+# Bulk delete refuses anything older than 14 days; keep a margin for clock skew and slow walks
+BULK_DELETE_AGE = timedelta(days=14) - timedelta(minutes=5)
+
+class PurgeFilter:
+    """Predicate over messages built from the purge command's options"""
+    def __init__(self, author_id=None, bots_only=False, pattern=None, attachments_only=False, skip_ids=()):
+        self.author_id = author_id
+        self.bots_only = bots_only
+        self.pattern = pattern
+        self.attachments_only = attachments_only
+        self.skip_ids = set(skip_ids)
+
+    def __call__(self, message):
+        if message.id in self.skip_ids or message.pinned:
+            return False
+        if self.author_id is not None and message.author.id != self.author_id:
+            return False
+        if self.bots_only and not message.author.bot:
+            return False
+        if self.attachments_only and not message.attachments:
+            return False
+        if self.pattern is not None and not self.pattern.search(message.content):
+            return False
+        return True
+
+class PurgeJob(ProgressReporter):
+    """Walks channel history lazily, bulk-deleting recent matches and queueing old ones for single deletes"""
+    def __init__(self, channel, limit, check, after=None, before=None, scan_limit=20000, reason=None, progress=None, progress_every=2.0):
+        self.channel = channel
+        self.limit = limit
+        self.check = check
+        self.after = after
+        self.before = before
+        self.scan_limit = scan_limit
+        self.reason = reason
+        self.progress = progress
+        self.progress_every = progress_every
+        self.scanned = 0
+        self.matched = 0
+        self.bulk_deleted = 0
+        self.single_deleted = 0
+        self.failed = 0
+        self.cancelled = False
+        self.started = None
+        self.finished = None
+        self._last_progress = 0.0
+
+    @property
+    def deleted(self):
+        return self.bulk_deleted + self.single_deleted
+
+    def cancel(self):
+        self.cancelled = True
+
+    async def _bulk_delete(self, batch):
+        try:
+            await self.channel.delete_messages(batch, reason=self.reason)
+            self.bulk_deleted += len(batch)
+        except discord.NotFound:
+            # Somebody beat us to one of them; fall back so the rest still go
+            for message in batch:
+                await self._single_delete(message)
+        except discord.HTTPException:
+            self.failed += len(batch)
+
+    async def _single_delete(self, message):
+        try:
+            await message.delete()
+            self.single_deleted += 1
+        except discord.NotFound:
+            pass
+        except discord.HTTPException:
+            self.failed += 1
+
+    async def _single_worker(self, queue):
+        # One worker: old messages share a single per-channel rate-limit bucket anyway
+        while True:
+            message = await queue.get()
+            try:
+                if not self.cancelled:
+                    await self._single_delete(message)
+            except Exception:
+                # A dead worker would leave run() waiting on the queue forever
+                log.exception("Deleting message %s failed", message.id)
+                self.failed += 1
+            finally:
+                queue.task_done()
+
+    async def run(self):
+        self.started = time.monotonic()
+        cutoff = datetime.now(timezone.utc) - BULK_DELETE_AGE
+        old_queue = asyncio.Queue(maxsize=200)
+        worker = asyncio.create_task(self._single_worker(old_queue))
+        batch = []
+        try:
+            async for message in self.channel.history(limit=self.scan_limit, after=self.after, before=self.before, oldest_first=False):
+                if self.cancelled:
+                    break
+                self.scanned += 1
+                await self._report()
+                if not self.check(message):
+                    continue
+                self.matched += 1
+                if message.created_at > cutoff:
+                    batch.append(message)
+                    if len(batch) == 100:
+                        await self._bulk_delete(batch)
+                        batch = []
+                else:
+                    await old_queue.put(message)
+                if self.matched >= self.limit:
+                    break
+            if batch and not self.cancelled:
+                await self._bulk_delete(batch)
+            if not self.cancelled:
+                await old_queue.join()
+        finally:
+            worker.cancel()
+            self.finished = time.monotonic()
+            # The progress message always ends on the final counts, even if the walk was cut short
+            await self._report(force=True)
+        return self.summary()
+
+    def summary(self):
+        elapsed = (self.finished or time.monotonic()) - (self.started or time.monotonic())
+        return {
+            'scanned': self.scanned,
+            'matched': self.matched,
+            'deleted': self.deleted,
+            'bulk_deleted': self.bulk_deleted,
+            'single_deleted': self.single_deleted,
+            'failed': self.failed,
+            'cancelled': self.cancelled,
+            'seconds': round(elapsed, 1),
+        }
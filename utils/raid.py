@@ -0,0 +1,181 @@
+import logging
+import time
+from collections import Counter, deque
+from datetime import timedelta
+import discord
+from utils.workers import BatchRunner
+
+log = logging.getLogger(__name__)
+
+RESPONSES = ('alert', 'slowmode', 'lock', 'quarantine')
+DEFAULT_CONFIG = {'enabled': False, 'joins': 10, 'seconds': 10, 'young_days': 7, 'young_joins': 5, 'response': 'slowmode',
+                  'slowmode': 30, 'duration': 900, 'channels': [], 'quarantine_role': None}
+
+class JoinWindow:
+    """Joins seen in the last few seconds; every join is appended and evicted once, so upkeep is O(1) amortized"""
+    __slots__ = ('joins', 'young')
+
+    def __init__(self):
+        self.joins = deque()
+        self.young = 0
+
+    def push(self, now, member_id, young, span):
+        self.joins.append((now, member_id, young))
+        self.young += young
+        while self.joins[0][0] < now - span:
+            _, _, was_young = self.joins.popleft()
+            self.young -= was_young
+
+class RaidDetector:
+    """Watches join rates per guild and triggers the configured anti-raid response"""
+    def __init__(self, bot, concurrency=4):
+        self.bot = bot
+        self.concurrency = concurrency
+        self.windows = {}
+        self.configs = {}
+        self.active = {}
+        self.raids = Counter()
+        bot.add_listener(self.on_member_join, 'on_member_join')
+        bot.scheduler.register('unquarantine', self.unquarantine)
+
+    async def get_config(self, guild_id):
+        config = self.configs.get(guild_id)
+        if config is None:
+            settings = await self.bot.mod_data.get_settings(guild_id)
+            config = self.configs[guild_id] = {**DEFAULT_CONFIG, **settings.get('antiraid', {})}
+        return config
+
+    async def update_config(self, guild_id, **changes):
+        config = dict(await self.get_config(guild_id))
+        config.update(changes)
+        await self.bot.mod_data.set_setting(guild_id, 'antiraid', config)
+        self.configs[guild_id] = config
+        return config
+
+    def is_active(self, guild_id):
+        until = self.active.get(guild_id)
+        if until and until < time.monotonic():
+            del self.active[guild_id]
+            return False
+        return bool(until)
+
+    async def on_member_join(self, member):
+        config = await self.get_config(member.guild.id)
+        if not config['enabled']:
+            return
+        guild = member.guild
+        now = time.monotonic()
+        young = (discord.utils.utcnow() - member.created_at).days < config['young_days']
+        window = self.windows.setdefault(guild.id, JoinWindow())
+        window.push(now, member.id, young, config['seconds'])
+
+        if self.is_active(guild.id):
+            # Raid mode is on: everyone joining during it gets the same treatment
+            if config['response'] == 'quarantine':
+                await self.quarantine(guild, [member], config)
+            return
+        if len(window.joins) >= config['joins']:
+            reason = f"{len(window.joins)} joins in {config['seconds']}s"
+        elif window.young >= config['young_joins']:
+            reason = f"{window.young} accounts younger than {config['young_days']}d joined in {config['seconds']}s"
+        else:
+            return
+        await self.trigger(guild, config, reason, [member_id for _, member_id, _ in window.joins])
+
+    def target_channels(self, guild, config):
+        if config['channels']:
+            channels = (guild.get_channel(cid) for cid in config['channels'])
+            return [c for c in channels if isinstance(c, discord.TextChannel)]
+        everyone = guild.default_role
+        return [c for c in guild.text_channels if c.permissions_for(everyone).send_messages]
+
+    async def trigger(self, guild, config, reason, member_ids):
+        self.active[guild.id] = time.monotonic() + config['duration']
+        self.raids[guild.id] += 1
+        response = config['response']
+        started = time.perf_counter()
+        runner = None
+        if response == 'slowmode':
+            runner = await self.slowmode(guild, self.target_channels(guild, config), config)
+        elif response == 'lock':
+            runner = await self.lock(guild, self.target_channels(guild, config), config)
+        elif response == 'quarantine':
+            members = [m for m in map(guild.get_member, member_ids) if m]
+            runner = await self.quarantine(guild, members, config)
+        details = {'response': response, 'joins': len(member_ids), 'ends': f"<t:{int(time.time() + config['duration'])}:R>"}
+        if runner:
+            details['applied'] = f"{len(runner.succeeded)}/{runner.total} in {time.perf_counter() - started:.1f}s"
+        log.warning("Raid detected in guild %s: %s", guild.id, reason)
+        self.bot.modlog.emit(guild, "raid", None, guild.me, reason, **details)
+
+    async def slowmode(self, guild, channels, config):
+        scheduler = self.bot.scheduler
+        async def apply(channel):
+            key = f"slowmode:{channel.id}"
+            pending = scheduler.get(key)
+            previous = pending['data']['previous'] if pending else channel.slowmode_delay
+            await channel.edit(slowmode_delay=config['slowmode'], reason="Anti-raid")
+            scheduler.schedule(key, 'slowmode', guild.id, config['duration'], channel=channel.id, previous=previous, raid=True)
+        return await BatchRunner(apply, concurrency=self.concurrency).run(channels)
+
+    async def lock(self, guild, channels, config):
+        runner = await self.bot.lockdown.lock(guild, channels, "Anti-raid lockdown")
+        key = f"unlockdown:{guild.id}"
+        self.bot.scheduler.schedule(key, 'unlockdown', guild.id, config['duration'], raid=True)
+        return runner
+
+    async def quarantine(self, guild, members, config):
+        role = guild.get_role(config['quarantine_role']) if config['quarantine_role'] else None
+        scheduler = self.bot.scheduler
+        async def apply(member):
+            if role:
+                await member.add_roles(role, reason="Anti-raid quarantine")
+            else:
+                await member.timeout(timedelta(seconds=config['duration']), reason="Anti-raid quarantine")
+            # Persisted like the slowmode timers, so end() can still release members after a restart
+            scheduler.schedule(f"quarantine:{guild.id}:{member.id}", 'unquarantine', guild.id, config['duration'],
+                               member=member.id, role=role.id if role else None, raid=True)
+        return await BatchRunner(apply, concurrency=self.concurrency).run(members)
+
+    async def unquarantine(self, guild, data):
+        """Take the quarantine role back or clear the timeout; True if the member was actually released"""
+        member = guild.get_member(data['member'])
+        if member is None:
+            return False
+        if data['role'] is not None:
+            role = guild.get_role(data['role'])
+            if role and role in member.roles:
+                await member.remove_roles(role, reason="Anti-raid quarantine ended")
+                return True
+        elif member.is_timed_out():
+            await member.timeout(None, reason="Anti-raid quarantine ended")
+            return True
+        return False
+
+    def raid_jobs(self, guild_id):
+        return [(key, job) for key, job in self.bot.scheduler.jobs.items() if job['guild'] == guild_id and job['data'].get('raid')]
+
+    async def end(self, guild):
+        """Leave raid mode early: release quarantined members now and queue the channel restores
+
+        Returns how many members were released.
+        """
+        self.active.pop(guild.id, None)
+        scheduler = self.bot.scheduler
+        quarantined = []
+        for key, job in self.raid_jobs(guild.id):
+            if job['kind'] == 'unquarantine':
+                quarantined.append(key)
+            else:
+                scheduler.schedule(key, job['kind'], guild.id, 0, **job['data'])
+
+        released = []
+        async def apply(key):
+            job = scheduler.get(key)
+            if job is None:
+                return
+            if await self.unquarantine(guild, job['data']):
+                released.append(job['data']['member'])
+            scheduler.cancel(key)
+        await BatchRunner(apply, concurrency=self.concurrency).run(quarantined)
+        return len(released)
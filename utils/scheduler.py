@@ -0,0 +1,153 @@
+import asyncio
+import heapq
+import logging
+import time
+import discord
+
+log = logging.getLogger(__name__)
+
+class Scheduler:
+    """Persistent min-heap of due actions served by a single sleeping task"""
+    MAX_RETRIES = 12
+    RETRY_BASE = 30
+    RETRY_MAX = 3600
+
+    def __init__(self, bot, state, data_file='data/schedule.json'):
+        self.bot = bot
+        self.state = state
+        self.data_file = data_file
+        # Clustered workers only load the jobs of guilds on their own shards
+        self.jobs = state.load(data_file, guild_of=lambda key, job: job['guild'])
+        self.heap = []
+        self.handlers = {}
+        self.running = set()
+        self.inflight = {}
+        self.completed = 0
+        self.failed = 0
+        self.retried = 0
+        self._wake = None
+        self._task = None
+
+    def register(self, kind, handler):
+        """handler(guild, data) is awaited when a job of this kind comes due"""
+        self.handlers[kind] = handler
+        if self._wake is not None:
+            # Jobs held while no handler existed (cog not loaded yet, or reloading) become runnable again
+            self._rebuild()
+            self._wake.set()
+
+    def schedule(self, key, kind, guild_id, delay, **data):
+        """Schedule a job under a unique key; scheduling an existing key replaces it"""
+        due = time.time() + delay
+        self.jobs[key] = {'kind': kind, 'guild': guild_id, 'due': due, 'data': data}
+        self.state.mark_dirty(self.data_file)
+        heapq.heappush(self.heap, (due, key))
+        if self._wake is not None and self.heap[0][1] == key:
+            self._wake.set()
+        return due
+
+    def cancel(self, key):
+        """Forget a job; its heap entry is skipped lazily when it reaches the top"""
+        if self.jobs.pop(key, None) is None:
+            return False
+        self.state.mark_dirty(self.data_file)
+        if len(self.heap) > 2 * len(self.jobs) + 1000:
+            self._rebuild()
+        return True
+
+    def get(self, key):
+        return self.jobs.get(key)
+
+    def pending(self, guild_id=None):
+        return sum(1 for job in self.jobs.values() if guild_id is None or job['guild'] == guild_id)
+
+    def _rebuild(self):
+        self.heap = [(job['due'], key) for key, job in self.jobs.items()]
+        heapq.heapify(self.heap)
+
+    def start(self):
+        if self._task is None:
+            self._rebuild()
+            self._wake = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self):
+        # Guild lookups need a populated cache, so nothing fires before the first READY
+        await self.bot.wait_until_ready()
+        while True:
+            self._wake.clear()
+            now = time.time()
+            while self.heap and self.heap[0][0] <= now:
+                due, key = heapq.heappop(self.heap)
+                job = self.jobs.get(key)
+                if job is None or job['due'] != due or self.inflight.get(key) is job:
+                    continue
+                # The job stays stored until its handler succeeds, so a crash or outage can't lose it
+                self.inflight[key] = job
+                task = asyncio.create_task(self._execute(key, job))
+                self.running.add(task)
+                task.add_done_callback(self.running.discard)
+            timeout = self.heap[0][0] - now if self.heap else None
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    def _finish(self, key, job):
+        if self.jobs.get(key) is job:
+            del self.jobs[key]
+            self.state.mark_dirty(self.data_file)
+
+    def _retry(self, key, job, why):
+        if self.jobs.get(key) is not job:
+            # Rescheduled or cancelled while it ran; the newer state wins
+            return
+        attempts = job.get('attempts', 0) + 1
+        if attempts > self.MAX_RETRIES:
+            self.failed += 1
+            log.error("Giving up on scheduled job %s after %d attempts: %s", key, attempts - 1, why)
+            return self._finish(key, job)
+        delay = min(self.RETRY_BASE * 2 ** (attempts - 1), self.RETRY_MAX)
+        job['attempts'] = attempts
+        job['due'] = time.time() + delay
+        self.state.mark_dirty(self.data_file)
+        heapq.heappush(self.heap, (job['due'], key))
+        self._wake.set()
+        self.retried += 1
+        log.warning("Scheduled job %s postponed %ds (attempt %d): %s", key, delay, attempts, why)
+
+    @staticmethod
+    def is_transient(error):
+        if isinstance(error, discord.HTTPException):
+            return error.status == 429 or error.status >= 500
+        return isinstance(error, (asyncio.TimeoutError, OSError))
+
+    async def _execute(self, key, job):
+        try:
+            handler = self.handlers.get(job['kind'])
+            if handler is None:
+                # Kept but off the heap; register() puts it back once the owning cog loads
+                log.warning("Holding scheduled job %s until a %s handler is registered", key, job['kind'])
+                return
+            guild = self.bot.get_guild(job['guild'])
+            if guild is None:
+                # Usually an outage or a shard still resuming; if the bot really left, retries run out
+                return self._retry(key, job, "guild unavailable")
+            try:
+                await handler(guild, job['data'])
+            except Exception as e:
+                if self.is_transient(e):
+                    return self._retry(key, job, e)
+                self.failed += 1
+                log.exception("Scheduled job %s failed", key)
+            else:
+                self.completed += 1
+            self._finish(key, job)
+        finally:
+            if self.inflight.get(key) is job:
+                del self.inflight[key]
@@ -0,0 +1,64 @@
+import math
+from collections import Counter
+
+def parse_shard_ids(value):
+    """Parse "0-3" or "0,2,5-7" into a list of shard ids"""
+    if not value:
+        return None
+    ids = []
+    for part in value.split(','):
+        part = part.strip()
+        if '-' in part:
+            start, end = part.split('-', 1)
+            ids.extend(range(int(start), int(end) + 1))
+        elif part:
+            ids.append(int(part))
+    return ids
+
+class ShardMonitor:
+    """Per-shard connection history for /ping, /info and the status server"""
+    def __init__(self, bot):
+        self.bot = bot
+        self.connects = Counter()
+        self.resumes = Counter()
+        self.disconnects = Counter()
+        for event in ('on_shard_connect', 'on_shard_resumed', 'on_shard_disconnect'):
+            bot.add_listener(getattr(self, event), event)
+
+    async def on_shard_connect(self, shard_id):
+        self.connects[shard_id] += 1
+
+    async def on_shard_resumed(self, shard_id):
+        self.resumes[shard_id] += 1
+
+    async def on_shard_disconnect(self, shard_id):
+        self.disconnects[shard_id] += 1
+
+    def reconnects(self, shard_id):
+        # The first connect is the initial login, everything after it is a reconnect
+        return max(self.connects[shard_id] - 1, 0) + self.resumes[shard_id]
+
+    def snapshot(self):
+        shards = []
+        for shard_id, shard in sorted(self.bot.shards.items()):
+            latency = shard.latency
+            shards.append({
+                'id': shard_id,
+                'latency_ms': round(latency * 1000) if math.isfinite(latency) else None,
+                'guilds': self.bot.stats.shard_guilds[shard_id],
+                'reconnects': self.reconnects(shard_id),
+                'disconnects': self.disconnects[shard_id],
+                'connected': not shard.is_closed(),
+            })
+        return shards
+
+    def format_lines(self, limit=10):
+        shards = self.snapshot()
+        lines = []
+        for s in shards[:limit]:
+            latency = f"{s['latency_ms']}ms" if s['latency_ms'] is not None else "—"
+            state = "🟢" if s['connected'] else "🔴"
+            lines.append(f"{state} `#{s['id']}` {latency} • {s['guilds']} servers • {s['reconnects']} reconnects")
+        if len(shards) > limit:
+            lines.append(f"... and {len(shards) - limit} more")
+        return "\n".join(lines)
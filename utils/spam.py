@@ -0,0 +1,115 @@
+import logging
+import time
+from collections import OrderedDict, Counter, deque
+from datetime import timedelta
+import discord
+from utils.durations import parse_duration
+
+log = logging.getLogger(__name__)
+
+class MemberActivity:
+    """Rate state for one member: message and mention buckets plus recent content hashes"""
+    __slots__ = ('tokens', 'mention_tokens', 'updated', 'hashes', 'strikes', 'last_strike')
+
+    def __init__(self, capacity, mention_capacity, now):
+        self.tokens = capacity
+        self.mention_tokens = mention_capacity
+        self.updated = now
+        self.hashes = deque(maxlen=8)
+        self.strikes = 0
+        self.last_strike = 0.0
+
+class SpamDetector:
+    """Rate-based spam detection with per-member state kept in a size-bounded LRU"""
+    # Each strike times out for longer; from the last step on the member is warned as well
+    ESCALATION = ('1m', '10m', '1h')
+
+    def __init__(self, bot, burst=6, per=6.0, duplicates=4, duplicate_window=30.0, mention_burst=10, mention_per=20.0,
+                 strike_decay=3600, max_tracked=50000):
+        self.bot = bot
+        self.burst = burst
+        self.rate = burst / per
+        self.duplicates = duplicates
+        self.duplicate_window = duplicate_window
+        self.mention_burst = mention_burst
+        self.mention_rate = mention_burst / mention_per
+        self.strike_decay = strike_decay
+        self.max_tracked = max_tracked
+        self.activity = OrderedDict()
+        self.hits = Counter()
+
+    def _get(self, key, now):
+        entry = self.activity.get(key)
+        if entry is None:
+            entry = self.activity[key] = MemberActivity(self.burst, self.mention_burst, now)
+            if len(self.activity) > self.max_tracked:
+                self.activity.popitem(last=False)
+        else:
+            self.activity.move_to_end(key)
+        return entry
+
+    def inspect(self, message, now=None):
+        """Update the author's state and return a reason if the message looks like spam"""
+        now = time.monotonic() if now is None else now
+        entry = self._get((message.guild.id, message.author.id), now)
+        elapsed = now - entry.updated
+        entry.updated = now
+        entry.tokens = min(self.burst, entry.tokens + elapsed * self.rate) - 1
+        entry.mention_tokens = min(self.mention_burst, entry.mention_tokens + elapsed * self.mention_rate)
+        entry.mention_tokens -= len(message.raw_mentions) + len(message.raw_role_mentions)
+
+        if message.content:
+            digest = hash(message.content.strip().lower())
+            entry.hashes.append((digest, now))
+            repeats = sum(1 for h, t in entry.hashes if h == digest and now - t <= self.duplicate_window)
+            if repeats >= self.duplicates:
+                return entry, "Duplicate messages"
+        if entry.tokens < 0:
+            return entry, "Message flood"
+        if entry.mention_tokens < 0:
+            return entry, "Mention burst"
+        return entry, None
+
+    async def check(self, message):
+        """Return True if the message was treated as spam"""
+        author = message.author
+        if not isinstance(author, discord.Member) or author.guild_permissions.manage_messages:
+            return False
+        rules = await self.bot.automod.get_compiled(message.guild.id)
+        if not rules.rules['spam']:
+            return False
+        entry, reason = self.inspect(message)
+        if reason is None:
+            return False
+        self.hits[reason] += 1
+        await self.punish(message, entry, reason)
+        return True
+
+    async def punish(self, message, entry, reason):
+        guild, author = message.guild, message.author
+        now = time.monotonic()
+        if now - entry.last_strike > self.strike_decay:
+            entry.strikes = 0
+        entry.strikes += 1
+        entry.last_strike = now
+        # Start over with full buckets so one burst is punished once
+        entry.tokens, entry.mention_tokens = self.burst, self.mention_burst
+        entry.hashes.clear()
+
+        step = min(entry.strikes, len(self.ESCALATION)) - 1
+        duration = self.ESCALATION[step]
+        details = {'channel': message.channel.mention, 'strike': entry.strikes, 'duration': duration}
+        try:
+            await message.delete()
+        except discord.HTTPException:
+            pass
+        try:
+            await author.timeout(timedelta(seconds=parse_duration(duration)), reason=f"Anti-spam: {reason}")
+            self.bot.notifier.enqueue(author, f"You have been timed out in **{guild.name}** for **{duration}**\n**Reason:** Anti-spam: {reason}", dedupe_key=f"spam:{guild.id}")
+            moderation = self.bot.get_cog('ModerationCog')
+            if step == len(self.ESCALATION) - 1 and moderation:
+                warns = await moderation.issue_warn(guild, author, f"Anti-spam: {reason}", guild.me)
+                details['total_warnings'] = len(warns)
+        except discord.HTTPException as e:
+            log.warning("Anti-spam action failed in guild %s: %s", guild.id, e)
+        self.bot.modlog.emit(guild, "timeout", author, guild.me, f"Anti-spam: {reason}", **details)
@@ -0,0 +1,75 @@
+import asyncio
+import importlib
+import pkgutil
+import time
+from contextlib import contextmanager
+from discord.ext import commands
+
+def discover_extensions(package='cogs'):
+    """Every non-package module under the cogs package; modules without setup() are skipped at load time"""
+    root = importlib.import_module(package)
+    return sorted(name for _, name, is_pkg in pkgutil.walk_packages(root.__path__, f"{package}.") if not is_pkg)
+
+def process_memory_mb():
+    """Resident memory of this process, or None when psutil is not installed"""
+    try:
+        import psutil
+    except ImportError:
+        return None
+    return round(psutil.Process().memory_info().rss / 1048576, 1)
+
+class StartupTimer:
+    """Wall-clock cost of each startup phase, from process start to the first READY"""
+    def __init__(self, started, imported):
+        self.started = started
+        self.phases = {'imports': round((imported - started) * 1000, 1)}
+        self.extensions = {}
+        self.failed = {}
+        self.skipped = []
+        self._setup_done = None
+        self.ready_ms = None
+
+    def record(self, name, since):
+        self.phases[name] = round((time.perf_counter() - since) * 1000, 1)
+
+    @contextmanager
+    def phase(self, name):
+        since = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, since)
+
+    def setup_done(self):
+        self._setup_done = time.perf_counter()
+
+    def mark_ready(self):
+        """Called on every READY; only the first one counts"""
+        if self.ready_ms is not None:
+            return False
+        if self._setup_done is not None:
+            self.record('gateway ready', self._setup_done)
+        self.ready_ms = round((time.perf_counter() - self.started) * 1000, 1)
+        return True
+
+    async def load_extensions(self, bot, names):
+        """Load extensions concurrently; each one's import and setup() time is kept separately"""
+        async def load(name):
+            since = time.perf_counter()
+            try:
+                await bot.load_extension(name)
+            except commands.NoEntryPointError:
+                self.skipped.append(name)
+                return
+            except Exception as e:
+                # setup_hook prints the traceback alongside the load table
+                self.failed[name] = e
+                return
+            self.extensions[name] = round((time.perf_counter() - since) * 1000, 1)
+
+        with self.phase('cog loads'):
+            await asyncio.gather(*(load(name) for name in names))
+
+    def summary(self):
+        return {'phases': dict(self.phases), 'extensions': dict(self.extensions), 'failed': list(self.failed),
+                'ready_ms': self.ready_ms, 'memory_mb': process_memory_mb()}
@@ -0,0 +1,196 @@
+import asyncio
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+try:
+    import fcntl
+except ImportError:
+    # No cross-process file locks off POSIX; the cluster launcher is only run on Linux
+    fcntl = None
+
+log = logging.getLogger(__name__)
+
+class StateStore:
+    """Write-behind cache for JSON state files with debounced, atomic flushes"""
+    def __init__(self, flush_interval=2.0, owns=None):
+        self.flush_interval = flush_interval
+        # Under the cluster launcher, owns(guild_id) says whether this worker serves a guild
+        self.owns = owns
+        self.documents = {}
+        self.indents = {}
+        self.partitions = {}
+        self.dirty = set()
+        # A cancelled flush's thread keeps running; sequence numbers stop it landing over a newer write
+        self._write_lock = threading.Lock()
+        self._written = {}
+        self._seq = 0
+        self._wake = None
+        self._task = None
+        self.flushes = 0
+        self.writes = 0
+        self.failures = 0
+        self.last_flush_ms = 0.0
+        self.max_flush_ms = 0.0
+        self.total_flush_ms = 0.0
+
+    def _read(self, path, default, guild_of=None):
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return default() if callable(default) else default
+        if guild_of and self.owns:
+            data = {key: value for key, value in data.items() if self.owns(guild_of(key, value))}
+        return data
+
+    def load(self, path, default=dict, indent=4, guild_of=None):
+        """Return the cached document, reading it from disk on first use
+
+        Documents holding one entry per guild pass guild_of(key, value); clustered workers then
+        only see their own guilds' entries and merge them back into the shared file on flush.
+        """
+        if path not in self.documents:
+            self.documents[path] = self._read(path, default, guild_of)
+            self.indents[path] = indent
+            if guild_of:
+                self.partitions[path] = guild_of
+        return self.documents[path]
+
+    async def aload(self, path, default=dict, indent=4):
+        """Like load, but a cache miss reads the file off the event loop"""
+        if path not in self.documents:
+            data = await asyncio.to_thread(self._read, path, default)
+            # Another caller may have won the race while we were reading
+            self.documents.setdefault(path, data)
+            self.indents.setdefault(path, indent)
+        return self.documents[path]
+
+    def mark_dirty(self, path):
+        self.dirty.add(path)
+        if self._wake is not None:
+            self._wake.set()
+
+    def start(self):
+        if self._task is None:
+            self._wake = asyncio.Event()
+            if self.dirty:
+                self._wake.set()
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        while True:
+            await self._wake.wait()
+            # Debounce: everything marked dirty during the interval lands in one write per file
+            await asyncio.sleep(self.flush_interval)
+            self._wake.clear()
+            try:
+                await self.flush()
+            except Exception:
+                # flush() has already put its paths back in dirty; the next wake retries them
+                log.exception("State flush failed")
+
+    def _write_atomic(self, path, text):
+        folder = os.path.dirname(path) or '.'
+        os.makedirs(folder, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=folder, prefix='.tmp-', suffix='.json')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                f.write(text)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    def _write_merged(self, path, text, guild_of):
+        """Replace only this worker's entries; the rest of the file belongs to other clusters"""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(f"{path}.lock", 'a') as lock:
+            if fcntl:
+                # Held across read-modify-write so two workers flushing at once can't lose each other's entries
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                with open(path, 'r') as f:
+                    current = json.load(f)
+            except FileNotFoundError:
+                current = {}
+            merged = {key: value for key, value in current.items() if not self.owns(guild_of(key, value))}
+            merged.update(json.loads(text))
+            self._write_atomic(path, json.dumps(merged, indent=self.indents[path]))
+
+    def _write_all(self, snapshot, seq):
+        failed = []
+        with self._write_lock:
+            for path, text in snapshot.items():
+                if self._written.get(path, -1) > seq:
+                    continue
+                try:
+                    guild_of = self.partitions.get(path) if self.owns else None
+                    if guild_of:
+                        self._write_merged(path, text, guild_of)
+                    else:
+                        self._write_atomic(path, text)
+                    self._written[path] = seq
+                except Exception:
+                    log.exception("Failed to write %s", path)
+                    failed.append(path)
+        return failed
+
+    async def flush(self):
+        if not self.dirty:
+            return
+        start = time.perf_counter()
+        # Serialise on the loop so the worker thread never sees a document mid-mutation
+        paths, self.dirty = self.dirty, set()
+        try:
+            snapshot, failed = {}, []
+            for path in paths:
+                try:
+                    snapshot[path] = json.dumps(self.documents[path], indent=self.indents[path])
+                except (TypeError, ValueError):
+                    # One bad value must not hold back every other document
+                    log.exception("Cannot serialise %s", path)
+                    failed.append(path)
+            self._seq += 1
+            failed += await asyncio.to_thread(self._write_all, snapshot, self._seq)
+        except BaseException:
+            # Cancelled by close() or an unexpected error; keep the paths dirty so a later flush rewrites them
+            self.dirty.update(paths)
+            raise
+        if failed:
+            self.failures += len(failed)
+            self.dirty.update(failed)
+            if self._wake is not None:
+                self._wake.set()
+        elapsed = (time.perf_counter() - start) * 1000
+        self.flushes += 1
+        self.writes += len(paths) - len(failed)
+        self.last_flush_ms = elapsed
+        self.max_flush_ms = max(self.max_flush_ms, elapsed)
+        self.total_flush_ms += elapsed
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    def stats(self):
+        return {
+            'documents': len(self.documents),
+            'pending_writes': len(self.dirty),
+            'flushes': self.flushes,
+            'writes': self.writes,
+            'failures': self.failures,
+            'last_flush_ms': round(self.last_flush_ms, 2),
+            'max_flush_ms': round(self.max_flush_ms, 2),
+            'avg_flush_ms': round(self.total_flush_ms / self.flushes, 2) if self.flushes else 0.0,
+        }
@@ -0,0 +1,96 @@
+import asyncio
+import logging
+from collections import Counter
+from discord.ext import tasks
+
+log = logging.getLogger(__name__)
+
+class StatsIndex:
+    """Guild, member and unique-user counters kept current from gateway events"""
+    def __init__(self, bot):
+        self.bot = bot
+        self.user_refs = {}
+        self.members = 0
+        self.guilds = 0
+        self.shard_guilds = Counter()
+        self.seeded = False
+        self.last_drift = 0
+        for event in ('on_ready', 'on_member_join', 'on_member_remove', 'on_guild_join', 'on_guild_remove'):
+            bot.add_listener(getattr(self, event), event)
+
+    @property
+    def users(self):
+        return len(self.user_refs)
+
+    def totals(self):
+        """Counts across every cluster when running under the launcher, else this process only"""
+        local = {'guilds': self.guilds, 'users': self.users, 'members': self.members}
+        cluster = getattr(self.bot, 'cluster', None)
+        return cluster.totals(local) if cluster else local
+
+    def _add_member(self, user_id):
+        self.members += 1
+        self.user_refs[user_id] = self.user_refs.get(user_id, 0) + 1
+
+    def _remove_member(self, user_id):
+        refs = self.user_refs.get(user_id)
+        if refs is None:
+            return
+        self.members -= 1
+        if refs <= 1:
+            del self.user_refs[user_id]
+        else:
+            self.user_refs[user_id] = refs - 1
+
+    async def _count(self, yield_between_guilds):
+        user_refs, members = {}, 0
+        guilds = list(self.bot.guilds)
+        for guild in guilds:
+            for member in guild.members:
+                user_refs[member.id] = user_refs.get(member.id, 0) + 1
+            members += len(guild.members)
+            if yield_between_guilds:
+                await asyncio.sleep(0)
+        return user_refs, members, len(guilds), Counter(g.shard_id for g in guilds)
+
+    async def on_ready(self):
+        if self.seeded:
+            return
+        self.user_refs, self.members, self.guilds, self.shard_guilds = await self._count(False)
+        self.seeded = True
+        self.reconcile.start()
+
+    async def on_member_join(self, member):
+        self._add_member(member.id)
+
+    async def on_member_remove(self, member):
+        self._remove_member(member.id)
+
+    async def on_guild_join(self, guild):
+        self.guilds += 1
+        self.shard_guilds[guild.shard_id] += 1
+        for member in guild.members:
+            self._add_member(member.id)
+
+    async def on_guild_remove(self, guild):
+        self.guilds -= 1
+        self.shard_guilds[guild.shard_id] -= 1
+        for member in guild.members:
+            self._remove_member(member.id)
+
+    @tasks.loop(minutes=15)
+    async def reconcile(self):
+        # Full recount that yields between guilds; corrects events missed on reconnects or during chunking
+        user_refs, members, guilds, shard_guilds = await self._count(True)
+        self.last_drift = len(user_refs) - self.users
+        if self.last_drift or members != self.members or guilds != self.guilds:
+            log.info("Stats drift corrected: users %+d, members %+d, guilds %+d", self.last_drift, members - self.members, guilds - self.guilds)
+        self.user_refs, self.members, self.guilds, self.shard_guilds = user_refs, members, guilds, shard_guilds
+
+    @reconcile.before_loop
+    async def before_reconcile(self):
+        # The seed in on_ready just counted everything, so skip the loop's immediate first run
+        await asyncio.sleep(self.reconcile.minutes * 60)
+
+    def stop(self):
+        self.reconcile.cancel()
@@ -0,0 +1,254 @@
+import asyncio
+import glob
+import json
+import os
+import re
+import sqlite3
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+class ModStorage:
+    """Interface shared by the moderation storage backends"""
+    async def open(self):
+        pass
+
+    async def close(self):
+        pass
+
+    async def get_warns(self, guild_id, user_id):
+        raise NotImplementedError
+
+    async def add_warn(self, guild_id, user_id, reason, mod_id):
+        """Store a warning and return the member's updated warning list"""
+        raise NotImplementedError
+
+    async def remove_warn(self, guild_id, user_id, warn_id):
+        """Delete a warning and return the remaining list, or None if it didn't exist"""
+        raise NotImplementedError
+
+    async def get_warn_counts(self, guild_id):
+        """Return (user_id, count) pairs for every member with warnings"""
+        raise NotImplementedError
+
+    async def get_settings(self, guild_id):
+        raise NotImplementedError
+
+    async def set_setting(self, guild_id, key, value):
+        raise NotImplementedError
+
+def make_warn(warn_id, reason, mod_id):
+    return {'id': warn_id, 'reason': reason, 'mod': mod_id, 'time': datetime.now(timezone.utc).isoformat()}
+
+def unique_warn_ids(warns):
+    """Yield (id, warn) with repeats renumbered; older files gave ids as len+1, so removals left duplicates"""
+    used = {w.get('id') for w in warns}
+    seen = set()
+    for warn in warns:
+        warn_id = warn.get('id')
+        if not isinstance(warn_id, int) or warn_id in seen:
+            warn_id = max((i for i in used if isinstance(i, int)), default=0) + 1
+            used.add(warn_id)
+        seen.add(warn_id)
+        yield warn_id, warn
+
+class ModData(ModStorage):
+    """One JSON document per guild and kind, cached and flushed by the shared StateStore"""
+    def __init__(self, state, data_folder='data/mod'):
+        self.state = state
+        self.data_folder = data_folder
+    
+    def _get_path(self, guild_id, file):
+        return f'{self.data_folder}/{guild_id}_{file}.json'
+    
+    async def load(self, guild_id, file):
+        return await self.state.aload(self._get_path(guild_id, file), indent=2)
+    
+    def save(self, guild_id, file):
+        self.state.mark_dirty(self._get_path(guild_id, file))
+
+    async def get_warns(self, guild_id, user_id):
+        warns = await self.load(guild_id, 'warns')
+        return list(warns.get(str(user_id), []))
+
+    async def add_warn(self, guild_id, user_id, reason, mod_id):
+        warns = await self.load(guild_id, 'warns')
+        user_warns = warns.setdefault(str(user_id), [])
+        warn_id = max((w['id'] for w in user_warns), default=0) + 1
+        user_warns.append(make_warn(warn_id, reason, mod_id))
+        self.save(guild_id, 'warns')
+        return list(user_warns)
+
+    async def remove_warn(self, guild_id, user_id, warn_id):
+        warns = await self.load(guild_id, 'warns')
+        user_warns = warns.get(str(user_id), [])
+        new_warns = [w for w in user_warns if w['id'] != warn_id]
+        if len(new_warns) == len(user_warns):
+            return None
+        warns[str(user_id)] = new_warns
+        self.save(guild_id, 'warns')
+        return list(new_warns)
+
+    async def get_warn_counts(self, guild_id):
+        warns = await self.load(guild_id, 'warns')
+        return [(int(uid), len(w)) for uid, w in warns.items() if w]
+
+    async def get_settings(self, guild_id):
+        return dict(await self.load(guild_id, 'settings'))
+
+    async def set_setting(self, guild_id, key, value):
+        settings = await self.load(guild_id, 'settings')
+        settings[key] = value
+        self.save(guild_id, 'settings')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS warnings (
+    guild_id INTEGER NOT NULL,
+    user_id INTEGER NOT NULL,
+    warn_id INTEGER NOT NULL,
+    reason TEXT NOT NULL,
+    mod_id INTEGER NOT NULL,
+    created_at TEXT NOT NULL,
+    PRIMARY KEY (guild_id, user_id, warn_id)
+);
+CREATE INDEX IF NOT EXISTS idx_warnings_guild ON warnings (guild_id);
+CREATE TABLE IF NOT EXISTS guild_settings (
+    guild_id INTEGER NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (guild_id, key)
+);
+"""
+
+class SQLiteModData(ModStorage):
+    """SQLite (WAL) backend; every query runs on a single dedicated worker thread"""
+    def __init__(self, db_path='data/mod.db'):
+        self.db_path = db_path
+        self.conn = None
+        # One thread owns the connection, which also serialises writes without extra locking
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='moddb')
+
+    async def _run(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+
+    def _open(self):
+        os.makedirs(os.path.dirname(self.db_path) or '.', exist_ok=True)
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(SCHEMA)
+        self.conn.commit()
+
+    def _close(self):
+        if self.conn:
+            self.conn.close()
+            self.conn = None
+
+    async def open(self):
+        await self._run(self._open)
+
+    async def close(self):
+        if self.conn is not None:
+            await self._run(self._close)
+
+    def _get_warns(self, guild_id, user_id):
+        rows = self.conn.execute(
+            'SELECT warn_id, reason, mod_id, created_at FROM warnings WHERE guild_id = ? AND user_id = ? ORDER BY warn_id',
+            (guild_id, user_id)).fetchall()
+        return [{'id': r['warn_id'], 'reason': r['reason'], 'mod': r['mod_id'], 'time': r['created_at']} for r in rows]
+
+    def _add_warn(self, guild_id, user_id, reason, mod_id):
+        with self.conn:
+            row = self.conn.execute('SELECT COALESCE(MAX(warn_id), 0) FROM warnings WHERE guild_id = ? AND user_id = ?', (guild_id, user_id)).fetchone()
+            warn = make_warn(row[0] + 1, reason, mod_id)
+            self.conn.execute('INSERT INTO warnings VALUES (?, ?, ?, ?, ?, ?)', (guild_id, user_id, warn['id'], reason, mod_id, warn['time']))
+        return self._get_warns(guild_id, user_id)
+
+    def _remove_warn(self, guild_id, user_id, warn_id):
+        with self.conn:
+            cur = self.conn.execute('DELETE FROM warnings WHERE guild_id = ? AND user_id = ? AND warn_id = ?', (guild_id, user_id, warn_id))
+        if cur.rowcount == 0:
+            return None
+        return self._get_warns(guild_id, user_id)
+
+    def _get_warn_counts(self, guild_id):
+        rows = self.conn.execute('SELECT user_id, COUNT(*) FROM warnings WHERE guild_id = ? GROUP BY user_id', (guild_id,)).fetchall()
+        return [(r[0], r[1]) for r in rows]
+
+    def _get_settings(self, guild_id):
+        rows = self.conn.execute('SELECT key, value FROM guild_settings WHERE guild_id = ?', (guild_id,)).fetchall()
+        return {r['key']: json.loads(r['value']) for r in rows}
+
+    def _set_setting(self, guild_id, key, value):
+        with self.conn:
+            self.conn.execute('INSERT OR REPLACE INTO guild_settings VALUES (?, ?, ?)', (guild_id, key, json.dumps(value)))
+
+    async def get_warns(self, guild_id, user_id):
+        return await self._run(self._get_warns, guild_id, user_id)
+
+    async def add_warn(self, guild_id, user_id, reason, mod_id):
+        return await self._run(self._add_warn, guild_id, user_id, reason, mod_id)
+
+    async def remove_warn(self, guild_id, user_id, warn_id):
+        return await self._run(self._remove_warn, guild_id, user_id, warn_id)
+
+    async def get_warn_counts(self, guild_id):
+        return await self._run(self._get_warn_counts, guild_id)
+
+    async def get_settings(self, guild_id):
+        return await self._run(self._get_settings, guild_id)
+
+    async def set_setting(self, guild_id, key, value):
+        await self._run(self._set_setting, guild_id, key, value)
+
+    def _import_json(self, data_folder):
+        # Re-importing would bring back warnings removed since the last import and undo newer settings
+        if self.conn.execute('SELECT EXISTS (SELECT 1 FROM warnings) OR EXISTS (SELECT 1 FROM guild_settings)').fetchone()[0]:
+            raise RuntimeError(f"{self.db_path} already holds moderation data; import into an empty database")
+        counts = {'guilds': set(), 'warnings': 0, 'settings': 0}
+        pattern = re.compile(r'^(\d+)_(warns|settings)\.json$')
+        with self.conn:
+            for path in sorted(glob.glob(os.path.join(data_folder, '*.json'))):
+                match = pattern.match(os.path.basename(path))
+                if not match:
+                    continue
+                guild_id, kind = int(match.group(1)), match.group(2)
+                with open(path, 'r') as f:
+                    data = json.load(f)
+                counts['guilds'].add(guild_id)
+                if kind == 'warns':
+                    rows = [(guild_id, int(uid), warn_id, w.get('reason', ''), w.get('mod', 0), w.get('time', ''))
+                            for uid, user_warns in data.items() for warn_id, w in unique_warn_ids(user_warns)]
+                    cur = self.conn.executemany('INSERT OR IGNORE INTO warnings VALUES (?, ?, ?, ?, ?, ?)', rows)
+                    counts['warnings'] += cur.rowcount
+                else:
+                    rows = [(guild_id, key, json.dumps(value)) for key, value in data.items()]
+                    cur = self.conn.executemany('INSERT OR IGNORE INTO guild_settings VALUES (?, ?, ?)', rows)
+                    counts['settings'] += cur.rowcount
+        counts['guilds'] = len(counts['guilds'])
+        return counts
+
+    async def import_json(self, data_folder='data/mod'):
+        """Import data/mod/*_warns.json and *_settings.json into an empty database"""
+        return await self._run(self._import_json, data_folder)
+
+def create_mod_storage(backend, state):
+    if backend == 'sqlite':
+        return SQLiteModData()
+    if backend == 'json':
+        return ModData(state)
+    raise ValueError(f"Unknown moderation storage backend: {backend}")
+
+async def migrate(data_folder='data/mod', db_path='data/mod.db'):
+    store = SQLiteModData(db_path)
+    await store.open()
+    try:
+        return await store.import_json(data_folder)
+    finally:
+        await store.close()
+
+if __name__ == "__main__":
+    # python -m utils.storage [json_folder] [db_path]
+    counts = asyncio.run(migrate(*sys.argv[1:3]))
+    print(f"✅ Imported {counts['warnings']} warnings and {counts['settings']} settings from {counts['guilds']} guilds")
@@ -0,0 +1,50 @@
+import hashlib
+import json
+import logging
+import time
+import discord
+
+log = logging.getLogger(__name__)
+
+class CommandSync:
+    """Pushes the app command tree to Discord only when its canonical form changed since the last push"""
+    def __init__(self, bot, state, data_file='data/command_sync.json', dev_guild_id=None):
+        self.bot = bot
+        self.state = state
+        self.data_file = data_file
+        self.dev_guild = discord.Object(id=dev_guild_id) if dev_guild_id else None
+        self.last = None
+
+    def _command_dict(self, command):
+        try:
+            return command.to_dict(self.bot.tree)
+        except TypeError:
+            # discord.py before 2.4 takes no tree argument
+            return command.to_dict()
+
+    def digest(self, guild=None):
+        commands = [self._command_dict(c) for c in self.bot.tree.get_commands(guild=guild)]
+        commands.sort(key=lambda c: (c.get('type', 1), c['name']))
+        canonical = json.dumps(commands, sort_keys=True, separators=(',', ':'), ensure_ascii=False, default=str)
+        return hashlib.sha256(canonical.encode()).hexdigest(), len(commands)
+
+    async def sync(self, force=False):
+        """Sync globally, or to DEV_GUILD_ID only when set, unless the stored hash still matches"""
+        started = time.perf_counter()
+        guild = self.dev_guild
+        if guild:
+            self.bot.tree.copy_global_to(guild=guild)
+        digest, count = self.digest(guild)
+        # Keyed by application too, so switching tokens never skips a needed sync
+        key = f"{self.bot.application_id}:{guild.id if guild else 'global'}"
+        hashes = self.state.load(self.data_file)
+        skipped = not force and hashes.get(key) == digest
+        if not skipped:
+            synced = await self.bot.tree.sync(guild=guild)
+            count = len(synced)
+            hashes[key] = digest
+            self.state.mark_dirty(self.data_file)
+        self.last = {'scope': f"guild {guild.id}" if guild else "global", 'skipped': skipped, 'commands': count,
+                     'ms': round((time.perf_counter() - started) * 1000, 1), 'hash': digest[:12]}
+        log.info("Command sync (%s): %s %d commands in %.1fms", self.last['scope'], "skipped" if skipped else "synced", count, self.last['ms'])
+        return self.last
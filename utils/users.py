@@ -0,0 +1,72 @@
+import asyncio
+import time
+from collections import OrderedDict
+import discord
+
+class UserResolver:
+    """Resolves user ids from the gateway caches first, then through capped concurrent fetches"""
+    def __init__(self, bot, max_size=5000, ttl=3600, concurrency=5):
+        self.bot = bot
+        self.max_size = max_size
+        self.ttl = ttl
+        self.cache = OrderedDict()
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.inflight = {}
+
+    def _remember(self, user_id, user):
+        self.cache[user_id] = (time.monotonic() + self.ttl, user)
+        self.cache.move_to_end(user_id)
+        while len(self.cache) > self.max_size:
+            self.cache.popitem(last=False)
+
+    def _cached(self, user_id, guild):
+        """Return (hit, user); a hit with user None means the account is known not to exist"""
+        user = self.bot.get_user(user_id) or (guild.get_member(user_id) if guild else None)
+        if user:
+            return True, user
+        entry = self.cache.get(user_id)
+        if entry is None:
+            return False, None
+        if entry[0] < time.monotonic():
+            del self.cache[user_id]
+            return False, None
+        self.cache.move_to_end(user_id)
+        return True, entry[1]
+
+    async def _fetch(self, user_id):
+        async with self.semaphore:
+            try:
+                user = await self.bot.fetch_user(user_id)
+            except discord.NotFound:
+                user = None
+            except discord.HTTPException:
+                return None
+        self._remember(user_id, user)
+        return user
+
+    async def fetch(self, user_id):
+        # Share one request between callers asking for the same id at the same time
+        task = self.inflight.get(user_id)
+        if task is None:
+            task = self.inflight[user_id] = asyncio.ensure_future(self._fetch(user_id))
+            task.add_done_callback(lambda _: self.inflight.pop(user_id, None))
+        # Shielded, so one caller giving up doesn't cancel the fetch for everyone else waiting on it
+        return await asyncio.shield(task)
+
+    async def resolve(self, user_id, guild=None):
+        hit, user = self._cached(user_id, guild)
+        return user if hit else await self.fetch(user_id)
+
+    async def resolve_many(self, user_ids, guild=None):
+        """Map each id to a User (or None), fetching only cache misses and those concurrently"""
+        results, misses = {}, []
+        for user_id in user_ids:
+            hit, user = self._cached(user_id, guild)
+            if hit:
+                results[user_id] = user
+            else:
+                misses.append(user_id)
+        if misses:
+            fetched = await asyncio.gather(*(self.fetch(uid) for uid in misses))
+            results.update(zip(misses, fetched))
+        return results
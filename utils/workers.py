@@ -0,0 +1,68 @@
+import asyncio
+import logging
+import time
+import discord
+
+log = logging.getLogger(__name__)
+
+class ProgressReporter:
+    """Throttled progress callback for long jobs; expects progress, progress_every and _last_progress"""
+    async def _report(self, force=False):
+        now = time.monotonic()
+        if self.progress and (force or now - self._last_progress >= self.progress_every):
+            self._last_progress = now
+            try:
+                await self.progress(self)
+            except discord.HTTPException:
+                # A failed progress edit must never abort the job itself
+                pass
+
+class BatchRunner(ProgressReporter):
+    """Runs one coroutine per item through a fixed pool of workers and records each outcome"""
+    def __init__(self, action, concurrency=4, progress=None, progress_every=2.0):
+        self.action = action
+        self.concurrency = concurrency
+        self.progress = progress
+        self.progress_every = progress_every
+        self.total = 0
+        self.succeeded = []
+        self.failed = []
+        self.cancelled = False
+        self._last_progress = 0.0
+
+    @property
+    def done(self):
+        return len(self.succeeded) + len(self.failed)
+
+    def cancel(self):
+        self.cancelled = True
+
+    async def _worker(self, items):
+        # Workers share one iterator, so a slow item never holds up the rest of the batch
+        for item in items:
+            if self.cancelled:
+                return
+            try:
+                await self.action(item)
+                self.succeeded.append(item)
+            except discord.Forbidden:
+                self.failed.append((item, "Missing permissions"))
+            except discord.NotFound:
+                self.failed.append((item, "Not found"))
+            except discord.HTTPException as e:
+                self.failed.append((item, e.text or f"HTTP {e.status}"))
+            except Exception as e:
+                # Anything unexpected fails this item only; escaping would abort run() with workers still going
+                log.exception("Batch action failed for %r", item)
+                self.failed.append((item, type(e).__name__))
+            await self._report()
+
+    async def run(self, items):
+        items = list(items)
+        self.total = len(items)
+        iterator = iter(items)
+        try:
+            await asyncio.gather(*(self._worker(iterator) for _ in range(min(self.concurrency, len(items)))))
+        finally:
+            await self._report(force=True)
+        return self